@@ -2,3 +2,5 @@ from assimilator.alchemy.database.repository import *
 from assimilator.alchemy.database.specifications.specifications import *
 from assimilator.alchemy.database.specifications.filtering_options import *
 from assimilator.alchemy.database.unit_of_work import *
+from assimilator.alchemy.database.async_repository import *
+from assimilator.alchemy.database.async_unit_of_work import *
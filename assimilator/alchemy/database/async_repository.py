@@ -0,0 +1,174 @@
+from typing import Type, Union, Optional, TypeVar, Collection, Iterable, List, TYPE_CHECKING
+
+from sqlalchemy import func, select, update, delete
+from sqlalchemy.orm import Query
+from sqlalchemy.inspection import inspect
+
+from assimilator.alchemy.database.model_utils import dict_to_alchemy_models
+from assimilator.core.patterns.error_wrapper import ErrorWrapper
+from assimilator.core.database.exceptions import InvalidQueryError
+from assimilator.alchemy.database.error_wrapper import AlchemyErrorWrapper
+from assimilator.alchemy.database.specifications.specifications import AlchemySpecificationList
+from assimilator.core.database import AsyncRepository, AsyncLazyCommand, SpecificationType
+
+if TYPE_CHECKING:   # sqlalchemy.ext.asyncio needs greenlet, sync patterns must work without it
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+AlchemyModelT = TypeVar("AlchemyModelT")
+
+
+class AsyncAlchemyRepository(AsyncRepository):
+    session: 'AsyncSession'
+    model: Type[AlchemyModelT]
+
+    def __init__(
+        self,
+        session: 'AsyncSession',
+        model: Type[AlchemyModelT],
+        initial_query: Query = None,
+        specifications: Type[AlchemySpecificationList] = AlchemySpecificationList,
+        error_wrapper: Optional[ErrorWrapper] = None,
+    ):
+        super(AsyncAlchemyRepository, self).__init__(
+            session=session,
+            model=model,
+            initial_query=initial_query if initial_query is not None else select(model),
+            specifications=specifications,
+            error_wrapper=error_wrapper or AlchemyErrorWrapper(),
+        )
+
+    async def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Query = None,
+    ) -> Union[AlchemyModelT, AsyncLazyCommand[AlchemyModelT]]:
+        query = self._apply_specifications(
+            query=initial_query,
+            specifications=specifications,
+        )
+        return (await self.session.execute(query)).one()[0]
+
+    async def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Query = None,
+    ) -> Union[Collection[AlchemyModelT], AsyncLazyCommand[Collection[AlchemyModelT]]]:
+        query = self._apply_specifications(
+            query=initial_query,
+            specifications=specifications,
+        )
+        return [result[0] for result in await self.session.execute(query)]
+
+    async def update(
+        self,
+        obj: Optional[AlchemyModelT] = None,
+        *specifications: SpecificationType,
+        **update_values,
+    ) -> None:
+        obj, specifications = self._check_obj_is_specification(obj, specifications)
+
+        if specifications:
+            if not update_values:
+                raise InvalidQueryError(
+                    "You did not provide any update_values "
+                    "to the update() yet provided specifications"
+                )
+
+            query = self._apply_specifications(
+                query=update(self.model),
+                specifications=specifications,
+            )
+            await self.session.execute(
+                query.values(update_values).execution_options(synchronize_session=False)
+            )
+
+        elif obj is not None:
+            if obj not in self.session:
+                obj = await self.session.merge(obj)
+                self.session.add(obj)
+
+    def dict_to_models(self, data: dict) -> AlchemyModelT:
+        return self.model(**dict_to_alchemy_models(data=data, model=self.model))
+
+    async def save(self, obj: Optional[AlchemyModelT] = None, **data) -> AlchemyModelT:
+        if obj is None:
+            obj = self.dict_to_models(data)
+
+        self.session.add(obj)
+        return obj
+
+    async def save_many(self, objs: Iterable[AlchemyModelT]) -> List[AlchemyModelT]:
+        objs = list(objs)
+        self.session.add_all(objs)
+        return objs
+
+    async def update_many(self, objs: Iterable[AlchemyModelT]) -> None:
+        self.session.add_all([
+            obj if obj in self.session else await self.session.merge(obj)
+            for obj in objs
+        ])
+
+    async def delete_many(self, objs: Iterable[AlchemyModelT]) -> None:
+        objs = list(objs)
+        if not objs:
+            return
+
+        mapper = inspect(self.model)
+        if len(mapper.primary_key) != 1:
+            for obj in objs:
+                await self.session.delete(obj)
+
+            return
+
+        primary_key = mapper.get_property_by_column(mapper.primary_key[0]).key
+        await self.session.execute(
+            delete(self.model).where(
+                getattr(self.model, primary_key).in_([getattr(obj, primary_key) for obj in objs])
+            )
+        )
+
+    async def refresh(self, obj: AlchemyModelT) -> None:
+        if obj not in self.session:
+            obj = await self.session.merge(obj)
+
+        await self.session.refresh(obj)
+
+    async def delete(self, obj: Optional[AlchemyModelT] = None, *specifications: SpecificationType) -> None:
+        obj, specifications = self._check_obj_is_specification(obj, specifications)
+
+        if specifications:
+            await self.session.execute(self._apply_specifications(
+                query=delete(self.model),
+                specifications=specifications,
+            ))
+        elif obj is not None:
+            await self.session.delete(obj)
+
+    async def is_modified(self, obj: AlchemyModelT) -> bool:
+        return obj in self.session and self.session.is_modified(obj)
+
+    async def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Query = None
+    ) -> Union[AsyncLazyCommand[int], int]:
+        primary_keys = inspect(self.model).primary_key
+
+        if not primary_keys:
+            raise InvalidQueryError(
+                "Your repository model does not have any primary keys. We cannot use count()"
+            )
+
+        return await self.get(
+            *specifications,
+            lazy=False,
+            initial_query=initial_query or select(func.count(getattr(self.model, primary_keys[0].name))),
+        )
+
+
+__all__ = [
+    'AsyncAlchemyRepository',
+]
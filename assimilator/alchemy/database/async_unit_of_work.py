@@ -0,0 +1,40 @@
+from typing import Optional
+
+from assimilator.alchemy.database.async_repository import AsyncAlchemyRepository
+from assimilator.alchemy.database.error_wrapper import AlchemyErrorWrapper
+from assimilator.core.database.async_unit_of_work import AsyncUnitOfWork
+from assimilator.core.patterns.error_wrapper import ErrorWrapper
+
+
+class AsyncAlchemyUnitOfWork(AsyncUnitOfWork):
+    repository: AsyncAlchemyRepository
+
+    def __init__(
+        self,
+        repository: AsyncAlchemyRepository,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        autocommit: bool = False,
+    ):
+        super(AsyncAlchemyUnitOfWork, self).__init__(
+            repository=repository,
+            error_wrapper=error_wrapper or AlchemyErrorWrapper(),
+            autocommit=autocommit,
+        )
+
+    async def begin(self):
+        if not self.repository.session.in_transaction():    # queries outside of the UnitOfWork begin it too
+            await self.repository.session.begin()
+
+    async def rollback(self):
+        await self.repository.session.rollback()
+
+    async def close(self):
+        pass
+
+    async def commit(self):
+        await self.repository.session.commit()
+
+
+__all__ = [
+    'AsyncAlchemyUnitOfWork',
+]
@@ -1,4 +1,4 @@
-from typing import Type, Union, Optional, TypeVar, Collection
+from typing import Type, Union, Optional, TypeVar, Collection, Iterable, List
 
 from sqlalchemy import func, select, update, delete
 from sqlalchemy.orm import Session, Query
@@ -97,6 +97,37 @@ class AlchemyRepository(Repository):
         self.session.add(obj)
         return obj
 
+    def save_many(self, objs: Iterable[AlchemyModelT]) -> List[AlchemyModelT]:
+        """ SQLAlchemy inserts the added models in batches with executemany when the session is flushed """
+        objs = list(objs)
+        self.session.add_all(objs)
+        return objs
+
+    def update_many(self, objs: Iterable[AlchemyModelT]) -> None:
+        self.session.add_all([
+            obj if obj in self.session else self.session.merge(obj)
+            for obj in objs
+        ])
+
+    def delete_many(self, objs: Iterable[AlchemyModelT]) -> None:
+        objs = list(objs)
+        if not objs:
+            return
+
+        mapper = inspect(self.model)
+        if len(mapper.primary_key) != 1:
+            for obj in objs:
+                self.session.delete(obj)
+
+            return
+
+        primary_key = mapper.get_property_by_column(mapper.primary_key[0]).key
+        self.session.execute(
+            delete(self.model).where(
+                getattr(self.model, primary_key).in_([getattr(obj, primary_key) for obj in objs])
+            )
+        )
+
     def refresh(self, obj: AlchemyModelT) -> None:
         if obj not in self.session:
             obj = self.session.merge(obj)
@@ -68,6 +68,10 @@ class AlchemyFilteringOptions(FilteringOptions):
     def _regex(field, value):
         return AlchemyFilteringOptions._convert_field(field).regexp_match(value)
 
+    @staticmethod
+    def _in(field, value):
+        return AlchemyFilteringOptions._convert_field(field).in_(value)
+
 
 __all__ = [
     'AlchemyFilteringOptions',
@@ -1,8 +1,8 @@
 from itertools import zip_longest
-from typing import Collection, Optional, Iterable, Any, Dict, Callable, Union
+from typing import Collection, Optional, Iterable, Any, Dict, Callable, Union, Hashable
 
 from sqlalchemy.orm import load_only, Load
-from sqlalchemy import column, desc, and_, or_, not_, Select, inspect
+from sqlalchemy import column, desc, and_, or_, not_, tuple_, Select, inspect
 
 from assimilator.alchemy.database.model_utils import get_model_from_relationship
 from assimilator.alchemy.database.specifications.filtering_options import AlchemyFilteringOptions
@@ -12,6 +12,8 @@ from assimilator.core.database.specifications.specifications import (
     SpecificationType,
     FilterSpecification,
 )
+from assimilator.core.database.specifications.seek import SeekSpecification
+from assimilator.core.database.specifications.fingerprint import get_fingerprint
 
 
 class AlchemyFilter(FilterSpecification):
@@ -20,6 +22,7 @@ class AlchemyFilter(FilterSpecification):
     def __init__(self, *filters, **named_filters):
         super(AlchemyFilter, self).__init__(*filters)
         self.filters.append(named_filters)
+        self._fingerprint_arguments = (filters, named_filters)
 
     def __or__(self, other: 'FilterSpecification') -> SpecificationType:
         return CompositeFilter(self, other, func=or_)
@@ -55,6 +58,9 @@ class CompositeFilter(AlchemyFilter):
         self.filter_specs = filters
         self.func = func
     
+    def fingerprint(self) -> Optional[Hashable]:
+        return get_fingerprint((type(self).__qualname__, self.func.__name__, self.filter_specs))
+
     def __call__(self, query: Select, **context: Any) -> Select:
         parsed_specs = []
 
@@ -96,6 +102,48 @@ def alchemy_paginate(
     return query
 
 
+class AlchemySeek(SeekSpecification):
+    """
+    Keyset pagination with WHERE (k1, k2) > (v1, v2) ORDER BY k1, k2 LIMIT n. If the clauses have
+    different directions, the comparison is expanded to k1 < v1 OR (k1 = v1 AND k2 > v2).
+    """
+
+    def _get_column(self, model, field: str):
+        model_column = getattr(model, field, None) if "." not in field else None
+        return column(field, is_literal=True) if model_column is None else model_column
+
+    def _get_after_clause(self, columns: list):
+        if len(set(self.descending)) == 1:
+            keys, values = tuple_(*columns), tuple_(*self.after)
+            return keys < values if self.descending[0] else keys > values
+
+        clauses = []
+        for position, (key, value, descending) in enumerate(zip(columns, self.after, self.descending)):
+            equal_keys = [
+                previous_key == previous_value
+                for previous_key, previous_value in zip(columns[:position], self.after[:position])
+            ]
+            clauses.append(and_(*equal_keys, key < value if descending else key > value))
+
+        return or_(*clauses)
+
+    def __call__(self, query: Select, **context: Any) -> Select:
+        model = context['repository'].model
+        columns = [self._get_column(model, field) for field in self.fields]
+
+        if self.after is not None:
+            query = query.filter(self._get_after_clause(columns))
+
+        query = query.order_by(*(
+            desc(key) if descending else key
+            for key, descending in zip(columns, self.descending)
+        ))
+        return query if self.limit is None else query.limit(self.limit)
+
+
+alchemy_seek = AlchemySeek
+
+
 @specification
 def alchemy_join(
     *targets: Collection,
@@ -176,6 +224,7 @@ class AlchemySpecificationList(SpecificationList):
     filter = AlchemyFilter
     order = alchemy_order
     paginate = alchemy_paginate
+    seek = alchemy_seek
     join = alchemy_join
     only = alchemy_only
 
@@ -186,6 +235,8 @@ __all__ = [
     'AlchemyFilter',
     'alchemy_order',
     'alchemy_paginate',
+    'AlchemySeek',
+    'alchemy_seek',
     'alchemy_join',
     'alchemy_only',
 ]
@@ -1,8 +1,14 @@
 from assimilator.core.database.repository import *
 from assimilator.core.database.unit_of_work import *
+from assimilator.core.database.async_repository import *
+from assimilator.core.database.async_unit_of_work import *
+from assimilator.core.database.batching import *
+from assimilator.core.database.cache import *
 from assimilator.core.database.exceptions import *
 from assimilator.core.database.models import *
 from assimilator.core.database.specifications.adaptive import *
 from assimilator.core.database.specifications.specifications import *
+from assimilator.core.database.specifications.seek import *
 from assimilator.core.database.specifications.filtering_options import *
 from assimilator.core.database.specifications.types import *
+from assimilator.core.database.specifications.fingerprint import *
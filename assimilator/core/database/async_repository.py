@@ -0,0 +1,94 @@
+from abc import abstractmethod
+from typing import Optional, Union, Collection, Iterable, List, ClassVar, Type, AsyncIterator
+
+from assimilator.core.patterns.lazy_command import AsyncLazyCommand
+from assimilator.core.database.repository import Repository, ModelT, QueryT
+from assimilator.core.database.specifications.specifications import SpecificationType
+
+
+class AsyncRepository(Repository):
+    """
+    Repository for asynchronous database drivers. All the functions that send queries
+    to the database are coroutines, and lazy=True returns AsyncLazyCommand.
+    """
+    lazy_command_cls: ClassVar[Type[AsyncLazyCommand]] = AsyncLazyCommand
+
+    async def _wrap_errors(self, iterator: AsyncIterator) -> AsyncIterator:
+        """ Errors of the async generators are raised when we iterate over them, so we wrap every step """
+        while True:
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            except BaseException as error:
+                self.error_wrapper.raise_wrapped_error(error)
+                raise
+
+            yield item
+
+    @abstractmethod
+    async def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+    ) -> Union[ModelT, AsyncLazyCommand[ModelT]]:
+        raise NotImplementedError("get() is not implemented()")
+
+    @abstractmethod
+    async def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+    ) -> Union[Collection[ModelT], AsyncLazyCommand[Collection[ModelT]]]:
+        raise NotImplementedError("filter() is not implemented()")
+
+    @abstractmethod
+    async def save(self, obj: Optional[ModelT] = None, **obj_data) -> ModelT:
+        raise NotImplementedError("save() is not implemented in the repository")
+
+    @abstractmethod
+    async def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
+        raise NotImplementedError("delete() is not implemented in the repository")
+
+    @abstractmethod
+    async def update(self, obj: Optional[ModelT] = None, *specifications: SpecificationType, **update_values) -> None:
+        raise NotImplementedError("update() is not implemented in the repository")
+
+    async def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        """ Saves all the models. Repositories override it to save them with one query """
+        return [await self.save(obj) for obj in objs]
+
+    async def update_many(self, objs: Iterable[ModelT]) -> None:
+        """ Updates all the models. Repositories override it to update them with one query """
+        for obj in objs:
+            await self.update(obj)
+
+    async def delete_many(self, objs: Iterable[ModelT]) -> None:
+        """ Deletes all the models. Repositories override it to delete them with one query """
+        for obj in objs:
+            await self.delete(obj)
+
+    @abstractmethod
+    async def is_modified(self, obj: ModelT) -> bool:
+        raise NotImplementedError("is_modified() is not implemented in the repository")
+
+    @abstractmethod
+    async def refresh(self, obj: ModelT) -> None:
+        raise NotImplementedError("refresh() is not implemented in the repository")
+
+    @abstractmethod
+    async def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+    ) -> Union[AsyncLazyCommand[int], int]:
+        raise NotImplementedError("count() is not implemented in the repository")
+
+
+__all__ = [
+    'AsyncLazyCommand',
+    'AsyncRepository',
+]
@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from functools import wraps
+from inspect import isawaitable
+from typing import Optional, ClassVar, Tuple, Callable
+
+from assimilator.core.database.async_repository import AsyncRepository
+from assimilator.core.patterns import ErrorWrapper
+
+
+def notify_repository(func: Callable) -> Callable:
+    """ Calls on_<method name>() of the repository after the method if the repository has it. It can be a coroutine """
+    hook_name = f"on_{func.__name__}"
+
+    @wraps(func)
+    async def notifying_wrapper(self, *args, **kwargs):
+        result = await func(self, *args, **kwargs)
+
+        hook = getattr(self.repository, hook_name, None)
+        if hook is not None:
+            hook_result = hook()
+            if isawaitable(hook_result):
+                await hook_result
+
+        return result
+
+    notifying_wrapper: func
+    return notifying_wrapper
+
+
+class AsyncUnitOfWork(ABC):
+    """ UnitOfWork for asynchronous database drivers. Use it with async with """
+    error_wrapper: ErrorWrapper = ErrorWrapper()
+    error_wrapped_methods: ClassVar[Tuple[str, ...]] = ('begin', 'rollback', 'commit', 'close')
+
+    def __init_subclass__(cls, **kwargs):
+        """ Methods are decorated once when the class is created, so that creating a unit of work is cheap """
+        super(AsyncUnitOfWork, cls).__init_subclass__(**kwargs)
+
+        for method_name in cls.error_wrapped_methods:
+            method = cls.__dict__.get(method_name)
+            if method is not None:
+                setattr(cls, method_name, notify_repository(ErrorWrapper.decorate_method(method)))
+
+    def __init__(
+        self,
+        repository: AsyncRepository,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        autocommit: bool = False,
+    ):
+        self.repository = repository
+        if error_wrapper is not None:
+            self.error_wrapper = error_wrapper
+
+        self.autocommit = autocommit
+
+    @abstractmethod
+    async def begin(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def rollback(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def commit(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def close(self):
+        raise NotImplementedError()
+
+    async def __aenter__(self):
+        await self.begin()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            await self.rollback()
+            await self.close()
+            raise exc_val
+        else:
+            if self.autocommit:
+                await self.commit()
+
+            await self.close()
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({self.repository.model})"
+
+    def __repr__(self):
+        return str(self)
+
+
+__all__ = [
+    'AsyncUnitOfWork',
+]
@@ -0,0 +1,195 @@
+import asyncio
+from threading import Lock
+from collections.abc import Hashable
+from typing import Any, Dict, Generic, Iterable, List, Optional, TypeVar
+
+from assimilator.core.patterns.lazy_command import LazyCommand, AsyncLazyCommand
+from assimilator.core.database.repository import Repository
+from assimilator.core.database.async_repository import AsyncRepository
+from assimilator.core.database.exceptions import MultipleResultsError
+from assimilator.core.database.specifications.filtering_options import FILTERING_OPTIONS_SEPARATOR
+
+ModelT = TypeVar("ModelT")
+
+
+class Batch:
+    """ Values that are loaded with one query, and the models that were found for them """
+
+    def __init__(self):
+        self.values: Dict[Any, None] = {}   # dict keeps the order of the values, unlike set
+        self.results: Optional[Dict[Any, List[Any]]] = None   # None until every value is loaded
+        self.task: Optional[asyncio.Future] = None
+
+    def __len__(self):
+        return len(self.values)
+
+
+class BaseBatchLoader(Generic[ModelT]):
+    """
+    Collects the values of lazy get() commands and finds the models for all of them with one query
+    when any command is executed for the first time. Values are found with repository.load_many(field, values)
+    if the repository has it, or with filter(field__in=values) otherwise. If a model was not found, the command
+    executes a normal get(), so NotFoundError is raised as before. String values also find the models whose
+    value has another type with the same str(), like ObjectId in MongoDB or UUID.
+    """
+
+    def __init__(self, repository: Repository, field: str = 'id', max_batch_size: Optional[int] = None):
+        self.repository = repository
+        self.field = field
+        self.max_batch_size = max_batch_size
+        self._batch = Batch()
+        self._batch_lock = Lock()   # values are added and the batch is closed in different threads
+
+    @staticmethod
+    def can_load(field: str, value: Any) -> bool:
+        """ Only equality of one field can be loaded in batches """
+        return FILTERING_OPTIONS_SEPARATOR not in field and isinstance(value, Hashable)
+
+    def _add_value(self, value: Any) -> Batch:
+        with self._batch_lock:
+            batch = self._batch
+            batch.values[value] = None
+            return batch
+
+    def _close_batch(self, batch: Batch) -> List[List[Any]]:
+        """ New values are added to the next batch. Returns the chunks of values to load """
+        with self._batch_lock:
+            if batch is self._batch:
+                self._batch = Batch()
+
+            values = list(batch.values)
+
+        chunk_size = self.max_batch_size or len(values) or 1
+        return [values[position:position + chunk_size] for position in range(0, len(values), chunk_size)]
+
+    def _add_results(self, results: Dict[Any, List[Any]], models: Iterable[Any], values: List[Any]) -> None:
+        """ Models are stored by the values that were requested, so the string ids find the ObjectId ones """
+        requested_values = set(values)
+        text_values = {value for value in values if isinstance(value, str)}
+
+        for model in models:
+            value = getattr(model, self.field, None)
+            if not isinstance(value, Hashable):
+                continue
+            elif value not in requested_values and text_values and str(value) in text_values:
+                value = str(value)
+
+            results.setdefault(value, []).append(model)
+
+    def _get_specification(self, value: Any):
+        return self.repository.specs.filter(**{self.field: value})
+
+    def _get_loaded(self, batch: Batch, value: Any) -> Optional[Any]:
+        models = batch.results.get(value)
+
+        if not models:
+            return None
+        elif len(models) != 1:
+            raise MultipleResultsError(f"{self.repository} batch loader found {len(models)} results "
+                                       f"with {self.field}={value}")
+
+        return models[0]
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.repository}, field={self.field}, pending={len(self._batch)})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class BatchLoader(BaseBatchLoader[ModelT]):
+    def __init__(self, repository: Repository, field: str = 'id', max_batch_size: Optional[int] = None):
+        super(BatchLoader, self).__init__(repository=repository, field=field, max_batch_size=max_batch_size)
+        self._lock = Lock()
+
+    def _load_values(self, values: List[Any]) -> Iterable[ModelT]:
+        load_many = getattr(self.repository, 'load_many', None)
+        if load_many is not None:
+            return load_many(self.field, values)
+
+        return self.repository.filter(self.repository.specs.filter(**{f"{self.field}__in": values}))
+
+    def _dispatch(self, batch: Batch) -> None:
+        with self._lock:    # other thread may load the batch at the same time
+            if batch.results is not None:
+                return
+
+            results = {}
+            for values in self._close_batch(batch):
+                self._add_results(results=results, models=self._load_values(values), values=values)
+
+            batch.results = results
+
+    def _resolve(self, batch: Batch, value: Any) -> ModelT:
+        if batch.results is None:
+            self._dispatch(batch)
+
+        model = self._get_loaded(batch=batch, value=value)
+        if model is None:   # the value may have another type in the database, so we ask the repository
+            return self.repository.get(self._get_specification(value))
+
+        return model
+
+    def load(self, value: Any) -> LazyCommand[ModelT]:
+        """ Returns a lazy get() of the model. All the pending values are loaded when it is executed """
+        return LazyCommand(self._resolve, self._add_value(value), value)
+
+    def load_many(self, values: Iterable[Any]) -> List[LazyCommand[ModelT]]:
+        return [self.load(value) for value in values]
+
+
+class AsyncBatchLoader(BaseBatchLoader[ModelT]):
+    """
+    BatchLoader for AsyncRepository. The batch is loaded on the next iteration of the event loop, so the values
+    of all the coroutines that are awaited together(with asyncio.gather(), for example) are loaded at once.
+    """
+    repository: AsyncRepository
+
+    async def _load_values(self, values: List[Any]) -> Iterable[ModelT]:
+        load_many = getattr(self.repository, 'load_many', None)
+        if load_many is not None:
+            return await load_many(self.field, values)
+
+        return await self.repository.filter(self.repository.specs.filter(**{f"{self.field}__in": values}))
+
+    async def _dispatch(self, batch: Batch) -> None:
+        await asyncio.sleep(0)  # other coroutines add their values to the batch
+
+        results = {}
+        for values in self._close_batch(batch):
+            self._add_results(results=results, models=await self._load_values(values), values=values)
+
+        batch.results = results
+
+    async def _resolve(self, batch: Batch, value: Any) -> ModelT:
+        if batch.task is None:
+            batch.task = asyncio.ensure_future(self._dispatch(batch))
+
+        task = batch.task
+        try:
+            await asyncio.shield(task)  # one of the coroutines can be cancelled, but the batch is loaded for others
+        except BaseException:
+            if task.done() and batch.task is task:
+                batch.task = None   # the batch is loaded again when the command is awaited again
+
+            raise
+
+        model = self._get_loaded(batch=batch, value=value)
+        if model is None:
+            return await self.repository.get(self._get_specification(value))
+
+        return model
+
+    def load(self, value: Any) -> AsyncLazyCommand[ModelT]:
+        """ Returns a lazy get() of the model. All the pending values are loaded when it is awaited """
+        return AsyncLazyCommand(self._resolve, self._add_value(value), value)
+
+    def load_many(self, values: Iterable[Any]) -> List[AsyncLazyCommand[ModelT]]:
+        return [self.load(value) for value in values]
+
+
+__all__ = [
+    'BaseBatchLoader',
+    'BatchLoader',
+    'AsyncBatchLoader',
+]
@@ -0,0 +1,431 @@
+import time
+import pickle
+from abc import ABC, abstractmethod
+from threading import Lock
+from inspect import isawaitable
+from weakref import finalize
+from collections import OrderedDict
+from collections.abc import Iterator, AsyncIterator
+from typing import Any, ClassVar, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from assimilator.core.patterns.lazy_command import LazyCommand
+from assimilator.core.patterns.context_values import ContextValues
+from assimilator.core.database.repository import Repository, ModelT, QueryT
+from assimilator.core.database.async_repository import AsyncRepository
+from assimilator.core.database.specifications.specifications import SpecificationType
+from assimilator.core.database.specifications.fingerprint import get_fingerprint
+
+
+class CacheBackend(ABC):
+    """
+    Stores the results of the CachedRepository. Every namespace has a version that is a part of the keys,
+    so all the results of the namespace are invalidated at once by changing its version.
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: Hashable) -> Any:
+        """ Returns the stored result, or raises KeyError if it was not found """
+        raise NotImplementedError("get() is not implemented in the cache backend")
+
+    @abstractmethod
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        raise NotImplementedError("set() is not implemented in the cache backend")
+
+    @abstractmethod
+    def get_version(self, namespace: str) -> int:
+        raise NotImplementedError("get_version() is not implemented in the cache backend")
+
+    @abstractmethod
+    def invalidate(self, namespace: str) -> None:
+        """ Changes the version of the namespace, so the results that were stored before are not found """
+        raise NotImplementedError("invalidate() is not implemented in the cache backend")
+
+
+class MemoryCache(CacheBackend):
+    """
+    Stores the results in the memory of the process. The least recently used results are removed
+    when there are more than max_size of them, and every result expires after ttl seconds if it is provided.
+    Results are stored with the serializer, so every caller gets its own copy that it can change. Set the serializer
+    to None to store the results themselves, if nobody changes them.
+    """
+
+    def __init__(self, max_size: Optional[int] = 1024, ttl: Optional[float] = None, serializer=pickle):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.serializer = serializer
+        self._entries: OrderedDict[Tuple[str, Hashable], Tuple[Any, Optional[float]]] = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        entry_key = (namespace, key)
+
+        with self._lock:
+            value, expires_at = self._entries[entry_key]
+
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[entry_key]
+                raise KeyError(key)
+
+            self._entries.move_to_end(entry_key)
+
+        return value if self.serializer is None else self.serializer.loads(value)
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        if self.serializer is not None:
+            value = self.serializer.dumps(value)
+
+        with self._lock:
+            self._entries[(namespace, key)] = (value, expires_at)
+            self._entries.move_to_end((namespace, key))
+
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def get_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:    # old results are not found anymore, so they are removed by the LRU
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return f"{type(self).__name__}(size={len(self)}, max_size={self.max_size}, ttl={self.ttl})"
+
+    def __repr__(self):
+        return str(self)
+
+
+_default_caches: Dict[int, MemoryCache] = {}  # id() of the data source, it is removed when the source is collected
+_default_caches_lock = Lock()
+
+
+def get_default_cache(source: Any) -> CacheBackend:
+    """
+    Returns the MemoryCache of the data source(SQLAlchemy engine, Redis client, session of InternalRepository),
+    so the repositories of one database share the results and the repositories of other databases never see them.
+    Sources that cannot be referenced weakly, like plain dictionaries, get a new cache every time.
+    """
+    with _default_caches_lock:
+        cache = _default_caches.get(id(source))
+        if cache is not None:
+            return cache
+
+        try:
+            finalize(source, _default_caches.pop, id(source), None)
+        except TypeError:
+            return MemoryCache()
+
+        cache = _default_caches[id(source)] = MemoryCache()
+        return cache
+
+
+class BaseCachedRepository:
+    """
+    Finds the cache keys for CachedRepository and AsyncCachedRepository. The key is made with the fingerprints
+    of the specifications, the initial query and other arguments, so the results of the specifications that
+    cannot be compared(functions, SQL expressions) are never cached.
+    """
+    repository: Repository
+    _transactions: ClassVar[ContextValues[bool]] = ContextValues("cached_repository_transactions")
+
+    def _setup_cache(self, cache: Optional[CacheBackend], namespace: Optional[str]) -> None:
+        self.cache = cache if cache is not None else get_default_cache(self._get_data_source())
+        self.namespace = namespace or self._get_default_namespace()
+
+    def _get_data_source(self) -> Any:
+        """ SQLAlchemy sessions are created for every request, so their engine is used instead """
+        session = self.repository.session
+        return getattr(session, 'bind', None) or session
+
+    def _get_default_namespace(self) -> str:
+        """ Models of MongoRepository are stored in a database of the client, so its name is added too """
+        namespace = f"{self.model.__module__}.{self.model.__qualname__}"
+        database = getattr(self.repository, 'database', None)
+        return namespace if not isinstance(database, str) else f"{database}.{namespace}"
+
+    def _in_transaction(self) -> bool:
+        return self._transactions.get(self) is not None
+
+    @staticmethod
+    def _get_key(method_name: str, specifications: tuple, **kwargs) -> Optional[Hashable]:
+        parts = (get_fingerprint(specifications), get_fingerprint(kwargs))
+        if any(part is None for part in parts):
+            return None
+
+        return (method_name, *parts)
+
+    @staticmethod
+    def _is_cacheable(result: Any) -> bool:
+        """ Iterators are consumed by the first caller, so they are not stored """
+        return not isinstance(result, (Iterator, AsyncIterator))
+
+    @property
+    def transaction(self):
+        return self.repository.transaction
+
+    @transaction.setter
+    def transaction(self, transaction) -> None:
+        self.repository.transaction = transaction
+
+    def get_initial_query(self, override_query: Optional[QueryT] = None) -> QueryT:
+        return self.repository.get_initial_query(override_query)
+
+    def dict_to_models(self, data: dict) -> ModelT:
+        return self.repository.dict_to_models(data)
+
+    def on_begin(self) -> None:
+        """ Results that are read in the transaction may be rolled back, so they are not cached """
+        self._transactions.set(self, True)
+
+    def on_close(self) -> None:
+        self._transactions.set(self, None)
+
+    def __getattr__(self, item: str):
+        """ Methods that the cache does not know about(iter_filter(), load_many()) are called without it """
+        if item == 'repository':   # not set yet
+            raise AttributeError(item)
+
+        return getattr(self.repository, item)
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.repository})"
+
+
+class CachedRepository(BaseCachedRepository, Repository):
+    """
+    Repository that stores the results of get(), filter() and count() of another repository in the cache.
+    Results are invalidated when the models are changed with the repository, or when the unit of work
+    that uses it is committed. Results are not cached inside the unit of work.
+    """
+
+    def __init__(self, repository: Repository, cache: Optional[CacheBackend] = None, namespace: Optional[str] = None):
+        super(CachedRepository, self).__init__(
+            session=repository.session,
+            model=repository.model,
+            specifications=repository.specifications,
+            error_wrapper=repository.error_wrapper,
+        )
+        self.repository = repository
+        self._setup_cache(cache=cache, namespace=namespace)
+
+    def _read(self, method_name: str, specifications: tuple, **kwargs) -> Any:
+        key = None if self._in_transaction() else self._get_key(method_name, specifications, **kwargs)
+        if key is None:
+            return getattr(self.repository, method_name)(*specifications, **kwargs)
+
+        version = self.cache.get_version(self.namespace)    # results of old versions are never found
+        key = (version, *key)
+
+        try:
+            return self.cache.get(self.namespace, key)
+        except KeyError:
+            pass
+
+        result = getattr(self.repository, method_name)(*specifications, **kwargs)
+        if self._is_cacheable(result):
+            self.cache.set(self.namespace, key, result)
+
+        return result
+
+    def invalidate(self) -> None:
+        """ Removes all the results of the repository from the cache """
+        self.cache.invalidate(self.namespace)
+
+    def _changed(self) -> None:
+        if not self._in_transaction():
+            self.invalidate()
+
+    def on_commit(self) -> None:
+        self.invalidate()
+
+    def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+    ) -> Union[ModelT, LazyCommand[ModelT]]:
+        return self._read('get', specifications, initial_query=initial_query)
+
+    def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+        **kwargs,
+    ) -> Union[List[ModelT], LazyCommand[List[ModelT]]]:
+        return self._read('filter', specifications, initial_query=initial_query, **kwargs)
+
+    def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+        **kwargs,
+    ) -> Union[LazyCommand[int], int]:
+        return self._read('count', specifications, initial_query=initial_query, **kwargs)
+
+    def save(self, obj: Optional[ModelT] = None, **obj_data) -> ModelT:
+        obj = self.repository.save(obj, **obj_data)
+        self._changed()
+        return obj
+
+    def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
+        self.repository.delete(obj, *specifications)
+        self._changed()
+
+    def update(self, obj: Optional[ModelT] = None, *specifications: SpecificationType, **update_values) -> None:
+        self.repository.update(obj, *specifications, **update_values)
+        self._changed()
+
+    def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        objs = self.repository.save_many(objs)
+        self._changed()
+        return objs
+
+    def update_many(self, objs: Iterable[ModelT]) -> None:
+        self.repository.update_many(objs)
+        self._changed()
+
+    def delete_many(self, objs: Iterable[ModelT]) -> None:
+        self.repository.delete_many(objs)
+        self._changed()
+
+    def is_modified(self, obj: ModelT) -> bool:
+        return self.repository.is_modified(obj)
+
+    def refresh(self, obj: ModelT) -> None:
+        self.repository.refresh(obj)
+
+
+class AsyncCachedRepository(BaseCachedRepository, AsyncRepository):
+    """
+    CachedRepository for AsyncRepository. The methods of the cache backend may be coroutines,
+    like in AsyncRedisCache, or normal functions, like in MemoryCache.
+    """
+    repository: AsyncRepository
+
+    def __init__(
+        self,
+        repository: AsyncRepository,
+        cache: Optional[CacheBackend] = None,
+        namespace: Optional[str] = None,
+    ):
+        super(AsyncCachedRepository, self).__init__(
+            session=repository.session,
+            model=repository.model,
+            specifications=repository.specifications,
+            error_wrapper=repository.error_wrapper,
+        )
+        self.repository = repository
+        self._setup_cache(cache=cache, namespace=namespace)
+
+    @staticmethod
+    async def _wait(result: Any) -> Any:
+        return (await result) if isawaitable(result) else result
+
+    async def _read(self, method_name: str, specifications: tuple, **kwargs) -> Any:
+        key = None if self._in_transaction() else self._get_key(method_name, specifications, **kwargs)
+        if key is None:
+            return await getattr(self.repository, method_name)(*specifications, **kwargs)
+
+        version = await self._wait(self.cache.get_version(self.namespace))
+        key = (version, *key)
+
+        try:
+            return await self._wait(self.cache.get(self.namespace, key))
+        except KeyError:
+            pass
+
+        result = await getattr(self.repository, method_name)(*specifications, **kwargs)
+        if self._is_cacheable(result):
+            await self._wait(self.cache.set(self.namespace, key, result))
+
+        return result
+
+    async def invalidate(self) -> None:
+        """ Removes all the results of the repository from the cache """
+        await self._wait(self.cache.invalidate(self.namespace))
+
+    async def _changed(self) -> None:
+        if not self._in_transaction():
+            await self.invalidate()
+
+    async def on_commit(self) -> None:
+        await self.invalidate()
+
+    async def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+    ) -> ModelT:
+        return await self._read('get', specifications, initial_query=initial_query)
+
+    async def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+        **kwargs,
+    ) -> List[ModelT]:
+        return await self._read('filter', specifications, initial_query=initial_query, **kwargs)
+
+    async def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: QueryT = None,
+        **kwargs,
+    ) -> int:
+        return await self._read('count', specifications, initial_query=initial_query, **kwargs)
+
+    async def save(self, obj: Optional[ModelT] = None, **obj_data) -> ModelT:
+        obj = await self.repository.save(obj, **obj_data)
+        await self._changed()
+        return obj
+
+    async def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
+        await self.repository.delete(obj, *specifications)
+        await self._changed()
+
+    async def update(self, obj: Optional[ModelT] = None, *specifications: SpecificationType, **update_values) -> None:
+        await self.repository.update(obj, *specifications, **update_values)
+        await self._changed()
+
+    async def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        objs = await self.repository.save_many(objs)
+        await self._changed()
+        return objs
+
+    async def update_many(self, objs: Iterable[ModelT]) -> None:
+        await self.repository.update_many(objs)
+        await self._changed()
+
+    async def delete_many(self, objs: Iterable[ModelT]) -> None:
+        await self.repository.delete_many(objs)
+        await self._changed()
+
+    async def is_modified(self, obj: ModelT) -> bool:
+        return await self.repository.is_modified(obj)
+
+    async def refresh(self, obj: ModelT) -> None:
+        await self.repository.refresh(obj)
+
+
+__all__ = [
+    'CacheBackend',
+    'MemoryCache',
+    'get_default_cache',
+    'CachedRepository',
+    'AsyncCachedRepository',
+]
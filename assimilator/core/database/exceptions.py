@@ -14,3 +14,7 @@ class InvalidQueryError(DataLayerError):
 
 class MultipleResultsError(InvalidQueryError):
     """ Repository get() function returned more than one result """
+
+
+class ConflictError(DataLayerError):
+    """ The data was changed by another transaction before the commit """
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from typing import (
     TypeVar, Callable, Generic, final,
     Union, Optional, Iterable, Type,
-    Collection, Tuple, Any, Dict,
+    Collection, Tuple, Any, Dict, List, ClassVar,
 )
 
 from assimilator.core.patterns.error_wrapper import ErrorWrapper
@@ -14,16 +14,14 @@ from assimilator.core.database.specifications.specifications import Specificatio
 def make_lazy(func: Callable):
 
     @wraps(func)
-    def make_lazy_wrapper(
-        self,
-        *specifications: SpecificationType,
-        lazy: bool = False,
-        initial_query: QueryT = None,
-    ):
+    def make_lazy_wrapper(self, *specifications: SpecificationType, lazy: bool = False, **kwargs):
         if lazy:
-            return LazyCommand(func, self, *specifications, lazy=False, initial_query=initial_query)
-        return func(self, *specifications, lazy=lazy, initial_query=initial_query)
+            lazy_command_cls = getattr(self, 'lazy_command_cls', LazyCommand)
+            return lazy_command_cls(func, self, *specifications, lazy=False, **kwargs)
 
+        return func(self, *specifications, **kwargs)
+
+    make_lazy_wrapper: func
     return make_lazy_wrapper
 
 
@@ -34,6 +32,34 @@ SpecsT = TypeVar("SpecsT", bound=Type[SpecificationList])
 
 
 class Repository(Generic[SessionT, ModelT, QueryT], ABC):
+    lazy_command_cls: ClassVar[Type[LazyCommand]] = LazyCommand
+    lazy_methods: ClassVar[Tuple[str, ...]] = ('get', 'filter', 'count')
+    error_wrapped_methods: ClassVar[Tuple[str, ...]] = (
+        'save', 'delete', 'update', 'save_many', 'update_many', 'delete_many', 'is_modified', 'refresh',
+        'load_many',    # optional, BatchLoader uses it if the repository has it
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Methods are decorated once when the class is created, so that creating a repository is cheap.
+        Only the methods that the class defines are decorated, the parent classes decorate their own.
+        """
+        super(Repository, cls).__init_subclass__(**kwargs)
+        cls._decorate_methods()
+
+    @classmethod
+    def _decorate_methods(cls) -> None:
+        for method_name in (*cls.lazy_methods, *cls.error_wrapped_methods):
+            method = cls.__dict__.get(method_name)
+            if method is None:
+                continue
+
+            method = ErrorWrapper.decorate_method(method)
+            if method_name in cls.lazy_methods:
+                method = make_lazy(method)
+
+            setattr(cls, method_name, method)
+
     def __init__(
         self,
         session: SessionT,
@@ -48,14 +74,6 @@ class Repository(Generic[SessionT, ModelT, QueryT], ABC):
         self.specifications: SpecsT = specifications
 
         self.error_wrapper = error_wrapper or ErrorWrapper()
-        self.get = LazyCommand.decorate(self.error_wrapper.decorate(self.get))
-        self.filter: Repository.filter = LazyCommand.decorate(self.error_wrapper.decorate(self.filter))
-        self.save: Repository.save = self.error_wrapper.decorate(self.save)
-        self.delete: Repository.delete = self.error_wrapper.decorate(self.delete)
-        self.update: Repository.update = self.error_wrapper.decorate(self.update)
-        self.is_modified: Repository.is_modified = self.error_wrapper.decorate(self.is_modified)
-        self.refresh: Repository.refresh = self.error_wrapper.decorate(self.refresh)
-        self.count: Repository.count = LazyCommand.decorate(self.error_wrapper.decorate(self.count))
 
     @final
     def _check_obj_is_specification(
@@ -139,6 +157,20 @@ class Repository(Generic[SessionT, ModelT, QueryT], ABC):
     def update(self, obj: Optional[ModelT] = None, *specifications: SpecificationType, **update_values) -> None:
         raise NotImplementedError("update() is not implemented in the repository")
 
+    def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        """ Saves all the models. Repositories override it to save them with one query """
+        return [self.save(obj) for obj in objs]
+
+    def update_many(self, objs: Iterable[ModelT]) -> None:
+        """ Updates all the models. Repositories override it to update them with one query """
+        for obj in objs:
+            self.update(obj)
+
+    def delete_many(self, objs: Iterable[ModelT]) -> None:
+        """ Deletes all the models. Repositories override it to delete them with one query """
+        for obj in objs:
+            self.delete(obj)
+
     @abstractmethod
     def is_modified(self, obj: ModelT) -> bool:
         raise NotImplementedError("is_modified() is not implemented in the repository")
@@ -163,6 +195,9 @@ class Repository(Generic[SessionT, ModelT, QueryT], ABC):
         return str(self)
 
 
+Repository._decorate_methods()     # default save_many(), update_many() and delete_many()
+
+
 __all__ = [
     'LazyCommand',
     'Repository',
@@ -1,7 +1,9 @@
 import operator
-from typing import Optional, Iterable, Union, Callable, Any
+from typing import Optional, Iterable, Union, Callable, Any, Sequence, Hashable
 
 from assimilator.core.database.specifications.specifications import specification, FilterSpecification
+from assimilator.core.database.specifications.seek import SeekSpecification
+from assimilator.core.database.specifications.fingerprint import get_fingerprint
 
 
 class AdaptiveFilter:
@@ -18,6 +20,9 @@ class AdaptiveFilter:
     def __invert__(self):
         return AdaptiveFilter(self.fields, self.kwargs_fields)
 
+    def fingerprint(self) -> Optional[Hashable]:
+        return get_fingerprint((type(self).__qualname__, self.fields, self.kwargs_fields))
+
     def __call__(self, query, repository, **context):
         return repository.specs.filter(
             *self.fields, **self.kwargs_fields,
@@ -36,6 +41,9 @@ class CompositeAdaptiveFilter(AdaptiveFilter):
         self.second = second
         self.func = func
 
+    def fingerprint(self) -> Optional[Hashable]:
+        return get_fingerprint((type(self).__qualname__, self.func.__name__, self.first, self.second))
+
     def _parse_specification(self, filter_spec, repository):
         if isinstance(filter_spec, CompositeAdaptiveFilter):
             first = self._parse_specification(filter_spec=filter_spec.first, repository=repository)
@@ -74,6 +82,34 @@ def paginate(
     return paginate_spec(query=query, repository=repository, **context)
 
 
+class AdaptiveSeek(SeekSpecification):
+    """ Keyset pagination that uses the seek() specification of the repository """
+
+    def __init__(
+        self,
+        *clauses: str,
+        token: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: Optional[int] = None,
+    ):
+        super(AdaptiveSeek, self).__init__(*clauses, after=after, limit=limit)
+        self.token = token  # the token is decoded by the seek() of the repository
+        self._seek_spec: Optional[SeekSpecification] = None
+
+    def __call__(self, query, repository, **context):
+        self._seek_spec = repository.specs.seek(*self.clauses, token=self.token, after=self.after, limit=self.limit)
+        return self._seek_spec(query=query, repository=repository, **context)
+
+    def next_token(self, results: Sequence[Any]) -> Optional[str]:
+        if self._seek_spec is None:
+            return super(AdaptiveSeek, self).next_token(results)
+
+        return self._seek_spec.next_token(results)
+
+
+seek = AdaptiveSeek
+
+
 @specification
 def join(*targets: str, join_args: Iterable[dict] = None, query, repository, **context):
     return repository.specs.join(*targets, join_args=join_args)(query=query, repository=repository, **context)
@@ -91,4 +127,6 @@ __all__ = [
     'order',
     'join',
     'paginate',
+    'AdaptiveSeek',
+    'seek',
 ]
@@ -1,5 +1,5 @@
 from abc import abstractstaticmethod
-from typing import Dict, Protocol, Any, Callable
+from typing import Dict, Protocol, Any, Callable, Tuple, Optional
 
 
 class FilterOptionProtocol(Protocol):
@@ -24,29 +24,39 @@ class FilteringOptions:
             "is": self._is,
             "like": self._like,
             "regex": self._regex,
+            "in": self._in,
         }
 
     def get_default_filter(self) -> FilterOptionProtocol:
         return self._eq
 
-    def parse_field(self, raw_field: str, value: Any) -> Callable:
+    def split_field(self, raw_field: str) -> Tuple[str, Optional[str]]:
+        """
+        Splits the raw field into the field name and the filtering option name.
+        The option is None if the default filter must be used.
+        """
         fields = raw_field.split(FILTERING_OPTIONS_SEPARATOR)
         last_field = fields[-1]
 
         if len(fields) == 1:
-            filter_func = self.filter_options.get(last_field, self.get_default_filter())
-            return filter_func(last_field, value)
+            return last_field, (last_field if last_field in self.filter_options else None)
 
         # Foreign Key
 
-        if self.filter_options.get(fields[-1]) is None:
-            foreign_field = raw_field
+        if self.filter_options.get(last_field) is None:
+            return raw_field, None
+
+        return FILTERING_OPTIONS_SEPARATOR.join(fields[:-1]), last_field
+
+    def parse_field(self, raw_field: str, value: Any) -> Callable:
+        field, option = self.split_field(raw_field)
+
+        if option is None:
             filter_func = self.get_default_filter()
         else:
-            foreign_field = FILTERING_OPTIONS_SEPARATOR.join(fields[:-1])
-            filter_func = self.filter_options.get(fields[-1])
+            filter_func = self.filter_options[option]
 
-        return filter_func(foreign_field, value)
+        return filter_func(field, value)
 
     @abstractstaticmethod
     def _eq(field: str, value):
@@ -84,6 +94,10 @@ class FilteringOptions:
     def _regex(field: str, value):
         raise NotImplementedError("_regex() is not implemented in the filtering options")
 
+    @abstractstaticmethod
+    def _in(field: str, value):
+        raise NotImplementedError("_in() is not implemented in the filtering options")
+
 
 __all__ = [
     'FilteringOptions',
@@ -0,0 +1,46 @@
+from enum import Enum
+from uuid import UUID
+from decimal import Decimal
+from datetime import date, time, timedelta
+from typing import Any, Hashable, Optional
+
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes, Decimal, UUID, date, time, timedelta, Enum)
+
+
+def get_fingerprint(value: Any) -> Optional[Hashable]:
+    """
+    Returns a hashable value that is equal for equal specifications, filter values and queries, so that
+    it can be used as a cache key. Returns None if the value cannot be compared(functions, SQL expressions).
+    Specifications provide their fingerprint with fingerprint() function.
+    """
+    if isinstance(value, _PLAIN_TYPES):
+        return type(value).__name__, value  # 1, 1.0 and True are equal in Python, but they are other filters
+    elif isinstance(value, (list, tuple)):
+        parts = [get_fingerprint(part) for part in value]
+        if any(part is None for part in parts):
+            return None
+
+        return type(value).__name__, tuple(parts)
+    elif isinstance(value, (set, frozenset)):
+        parts = [get_fingerprint(part) for part in value]
+        if any(part is None for part in parts):
+            return None
+
+        return 'set', tuple(sorted(parts, key=repr))
+    elif isinstance(value, dict):
+        items = [(get_fingerprint(key), get_fingerprint(item)) for key, item in value.items()]
+        if any(key is None or item is None for key, item in items):
+            return None
+
+        return 'dict', tuple(sorted(items, key=repr))
+
+    fingerprint = getattr(value, 'fingerprint', None)
+    if callable(fingerprint):
+        return fingerprint()
+
+    return None
+
+
+__all__ = [
+    'get_fingerprint',
+]
@@ -0,0 +1,135 @@
+import json
+from abc import ABC
+from uuid import UUID
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Hashable
+
+from assimilator.core.database.exceptions import InvalidQueryError
+from assimilator.core.database.specifications.specifications import Specification
+from assimilator.core.database.specifications.fingerprint import get_fingerprint
+
+
+class SeekSpecification(Specification, ABC):
+    """
+    Keyset pagination. The results are ordered by the clauses, and only the results that come
+    after the last seen key are returned. Unlike offset pagination, the database does not read
+    the skipped results, so deep pages are as fast as the first one.
+
+    Pass the values of the last seen result with after, or the token that next_token() returned.
+    The last clause must be unique(id, for example), so that no results are skipped.
+    """
+
+    def __init__(
+        self,
+        *clauses: str,
+        token: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: Optional[int] = None,
+    ):
+        if not clauses:
+            raise InvalidQueryError("seek() needs at least one ordering clause")
+        elif token is not None and after is not None:
+            raise InvalidQueryError("seek() accepts either token or after, not both")
+
+        self.clauses = clauses
+        self.fields: List[str] = [clause.lstrip("-") for clause in clauses]
+        self.descending: List[bool] = [clause.startswith("-") for clause in clauses]
+        self.limit = limit
+        self.token = token
+
+        if token is not None:
+            after = self.decode_token(token)
+
+        if after is not None:
+            after = tuple(after)
+            if len(after) != len(clauses):
+                raise InvalidQueryError(f"seek() needs {len(clauses)} values in after, got {len(after)}")
+
+        self.after: Optional[Tuple[Any, ...]] = after
+
+    def get_key(self, model: Any) -> Tuple[Any, ...]:
+        """ Returns the values of the ordering fields of the model """
+        key = []
+
+        for field in self.fields:
+            value = model
+            for part in field.split("."):
+                value = getattr(value, part)
+
+            key.append(value)
+
+        return tuple(key)
+
+    def encode_value(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            return {"$datetime": value.isoformat()}
+        elif isinstance(value, date):
+            return {"$date": value.isoformat()}
+        elif isinstance(value, Decimal):
+            return {"$decimal": str(value)}
+        elif isinstance(value, UUID):
+            return {"$uuid": str(value)}
+
+        return value
+
+    def decode_value(self, value: Any) -> Any:
+        if not isinstance(value, dict) or len(value) != 1:
+            return value
+
+        (value_type, raw_value), = value.items()
+
+        if value_type == "$datetime":
+            return datetime.fromisoformat(raw_value)
+        elif value_type == "$date":
+            return date.fromisoformat(raw_value)
+        elif value_type == "$decimal":
+            return Decimal(raw_value)
+        elif value_type == "$uuid":
+            return UUID(raw_value)
+
+        return value
+
+    def encode_token(self, key: Iterable[Any]) -> str:
+        data = json.dumps({
+            "clauses": self.clauses,
+            "after": [self.encode_value(value) for value in key],
+        }, separators=(",", ":"))
+        return urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_token(self, token: str) -> Tuple[Any, ...]:
+        try:
+            data = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            clauses, after = tuple(data["clauses"]), data["after"]
+        except (ValueError, TypeError, KeyError, Base64Error) as exc:
+            raise InvalidQueryError(f"seek() token is invalid: {token}") from exc
+
+        if clauses != self.clauses:
+            raise InvalidQueryError(f"seek() token was created for {clauses} ordering, not {self.clauses}")
+
+        return tuple(self.decode_value(value) for value in after)
+
+    def next_token(self, results: Sequence[Any]) -> Optional[str]:
+        """
+        Returns the token for the next page, or None if there are no more results.
+        results must be the list that the repository returned for this specification.
+        """
+        results = list(results)
+
+        if not results or (self.limit is not None and len(results) < self.limit):
+            return None
+
+        return self.encode_token(self.get_key(results[-1]))
+
+    def fingerprint(self) -> Optional[Hashable]:
+        return get_fingerprint((type(self).__qualname__, self.clauses, self.after, self.limit))
+
+    def __str__(self):
+        return f"seek({', '.join(self.clauses)}, after={self.after}, limit={self.limit})"
+
+
+__all__ = [
+    'SeekSpecification',
+]
@@ -1,11 +1,13 @@
-from functools import wraps
+from functools import wraps, partial
 from abc import ABC
-from typing import Callable, TypeVar, Type, Any, Union
+from typing import Callable, TypeVar, Type, Any, Union, Optional, Hashable
 
 from assimilator.core.database.specifications.filtering_options import FilteringOptions
+from assimilator.core.database.specifications.fingerprint import get_fingerprint
 from assimilator.core.database.specifications.types import (
     OrderSpecificationProtocol,
     PaginateSpecificationProtocol,
+    SeekSpecificationProtocol,
     OnlySpecificationProtocol,
     JoinSpecificationProtocol,
 )
@@ -24,12 +26,18 @@ class FilterSpecification(Specification, ABC):
     def __init__(self, *filters, **named_filters):
         self.filters = list(filters)
         self.filtering_options = self.filtering_options_cls()
+        self._fingerprint_arguments = (filters, named_filters)
 
         for field, value in named_filters.items():
             self.filters.append(
                 self.filtering_options.parse_field(raw_field=field, value=value)
             )
 
+    def fingerprint(self) -> Optional[Hashable]:
+        """ Returns the cache key of the filter, or None if the filters cannot be compared(functions, for example) """
+        filters, named_filters = self._fingerprint_arguments
+        return get_fingerprint((type(self).__qualname__, filters, named_filters))
+
     def __or__(self, other: 'SpecificationType') -> 'FilterSpecification':
         raise NotImplementedError("or() is not implemented for FilterSpecification")
 
@@ -50,6 +58,9 @@ def specification(func: Callable) -> Callable:
             return func(*args, **kwargs, query=query, **context)
 
         created_specification: func
+        created_specification.fingerprint = partial(
+            get_fingerprint, (func.__module__, func.__qualname__, args, kwargs),
+        )
         return created_specification
 
     return create_specification
@@ -59,6 +70,7 @@ class SpecificationList:
     filter: Type[FilterSpecification]
     order: OrderSpecificationProtocol
     paginate: PaginateSpecificationProtocol
+    seek: SeekSpecificationProtocol
     join: JoinSpecificationProtocol
     only: OnlySpecificationProtocol
 
@@ -1,4 +1,4 @@
-from typing import Protocol, TypeVar, Optional, Iterable, Any
+from typing import Protocol, TypeVar, Optional, Iterable, Any, Sequence
 
 QueryT = TypeVar("QueryT")
 
@@ -18,6 +18,17 @@ class JoinSpecificationProtocol(Protocol):
         ...
 
 
+class SeekSpecificationProtocol(Protocol):
+    def __call__(
+        self,
+        *clauses: str,
+        token: Optional[str] = None,
+        after: Optional[Sequence[Any]] = None,
+        limit: Optional[int] = None,
+    ):
+        ...
+
+
 class OnlySpecificationProtocol(Protocol):
     def __call__(self, *only_fields: Iterable[str]) -> Iterable[QueryT]:
         ...
@@ -26,6 +37,7 @@ class OnlySpecificationProtocol(Protocol):
 __all__ = [
     'OrderSpecificationProtocol',
     'PaginateSpecificationProtocol',
+    'SeekSpecificationProtocol',
     'JoinSpecificationProtocol',
     'OnlySpecificationProtocol',
 ]
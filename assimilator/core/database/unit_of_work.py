@@ -1,12 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import wraps
+from typing import Optional, ClassVar, Tuple, Callable
 
 from assimilator.core.database.repository import Repository
 from assimilator.core.patterns import ErrorWrapper
 
 
+def notify_repository(func: Callable) -> Callable:
+    """
+    Calls on_<method name>() of the repository after the method if the repository has it.
+    CachedRepository uses it to find out when the transactions start and end.
+    """
+    hook_name = f"on_{func.__name__}"
+
+    @wraps(func)
+    def notifying_wrapper(self, *args, **kwargs):
+        result = func(self, *args, **kwargs)
+
+        hook = getattr(self.repository, hook_name, None)
+        if hook is not None:
+            hook()
+
+        return result
+
+    notifying_wrapper: func
+    return notifying_wrapper
+
+
 class UnitOfWork(ABC):
     error_wrapper: ErrorWrapper = ErrorWrapper()
+    error_wrapped_methods: ClassVar[Tuple[str, ...]] = ('begin', 'rollback', 'commit', 'close')
+
+    def __init_subclass__(cls, **kwargs):
+        """ Methods are decorated once when the class is created, so that creating a unit of work is cheap """
+        super(UnitOfWork, cls).__init_subclass__(**kwargs)
+
+        for method_name in cls.error_wrapped_methods:
+            method = cls.__dict__.get(method_name)
+            if method is not None:
+                setattr(cls, method_name, notify_repository(ErrorWrapper.decorate_method(method)))
 
     def __init__(
         self,
@@ -19,10 +51,6 @@ class UnitOfWork(ABC):
             self.error_wrapper = error_wrapper
 
         self.autocommit = autocommit
-        self.begin = self.error_wrapper.decorate(self.begin)
-        self.rollback = self.error_wrapper.decorate(self.rollback)
-        self.commit = self.error_wrapper.decorate(self.commit)
-        self.close = self.error_wrapper.decorate(self.close)
 
     @abstractmethod
     def begin(self):
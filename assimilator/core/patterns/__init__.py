@@ -1,3 +1,4 @@
 from assimilator.core.patterns.context_managers import *
 from assimilator.core.patterns.error_wrapper import *
 from assimilator.core.patterns.lazy_command import *
+from assimilator.core.patterns.context_values import *
@@ -0,0 +1,49 @@
+from weakref import ref
+from contextvars import ContextVar
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ContextValues(Generic[T]):
+    """
+    Stores a value of every object for each thread and asyncio task. ContextVar objects are never
+    garbage collected by the contexts that used them, so one ContextVar is shared by all the objects
+    instead of creating a new one for every repository or unit of work. Values are removed when they
+    are set to None, and the objects are only referenced weakly.
+    """
+
+    def __init__(self, name: str):
+        self._values: ContextVar[Dict[int, Tuple[ref, T]]] = ContextVar(name, default={})
+
+    def get(self, owner: Any) -> Optional[T]:
+        found = self._values.get().get(id(owner))
+        if found is None:
+            return None
+
+        owner_ref, value = found
+        return value if owner_ref() is owner else None   # id() of a dead object can be reused
+
+    def set(self, owner: Any, value: Optional[T]) -> None:
+        # The dictionary is copied, so the tasks that copied the context before do not see the change
+        values = {
+            owner_id: (owner_ref, owner_value)
+            for owner_id, (owner_ref, owner_value) in self._values.get().items()
+            if owner_id != id(owner) and owner_ref() is not None
+        }
+
+        if value is not None:
+            values[id(owner)] = (ref(owner), value)
+
+        self._values.set(values)
+
+    def __str__(self):
+        return f"{type(self).__name__}({self._values.name})"
+
+    def __repr__(self):
+        return str(self)
+
+
+__all__ = [
+    'ContextValues',
+]
@@ -1,5 +1,6 @@
 import sys
 from functools import wraps
+from inspect import iscoroutinefunction
 from typing import Dict, Type, Optional, Callable, Container, Union
 
 
@@ -22,50 +23,111 @@ class ErrorWrapper:
             *self.error_mappings.values(),  # we want to skip all the mapped values as they are already fixed
         }
 
+        if isinstance(default_error, type):     # methods that call their parent methods wrap the errors twice
+            self.skipped_errors.add(default_error)
+
+        self._resolved_errors: Dict[Type[BaseException], Optional[ErrorT]] = {}
+
     def __enter__(self):
         return self
 
-    def is_already_wrapped(self, exc_type: Type[Exception]) -> bool:
-        return any(
-            issubclass(exc_type, error)
-            for error in self.skipped_errors
-            if issubclass(error, Exception)
-        )
+    def is_already_wrapped(self, exc_type: Type[BaseException]) -> bool:
+        return any(error in self.skipped_errors for error in exc_type.__mro__)
+
+    def _resolve_error(self, exc_type: Type[BaseException]) -> Optional[ErrorT]:
+        if not issubclass(exc_type, Exception) or self.is_already_wrapped(exc_type):
+            return None     # KeyboardInterrupt, asyncio.CancelledError and errors that are already wrapped
+
+        for error in exc_type.__mro__:  # the closest parent class is used, like in except clauses
+            wrapped_error = self.error_mappings.get(error)
+            if wrapped_error is not None:
+                return wrapped_error
+
+        return self.default_error
+
+    def resolve_error(self, exc_type: Type[BaseException]) -> Optional[ErrorT]:
+        """
+        Returns the error that the exception type is wrapped with, or None if it is raised as it is.
+        The result is cached for every exception type, so create a new ErrorWrapper if you want to change the mappings.
+        """
+        try:
+            return self._resolved_errors[exc_type]
+        except KeyError:
+            wrapped_error = self._resolved_errors[exc_type] = self._resolve_error(exc_type)
+            return wrapped_error
 
     def create_error(self, original_error: Exception, wrapped_error_type: Type[Exception]):
         _, _, tb = sys.exc_info()
         raise wrapped_error_type(original_error).with_traceback(tb)
 
+    def raise_wrapped_error(self, error: BaseException) -> None:
+        """ Raises the wrapped error if the error must be wrapped. Use it in except clauses and re-raise the error after """
+        wrapped_error = self.resolve_error(type(error))
+
+        if wrapped_error is not None:
+            self.create_error(original_error=error, wrapped_error_type=wrapped_error)
+
     def __exit__(self, exc_type: Type[Exception], exc_val: Exception, exc_tb):
         if exc_val is None:
             return True
-        elif self.is_already_wrapped(exc_type):
-            return False
-
-        wrapped_error = self.error_mappings.get(exc_type)
-
-        if wrapped_error is not None:
-            raise self.create_error(
-                original_error=exc_val,
-                wrapped_error_type=wrapped_error,
-            )
-        elif self.default_error is not None:
-            raise self.create_error(
-                original_error=exc_val,
-                wrapped_error_type=self.default_error,
-            )
 
+        self.raise_wrapped_error(exc_val)
         return False   # No wrapping error was found
 
     def decorate(self, func: Callable) -> Callable:
+        """ Wraps the errors of the function. try/except is used instead of with, so calls without errors cost nothing """
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except BaseException as error:
+                    self.raise_wrapped_error(error)
+                    raise
+
+            async_wrapper: func
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            with self:
+            try:
                 return func(*args, **kwargs)
+            except BaseException as error:
+                self.raise_wrapped_error(error)
+                raise
 
         wrapper: func
         return wrapper
 
+    @staticmethod
+    def decorate_method(func: Callable) -> Callable:
+        """
+        Decorates the method once for the whole class. The errors are wrapped with the error_wrapper
+        of the object that the method is called on, so creating objects does not create new wrappers.
+        """
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_method_wrapper(self, *args, **kwargs):
+                try:
+                    return await func(self, *args, **kwargs)
+                except BaseException as error:
+                    self.error_wrapper.raise_wrapped_error(error)
+                    raise
+
+            async_method_wrapper: func
+            return async_method_wrapper
+
+        @wraps(func)
+        def method_wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except BaseException as error:
+                self.error_wrapper.raise_wrapped_error(error)
+                raise
+
+        method_wrapper: func
+        return method_wrapper
+
     def __str__(self):
         return f"{type(self).__name__}({self.error_mappings})"
 
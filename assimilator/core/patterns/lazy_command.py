@@ -1,23 +1,72 @@
+import asyncio
+from time import monotonic
 from functools import wraps
-from typing import Union, Callable, Iterable, TypeVar, Generic, Iterator
+from threading import Lock
+from typing import (
+    Union, Callable, Iterable, TypeVar, Generic, Iterator, AsyncIterator,
+    Awaitable, Generator, Any, Optional,
+)
 
 T = TypeVar("T")
 
+_EMPTY: Any = object()    # None, [] and 0 are valid results, so we need another value for "not executed"
+
+
+class BaseLazyCommand(Generic[T]):
+    """
+    Remembers the results of the command. ttl is the number of seconds the results are remembered for,
+    and the command is executed again after that. If shared is True, the callers that use the command at the
+    same time wait for one execution of the command. Change ttl and shared for one command or for the whole class.
+    """
+    ttl: Optional[float] = None
+    shared: bool = False
 
-class LazyCommand(Generic[T]):
     def __init__(self, command: Callable, *args, **kwargs):
         self.command = command
         self.args = args
         self.kwargs = kwargs
-        self._results: T = None
+        self._results: T = _EMPTY
+        self._expires_at: Optional[float] = None
 
-    def __call__(self) -> Union[T]:
-        if self._results is not None:
-            return self._results
+    def _get_results(self) -> T:
+        """ Returns the remembered results, or _EMPTY if the command must be executed """
+        if self._expires_at is not None and monotonic() >= self._expires_at:
+            return _EMPTY
 
-        self._results = self.command(*self.args, **self.kwargs)
         return self._results
 
+    def _set_results(self, results: T) -> T:
+        self._expires_at = None if self.ttl is None else monotonic() + self.ttl
+        self._results = results
+        return results
+
+    def invalidate(self) -> None:
+        """ Forgets the results, so that the command is executed again """
+        self._results = _EMPTY
+        self._expires_at = None
+
+
+class LazyCommand(BaseLazyCommand[T]):
+    """ Executes the command when the results are used for the first time. Threads can share the results """
+
+    def __init__(self, command: Callable, *args, **kwargs):
+        super(LazyCommand, self).__init__(command, *args, **kwargs)
+        self._lock = Lock()
+
+    def __call__(self) -> Union[T]:
+        results = self._get_results()
+        if results is not _EMPTY:
+            return results
+        elif not self.shared:
+            return self._set_results(self.command(*self.args, **self.kwargs))
+
+        with self._lock:
+            results = self._get_results()   # other thread may have executed the command while we waited
+            if results is _EMPTY:
+                results = self._set_results(self.command(*self.args, **self.kwargs))
+
+            return results
+
     def __iter__(self) -> Iterator[T]:
         results = self()
 
@@ -64,4 +113,76 @@ class LazyCommand(Generic[T]):
         return lazy_wrapper
 
 
-__all__ = ['LazyCommand']
+class AsyncLazyCommand(BaseLazyCommand[T]):
+    """
+    LazyCommand for coroutines. Await it or iterate over it with async for to run the command.
+    If shared is True, coroutines that await the command at the same time wait for one execution of the command.
+    """
+
+    def __init__(self, command: Callable[..., Awaitable[T]], *args, **kwargs):
+        super(AsyncLazyCommand, self).__init__(command, *args, **kwargs)
+        self._running: Optional[asyncio.Future] = None
+
+    async def _execute(self) -> T:
+        return self._set_results(await self.command(*self.args, **self.kwargs))
+
+    def _finish(self, running: asyncio.Future) -> None:
+        if self._running is running:
+            self._running = None
+
+    async def __call__(self) -> T:
+        results = self._get_results()
+        if results is not _EMPTY:
+            return results
+        elif not self.shared:
+            return await self._execute()
+
+        if self._running is None:
+            self._running = asyncio.ensure_future(self._execute())
+            self._running.add_done_callback(self._finish)
+
+        # one of the coroutines can be cancelled, but the command is still executed for others
+        return await asyncio.shield(self._running)
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self().__await__()
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        results = await self()
+
+        if not isinstance(results, Iterable):  # get() command
+            raise TypeError("Results are not iterable")
+
+        for result in results:  # filter() command
+            yield result
+
+    def __str__(self):
+        return f"AsyncLazy<{self.command}(*{self.args}, **{self.kwargs})>"
+
+    def __repr__(self):
+        return str(self)
+
+    @staticmethod
+    def decorate(func: Callable[..., Awaitable[T]]) -> Callable:
+
+        @wraps(func)
+        def async_lazy_wrapper(*args, lazy: bool = False, **kwargs) -> Union[AsyncLazyCommand[T], Awaitable[T]]:
+            if lazy:
+                return AsyncLazyCommand(
+                    func,
+                    *args,
+                    lazy=False,
+                    **kwargs,
+                )
+
+            return func(*args, **kwargs)
+
+        async_lazy_wrapper: func
+        return async_lazy_wrapper
+
+
+__all__ = [
+    'BaseLazyCommand',
+    'LazyCommand',
+    'AsyncLazyCommand',
+]
@@ -1,2 +1,3 @@
 from assimilator.core.services.crud import *
+from assimilator.core.services.async_crud import *
 from assimilator.core.services.base import *
@@ -0,0 +1,111 @@
+from typing import TypeVar, Iterable, Union, List, ClassVar, Type, Optional, Dict, Awaitable
+
+from assimilator.core.database import AsyncUnitOfWork, SpecificationList, AsyncBatchLoader
+from assimilator.core.services.base import Service
+from assimilator.core.patterns import AsyncLazyCommand
+
+
+ModelT = TypeVar("ModelT")
+
+
+class AsyncCRUDService(Service):
+    """
+    CRUDService for AsyncUnitOfWork. All the functions are coroutines, except list() and get() with lazy=True:
+    they return AsyncLazyCommand right away, just like the lazy functions of AsyncRepository
+    """
+
+    batch_loader_cls: ClassVar[Optional[Type[AsyncBatchLoader]]] = AsyncBatchLoader
+
+    def __init__(self, uow: AsyncUnitOfWork):
+        self.uow = uow
+        self._specs: SpecificationList = self.uow.repository.specs
+        self._batch_loaders: Dict[str, AsyncBatchLoader] = {}
+
+    def _get_batch_loader(self, *filters, **kwargs_filters) -> Optional[AsyncBatchLoader]:
+        """
+        Lazy get() with one named filter(get(id=1, lazy=True), for example) is loaded with other lazy get()
+        of the same field in one query. Set batch_loader_cls to None to disable it.
+        """
+        if self.batch_loader_cls is None or filters or len(kwargs_filters) != 1:
+            return None
+
+        (field, value), = kwargs_filters.items()
+        if not self.batch_loader_cls.can_load(field=field, value=value):
+            return None
+
+        batch_loader = self._batch_loaders.get(field)
+        if batch_loader is None:
+            batch_loader = self.batch_loader_cls(repository=self.uow.repository, field=field)
+            self._batch_loaders[field] = batch_loader
+
+        return batch_loader
+
+    async def create(self, obj_data: Union[dict, ModelT]) -> ModelT:
+        async with self.uow:
+            if isinstance(obj_data, dict):
+                obj = await self.uow.repository.save(**obj_data)
+            else:
+                obj = await self.uow.repository.save(obj_data)
+
+            await self.uow.commit()
+
+        await self.uow.repository.refresh(obj)
+        return obj
+
+    async def create_many(self, objs_data: Iterable[Union[dict, ModelT]]) -> List[ModelT]:
+        objs = [
+            self.uow.repository.dict_to_models(obj_data) if isinstance(obj_data, dict) else obj_data
+            for obj_data in objs_data
+        ]
+
+        async with self.uow:
+            objs = await self.uow.repository.save_many(objs)
+            await self.uow.commit()
+
+        return objs
+
+    async def update(self, obj_data: Union[dict, ModelT], *filters, **kwargs_filters) -> ModelT:
+        async with self.uow:
+            if isinstance(obj_data, dict):
+                old_obj = await self.get(*filters, **kwargs_filters)
+                parsed_obj = self.uow.repository.dict_to_models(obj_data)
+
+                for updated_key in obj_data:
+                    setattr(old_obj, updated_key, getattr(parsed_obj, updated_key))
+
+                update_obj = old_obj
+            else:
+                update_obj = obj_data
+
+            await self.uow.repository.update(update_obj)
+            await self.uow.commit()
+
+        await self.uow.repository.refresh(update_obj)
+        return update_obj
+
+    def list(
+        self, *filters, lazy: bool = False, **kwargs_filters
+    ) -> Union[Awaitable[Iterable[ModelT]], AsyncLazyCommand[Iterable[ModelT]]]:
+        return self.uow.repository.filter(self._specs.filter(*filters, **kwargs_filters), lazy=lazy)
+
+    def get(self, *filters, lazy: bool = False, **kwargs_filters) -> Union[Awaitable[ModelT], AsyncLazyCommand[ModelT]]:
+        if lazy:
+            batch_loader = self._get_batch_loader(*filters, **kwargs_filters)
+            if batch_loader is not None:
+                return batch_loader.load(*kwargs_filters.values())
+
+        return self.uow.repository.get(self._specs.filter(*filters, **kwargs_filters), lazy=lazy)
+
+    async def delete(self, *filters, **kwargs_filters) -> None:
+        async with self.uow:
+            obj = await self.get(*filters, **kwargs_filters)
+            await self.uow.repository.delete(obj)
+            await self.uow.commit()
+
+    def __str__(self):
+        return f"AsyncCRUD({self.uow.repository.model})"
+
+
+__all__ = [
+    'AsyncCRUDService',
+]
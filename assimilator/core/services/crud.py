@@ -1,6 +1,6 @@
-from typing import TypeVar, Iterable, Union
+from typing import TypeVar, Iterable, Union, List, ClassVar, Type, Optional, Dict
 
-from assimilator.core.database import UnitOfWork, SpecificationList
+from assimilator.core.database import UnitOfWork, SpecificationList, BatchLoader
 from assimilator.core.services.base import Service
 from assimilator.core.patterns import LazyCommand
 
@@ -9,9 +9,31 @@ ModelT = TypeVar("ModelT")
 
 
 class CRUDService(Service):
+    batch_loader_cls: ClassVar[Optional[Type[BatchLoader]]] = BatchLoader
+
     def __init__(self, uow: UnitOfWork):
         self.uow = uow
         self._specs: SpecificationList = self.uow.repository.specs
+        self._batch_loaders: Dict[str, BatchLoader] = {}
+
+    def _get_batch_loader(self, *filters, **kwargs_filters) -> Optional[BatchLoader]:
+        """
+        Lazy get() with one named filter(get(id=1, lazy=True), for example) is loaded with other lazy get()
+        of the same field in one query. Set batch_loader_cls to None to disable it.
+        """
+        if self.batch_loader_cls is None or filters or len(kwargs_filters) != 1:
+            return None
+
+        (field, value), = kwargs_filters.items()
+        if not self.batch_loader_cls.can_load(field=field, value=value):
+            return None
+
+        batch_loader = self._batch_loaders.get(field)
+        if batch_loader is None:
+            batch_loader = self.batch_loader_cls(repository=self.uow.repository, field=field)
+            self._batch_loaders[field] = batch_loader
+
+        return batch_loader
 
     def create(self, obj_data: Union[dict, ModelT]) -> ModelT:
         with self.uow:
@@ -25,6 +47,18 @@ class CRUDService(Service):
         self.uow.repository.refresh(obj)
         return obj
 
+    def create_many(self, objs_data: Iterable[Union[dict, ModelT]]) -> List[ModelT]:
+        objs = [
+            self.uow.repository.dict_to_models(obj_data) if isinstance(obj_data, dict) else obj_data
+            for obj_data in objs_data
+        ]
+
+        with self.uow:
+            objs = self.uow.repository.save_many(objs)
+            self.uow.commit()
+
+        return objs
+
     def update(self, obj_data: Union[dict, ModelT], *filters, **kwargs_filters) -> ModelT:
         with self.uow:
             if isinstance(obj_data, dict):
@@ -48,6 +82,11 @@ class CRUDService(Service):
         return self.uow.repository.filter(self._specs.filter(*filters, **kwargs_filters), lazy=lazy)
 
     def get(self, *filters, lazy: bool = False, **kwargs_filters) -> Union[ModelT, LazyCommand[ModelT]]:
+        if lazy:
+            batch_loader = self._get_batch_loader(*filters, **kwargs_filters)
+            if batch_loader is not None:
+                return batch_loader.load(*kwargs_filters.values())
+
         return self.uow.repository.get(self._specs.filter(*filters, **kwargs_filters), lazy=lazy)
 
     def delete(self, *filters, **kwargs_filters) -> None:
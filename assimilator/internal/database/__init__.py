@@ -1,5 +1,11 @@
 from assimilator.internal.database.repository import *
 from assimilator.internal.database.unit_of_work import *
+from assimilator.internal.database.async_repository import *
+from assimilator.internal.database.async_unit_of_work import *
 from assimilator.internal.database.specifications.specifications import *
 from assimilator.internal.database.specifications.internal_operator import *
 from assimilator.internal.database.specifications.filter_specifications import *
+from assimilator.internal.database.indexes import *
+from assimilator.internal.database.specifications.planner import *
+from assimilator.internal.database.journal import *
+from assimilator.internal.database.concurrent import *
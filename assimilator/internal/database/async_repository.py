@@ -0,0 +1,124 @@
+from typing import Type, Union, Optional, TypeVar, List, Iterable, Dict, Any
+
+from assimilator.core.patterns.error_wrapper import ErrorWrapper
+from assimilator.core.database import AsyncRepository, AsyncLazyCommand, SpecificationType, BaseModel
+from assimilator.internal.database.error_wrapper import InternalErrorWrapper
+from assimilator.internal.database.repository import InternalRepository
+from assimilator.internal.database.indexes import InternalIndex
+from assimilator.internal.database.specifications.specifications import InternalSpecificationList
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class AsyncInternalRepository(AsyncRepository):
+    """
+    AsyncRepository that works with Python dictionaries. Queries never wait for I/O, so they are
+    made by InternalRepository. Every asyncio task has its own transaction.
+    """
+    session: dict
+    model: Type[ModelT]
+
+    def __init__(
+        self,
+        session: dict,
+        model: Type[ModelT],
+        initial_query: Optional[str] = '',
+        specifications: Type[InternalSpecificationList] = InternalSpecificationList,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        indexes: Optional[Iterable[Union[InternalIndex, str]]] = None,
+    ):
+        error_wrapper = error_wrapper or InternalErrorWrapper()
+        super(AsyncInternalRepository, self).__init__(
+            model=model,
+            session=session,
+            initial_query=initial_query,
+            specifications=specifications,
+            error_wrapper=error_wrapper,
+        )
+        self.repository = InternalRepository(
+            session=session,
+            model=model,
+            initial_query=initial_query,
+            specifications=specifications,
+            error_wrapper=error_wrapper,
+            indexes=indexes,
+        )
+
+    @property
+    def transaction(self) -> dict:
+        return self.repository.transaction
+
+    @transaction.setter
+    def transaction(self, transaction: dict) -> None:
+        self.repository.transaction = transaction
+
+    async def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+    ) -> Union[AsyncLazyCommand[ModelT], ModelT]:
+        return self.repository.get(*specifications, initial_query=initial_query)
+
+    async def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+    ) -> Union[AsyncLazyCommand[List[ModelT]], List[ModelT]]:
+        return self.repository.filter(*specifications, initial_query=initial_query)
+
+    async def load_many(self, field: str, values: Iterable[Any]) -> List[ModelT]:
+        return self.repository.load_many(field, values)
+
+    def dict_to_models(self, data: dict) -> ModelT:
+        return self.repository.dict_to_models(data)
+
+    async def save(self, obj: Optional[ModelT] = None, **obj_data) -> ModelT:
+        return self.repository.save(obj, **obj_data)
+
+    async def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        return self.repository.save_many(objs)
+
+    async def update_many(self, objs: Iterable[ModelT]) -> None:
+        self.repository.update_many(objs)
+
+    async def delete_many(self, objs: Iterable[ModelT]) -> None:
+        self.repository.delete_many(objs)
+
+    async def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
+        self.repository.delete(obj, *specifications)
+
+    async def update(
+        self,
+        obj: Optional[ModelT] = None,
+        *specifications: SpecificationType,
+        **update_values,
+    ) -> None:
+        self.repository.update(obj, *specifications, **update_values)
+
+    async def is_modified(self, obj: ModelT) -> bool:
+        return self.repository.is_modified(obj)
+
+    async def refresh(self, obj: ModelT) -> None:
+        self.repository.refresh(obj)
+
+    async def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+        distinct: Optional[str] = None,
+        group_by: Optional[str] = None,
+    ) -> Union[AsyncLazyCommand[Union[int, Dict[Any, int]]], int, Dict[Any, int]]:
+        return self.repository.count(
+            *specifications,
+            initial_query=initial_query,
+            distinct=distinct,
+            group_by=group_by,
+        )
+
+
+__all__ = [
+    'AsyncInternalRepository',
+]
@@ -0,0 +1,42 @@
+from typing import Optional
+
+from assimilator.core.database import AsyncUnitOfWork
+from assimilator.core.patterns import ErrorWrapper
+from assimilator.internal.database.error_wrapper import InternalErrorWrapper
+from assimilator.internal.database.async_repository import AsyncInternalRepository
+from assimilator.internal.database.unit_of_work import InternalUnitOfWork
+
+
+class AsyncInternalUnitOfWork(AsyncUnitOfWork):
+    repository: AsyncInternalRepository
+
+    def __init__(
+        self,
+        repository: AsyncInternalRepository,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        autocommit: bool = False,
+    ):
+        error_wrapper = error_wrapper or InternalErrorWrapper()
+        super(AsyncInternalUnitOfWork, self).__init__(
+            repository=repository,
+            error_wrapper=error_wrapper,
+            autocommit=autocommit,
+        )
+        self.uow = InternalUnitOfWork(repository=repository.repository, error_wrapper=error_wrapper)
+
+    async def begin(self):
+        self.uow.begin()
+
+    async def rollback(self):
+        self.uow.rollback()
+
+    async def commit(self):
+        self.uow.commit()
+
+    async def close(self):
+        self.uow.close()
+
+
+__all__ = [
+    'AsyncInternalUnitOfWork',
+]
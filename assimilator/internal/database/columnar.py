@@ -0,0 +1,317 @@
+import re
+import operator
+from collections import Counter
+from collections.abc import MutableMapping, ItemsView
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Type
+
+import numpy as np
+
+from assimilator.core.database.models import BaseModel
+from assimilator.internal.database.indexes import IndexedValues
+from assimilator.internal.database.specifications.planner import FilterPredicate
+from assimilator.internal.database.specifications.internal_operator import like_to_regex
+
+
+class ColumnarLookup:
+    """ Named filters that were checked by the ColumnarSession with its columns """
+    exact = True
+    ordering = None
+
+    def __init__(self, predicates: List[FilterPredicate], rows: np.ndarray):
+        self.predicates = predicates
+        self.rows = rows
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    def find_models(self, session: 'ColumnarSession') -> Iterator[BaseModel]:
+        return session.iter_rows(self.rows)
+
+    def __str__(self):
+        return (
+            f"columns {', '.join(str(predicate) for predicate in self.predicates)} "
+            f"-> {self.count} candidates (exact)"
+        )
+
+
+class ColumnarValues(IndexedValues):
+    def __iter__(self) -> Iterator[BaseModel]:
+        session: ColumnarSession = self._mapping
+        return session.iter_rows()
+
+
+class ColumnarItems(ItemsView):
+    def __iter__(self):
+        session: ColumnarSession = self._mapping
+        return zip(iter(session), session.iter_rows())  # keys and rows have the same order
+
+
+class ColumnarSession(MutableMapping):
+    """
+    Session for the InternalRepository that stores every field of the models in a NumPy column.
+    Named filters are checked with the whole columns at once, and the models are only created
+    for the rows that are found. Models that you read are new objects, so call save() or update()
+    to change them.
+    """
+    min_capacity: ClassVar[int] = 64
+    chunk_size: ClassVar[int] = 1024
+    column_types: ClassVar[Dict[type, np.dtype]] = {
+        bool: np.dtype(bool),
+        int: np.dtype(np.int64),
+        float: np.dtype(np.float64),
+    }
+    column_operators: ClassVar[Dict[str, Callable[[Any, Any], Any]]] = {
+        'eq': operator.eq,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'lt': operator.lt,
+        'lte': operator.le,
+    }
+
+    def __init__(self, *args, model: Optional[Type[BaseModel]] = None, **kwargs):
+        self.model = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._keys = np.empty(0, dtype=object)
+        self._alive = np.zeros(0, dtype=bool)
+        self._rows: Dict[Any, int] = {}
+        self._size = 0  # rows that were used, including the deleted ones
+
+        if model is not None:
+            self._create_columns(model)
+
+        self.update(*args, **kwargs)
+
+    @property
+    def indexes(self) -> list:
+        return []
+
+    def _create_columns(self, model: Type[BaseModel]) -> None:
+        self.model = model
+        capacity = len(self._keys)
+
+        for field_name, field in model.__fields__.items():
+            dtype = None if field.allow_none else self.column_types.get(field.outer_type_)
+            self._columns[field_name] = np.empty(capacity, dtype=dtype or object)
+
+    def _grow(self) -> None:
+        capacity = max(self.min_capacity, len(self._keys) * 2)
+
+        def resize(array: np.ndarray) -> np.ndarray:
+            resized_array = np.empty(capacity, dtype=array.dtype) if array.dtype != bool else np.zeros(capacity, bool)
+            resized_array[:self._size] = array[:self._size]
+            return resized_array
+
+        self._keys = resize(self._keys)
+        self._alive = resize(self._alive)
+        self._columns = {field: resize(column) for field, column in self._columns.items()}
+
+    @staticmethod
+    def _fits(column: np.ndarray, value: Any) -> bool:
+        """ Checks that the value is stored in the column without changing its type """
+        if column.dtype.kind == 'i':
+            return type(value) is int and -2 ** 63 <= value < 2 ** 63
+
+        return column.dtype == object or type(value) is column.dtype.type or (
+            ColumnarSession.column_types.get(type(value)) == column.dtype
+        )
+
+    def _set_value(self, field: str, row: int, value: Any) -> None:
+        column = self._columns[field]
+
+        if not self._fits(column, value):   # None in an int column, for example
+            column = self._columns[field] = column.astype(object)
+
+        column[row] = value
+
+    def __setitem__(self, key: Any, model: BaseModel) -> None:
+        if self.model is None:
+            self._create_columns(type(model))
+        elif not isinstance(model, self.model):
+            raise TypeError(f"{type(self).__name__} stores {self.model.__name__} models, not {type(model).__name__}")
+
+        row = self._rows.get(key)
+        if row is None:
+            if self._size == len(self._keys):
+                self._grow()
+
+            row = self._size
+            self._size += 1
+            self._rows[key] = row
+            self._keys[row] = key
+            self._alive[row] = True
+
+        model_values = model.__dict__
+        for field in self._columns:
+            self._set_value(field=field, row=row, value=model_values.get(field))
+
+    def __getitem__(self, key: Any) -> BaseModel:
+        row = self._rows[key]
+        return self.model.construct(**{field: column.item(row) for field, column in self._columns.items()})
+
+    def __delitem__(self, key: Any) -> None:
+        row = self._rows.pop(key)
+        self._alive[row] = False
+        self._keys[row] = None
+
+        for column in self._columns.values():
+            if column.dtype == object:
+                column[row] = None  # references are released right away
+
+        if len(self._rows) * 2 < self._size and self._size > self.min_capacity:
+            self._compact()
+
+    def _compact(self) -> None:
+        """ Removes the deleted rows. The order of the rows is kept """
+        rows = np.flatnonzero(self._alive[:self._size])
+        size = len(rows)
+
+        for array in (self._keys, *self._columns.values()):
+            array[:size] = array[rows]
+
+            if array.dtype == object:
+                array[size:self._size] = None
+
+        self._alive[:size] = True
+        self._alive[size:self._size] = False
+        self._size = size
+        self._rows = dict(zip(self._keys[:size].tolist(), range(size)))
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def iter_rows(self, rows: Optional[np.ndarray] = None) -> Iterator[BaseModel]:
+        """ Creates the models of the rows in chunks, or of all the rows if they are not provided """
+        if rows is None:
+            rows = np.flatnonzero(self._alive[:self._size])
+
+        fields = list(self._columns)
+
+        for position in range(0, len(rows), self.chunk_size):
+            chunk = rows[position:position + self.chunk_size]
+            columns = [self._columns[field][chunk].tolist() for field in fields]
+
+            for values in zip(*columns):
+                yield self.model.construct(**dict(zip(fields, values)))
+
+    def values(self) -> ColumnarValues:
+        return ColumnarValues(self)
+
+    def items(self) -> ColumnarItems:
+        return ColumnarItems(self)
+
+    def clear(self) -> None:
+        self._keys = np.empty(0, dtype=object)
+        self._alive = np.zeros(0, dtype=bool)
+        self._rows.clear()
+        self._size = 0
+
+        if self.model is not None:
+            self._create_columns(self.model)
+
+    def _check_each(self, column: np.ndarray, check: Callable[[Any], Any]) -> np.ndarray:
+        """ Checks the values that NumPy cannot compare one by one, but without creating the models """
+        return np.fromiter(map(bool, map(check, column.tolist())), dtype=bool, count=len(column))
+
+    def _find_object_mask(self, column: np.ndarray, option: str, value: Any) -> Optional[np.ndarray]:
+        if option in self.column_operators and isinstance(value, (str, int, float, bool, type(None))):
+            return np.asarray(self.column_operators[option](column, value), dtype=bool)
+        elif option == 'in':
+            return self._check_each(column, lambda column_value: column_value in value)
+        elif option == 'is':
+            return self._check_each(column, lambda column_value: column_value is value)
+        elif option in ('like', 'regex') and isinstance(value, str):
+            pattern = re.compile(like_to_regex(value) if option == 'like' else value)
+            return self._check_each(column, pattern.match)
+
+        return None
+
+    def _find_mask(self, predicate: FilterPredicate) -> Optional[np.ndarray]:
+        """ Returns the rows that satisfy the named filter, or None if the columns cannot check it """
+        column = self._columns.get(predicate.field)
+        if column is None:
+            return None
+
+        column = column[:self._size]
+        option, value = predicate.option, predicate.value
+
+        if column.dtype == object:
+            alive = self._alive[:self._size]
+
+            try:    # deleted rows are None, so only the rows that are alive are checked
+                alive_mask = self._find_object_mask(column=column[alive], option=option, value=value)
+            except TypeError:   # some values cannot be compared, the filter is checked with the models
+                return None
+
+            if alive_mask is None:
+                return None
+
+            mask = np.zeros(self._size, dtype=bool)
+            mask[alive] = alive_mask
+            return mask
+
+        if column.dtype == bool:
+            if option in ('eq', 'is') and type(value) is bool:
+                return column == value
+        elif option in self.column_operators and type(value) in (int, float):
+            return self.column_operators[option](column, value)
+        elif option == 'in' and all(type(member) in (int, float) for member in value):
+            return np.isin(column, list(value))
+
+        return None
+
+    def find_lookup(self, predicates: List[FilterPredicate]) -> Optional[ColumnarLookup]:
+        """ Checks all the named filters that the columns support at once """
+        mask, found_predicates = None, []
+
+        for predicate in predicates:
+            predicate_mask = self._find_mask(predicate)
+            if predicate_mask is None:
+                continue
+
+            mask = predicate_mask if mask is None else mask & predicate_mask
+            found_predicates.append(predicate)
+
+        if mask is None:
+            return None
+
+        mask &= self._alive[:self._size]
+        return ColumnarLookup(predicates=found_predicates, rows=np.flatnonzero(mask))
+
+    def count_values(self, field: str, lookup: Optional[ColumnarLookup] = None) -> Optional[Dict[Any, int]]:
+        """
+        Counts the models for every value of the field with its column. Only the rows of the lookup are
+        counted if it is provided. Returns None if the field does not have a column.
+        """
+        column = self._columns.get(field)
+        if column is None:
+            return None
+
+        rows = np.flatnonzero(self._alive[:self._size]) if lookup is None else lookup.rows
+        values = column[rows]
+
+        if column.dtype == object:
+            return dict(Counter(values.tolist()))
+
+        unique_values, counts = np.unique(values, return_counts=True)
+        return dict(zip(unique_values.tolist(), counts.tolist()))
+
+    def __str__(self):
+        model_name = self.model.__name__ if self.model is not None else None
+        return f"{type(self).__name__}(model={model_name}, rows={len(self)}, columns={list(self._columns)})"
+
+    def __repr__(self):
+        return str(self)
+
+
+__all__ = [
+    'ColumnarSession',
+    'ColumnarValues',
+    'ColumnarLookup',
+]
@@ -0,0 +1,216 @@
+from copy import deepcopy
+from itertools import count
+from threading import RLock
+from contextlib import ExitStack
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Collection, Union, Set
+
+from assimilator.core.database.models import BaseModel
+from assimilator.core.database.exceptions import ConflictError
+from assimilator.internal.database.indexes import InternalIndex, HashIndex, IndexedSession, IndexedValues
+
+
+class SynchronizedIndex(InternalIndex):
+    """ Index that can be used by multiple threads. Every index has its own lock. """
+
+    def __init__(self, index: InternalIndex):
+        super(SynchronizedIndex, self).__init__(field=index.field)
+        self.index = index
+        self._lock = RLock()
+
+    def supports(self, option: str) -> bool:
+        return self.index.supports(option)
+
+    def add(self, key: Any, model: BaseModel) -> None:
+        with self._lock:
+            self.index.add(key=key, model=model)
+
+    def remove(self, key: Any) -> None:
+        with self._lock:
+            self.index.remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.index.clear()
+
+    def rebuild(self, session: Dict[Any, BaseModel]) -> None:
+        with self._lock:
+            self.index.rebuild(session)
+
+    def find(self, option: str, value: Any) -> Collection[Any]:
+        with self._lock:    # the keys are copied, so that other threads can change the index
+            return list(self.index.find(option=option, value=value))
+
+    def count(self, option: str, value: Any) -> int:
+        with self._lock:
+            return self.index.count(option=option, value=value)
+
+    def is_exact(self, option: str, value: Any = None) -> bool:
+        with self._lock:
+            return self.index.is_exact(option, value)
+
+    def is_ordered(self) -> bool:
+        with self._lock:
+            return self.index.is_ordered()
+
+    def iter_keys(self, reverse: bool = False) -> Iterator[Any]:
+        with self._lock:
+            return iter(list(self.index.iter_keys(reverse=reverse)))
+
+    def iter_keys_after(self, value: Any, reverse: bool = False) -> Iterator[Any]:
+        with self._lock:
+            return iter(list(self.index.iter_keys_after(value, reverse=reverse)))
+
+    def distinct_count(self) -> Optional[int]:
+        with self._lock:
+            return self.index.distinct_count()
+
+    def count_values(self) -> Optional[Dict[Any, int]]:
+        with self._lock:
+            return self.index.count_values()
+
+    def __deepcopy__(self, memo: dict) -> 'SynchronizedIndex':
+        with self._lock:
+            return SynchronizedIndex(index=deepcopy(self.index, memo))
+
+    def __str__(self):
+        return str(self.index)
+
+
+class ConcurrentValues(IndexedValues):
+    def __iter__(self) -> Iterator[BaseModel]:
+        return iter(list(dict.values(self._mapping)))   # copy is atomic, other threads can change the session
+
+
+class ConcurrentSession(IndexedSession):
+    """
+    Session that can be used by multiple threads at once. Keys are protected by striped locks,
+    so writes to different keys do not wait for each other. Every write gives the key a new version,
+    and JournaledSession uses these versions to find conflicting transactions on commit.
+    """
+
+    def __init__(self, *args, stripes: int = 64, indexes: Optional[Iterable[InternalIndex]] = None, **kwargs):
+        self._locks = [RLock() for _ in range(stripes)]
+        self._version_counter = count(1)
+        self._versions: Dict[Any, int] = {}
+        super(ConcurrentSession, self).__init__(*args, indexes=indexes, **kwargs)
+
+        for key in dict.keys(self):
+            self._versions[key] = next(self._version_counter)
+
+    def _get_locks(self, keys: Iterable[Any]) -> List[RLock]:
+        """ Locks are always taken in the same order, so that two commits do not wait for each other forever """
+        return [self._locks[stripe] for stripe in sorted({hash(key) % len(self._locks) for key in keys})]
+
+    def _lock_all(self) -> ExitStack:
+        stack = ExitStack()
+        for lock in self._locks:
+            stack.enter_context(lock)
+
+        return stack
+
+    def get_version(self, key: Any) -> Optional[int]:
+        return self._versions.get(key)
+
+    def add_index(self, index: Union[InternalIndex, str]) -> InternalIndex:
+        if isinstance(index, str):
+            index = HashIndex(field=index)
+
+        with self._lock_all():
+            for existing_index in self.indexes:
+                if type(existing_index.index) is type(index) and existing_index.field == index.field:
+                    return existing_index
+
+            synchronized_index = SynchronizedIndex(index=index)
+            synchronized_index.rebuild(self)
+            self.indexes.append(synchronized_index)
+            return synchronized_index
+
+    def commit_changes(
+        self,
+        changes: Dict[Any, BaseModel],
+        deleted: Set[Any],
+        versions: Dict[Any, Optional[int]],
+    ) -> None:
+        """
+        Applies the changes of the transaction if the changed keys were not
+        changed by other transactions after they were read.
+        """
+        changed_keys = {*changes, *deleted}
+
+        with ExitStack() as stack:
+            for lock in self._get_locks(changed_keys):
+                stack.enter_context(lock)
+
+            conflicts = [
+                key for key in changed_keys
+                if key in versions and self._versions.get(key) != versions[key]
+            ]
+            if conflicts:
+                raise ConflictError(f"Keys were changed by another transaction: {conflicts}")
+
+            for key in deleted:
+                if key in self:
+                    del self[key]
+
+            for key, model in changes.items():
+                self[key] = model
+
+    def values(self) -> ConcurrentValues:
+        return ConcurrentValues(self)
+
+    def items(self) -> List:
+        return list(dict.items(self))
+
+    def keys(self) -> List:
+        return list(dict.keys(self))
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(dict.keys(self)))
+
+    def __setitem__(self, key, value):
+        with self._locks[hash(key) % len(self._locks)]:
+            super(ConcurrentSession, self).__setitem__(key, value)
+            self._versions[key] = next(self._version_counter)
+
+    def __delitem__(self, key):
+        with self._locks[hash(key) % len(self._locks)]:
+            super(ConcurrentSession, self).__delitem__(key)
+            self._versions.pop(key, None)
+
+    def popitem(self):
+        with self._lock_all():
+            key, value = super(ConcurrentSession, self).popitem()
+            self._versions.pop(key, None)
+            return key, value
+
+    def clear(self) -> None:
+        with self._lock_all():
+            super(ConcurrentSession, self).clear()
+            self._versions.clear()
+
+    def copy(self) -> 'ConcurrentSession':
+        with self._lock_all():
+            copied_session = type(self)(stripes=len(self._locks))
+            dict.update(copied_session, self)
+            copied_session.indexes = deepcopy(self.indexes)
+            copied_session._versions = dict(self._versions)
+            return copied_session
+
+    def __deepcopy__(self, memo: dict) -> 'ConcurrentSession':
+        with self._lock_all():
+            copied_session = type(self)(stripes=len(self._locks))
+            memo[id(self)] = copied_session
+
+            dict.update(copied_session, deepcopy(dict(self), memo))
+            copied_session.indexes = deepcopy(self.indexes, memo)
+            copied_session._versions = dict(self._versions)
+            return copied_session
+
+    __copy__ = copy
+
+
+__all__ = [
+    'ConcurrentSession',
+    'SynchronizedIndex',
+    'ConcurrentValues',
+]
@@ -4,10 +4,14 @@ from assimilator.core.patterns.error_wrapper import ErrorWrapper
 
 class InternalErrorWrapper(ErrorWrapper):
     def __init__(self):
-        super(InternalErrorWrapper, self).__init__(error_mappings={
-            KeyError: NotFoundError,
-            TypeError: NotFoundError,
-        }, default_error=DataLayerError)
+        super(InternalErrorWrapper, self).__init__(
+            error_mappings={
+                KeyError: NotFoundError,
+                TypeError: NotFoundError,
+            },
+            skipped_errors={NotFoundError, DataLayerError},
+            default_error=DataLayerError,
+        )
 
 
 __all__ = ['InternalErrorWrapper']
@@ -0,0 +1,537 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections.abc import ValuesView
+from copy import deepcopy
+from typing import (
+    Any, Dict, Iterable, Iterator, List,
+    Optional, Collection, ClassVar, FrozenSet, Union,
+    Tuple, Callable,
+)
+
+from assimilator.core.database.models import BaseModel
+from assimilator.core.database.specifications.filtering_options import FILTERING_OPTIONS_SEPARATOR
+from assimilator.internal.database.specifications.utils import InternalContainers, find_model_value
+
+
+class InternalIndex(ABC):
+    """
+    Index that is kept up to date by the IndexedSession. Indexes answer filtering options
+    on a single field with a collection of candidate keys instead of scanning the whole session.
+    """
+    options: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __init__(self, field: str):
+        self.field = field
+        self._fields = field.split(FILTERING_OPTIONS_SEPARATOR)
+
+    def _get_values(self, model: BaseModel) -> Iterable[Any]:
+        model_val = find_model_value(fields=self._fields, model=model)
+
+        if len(self._fields) > 1 and isinstance(model_val, InternalContainers):
+            return model_val    # foreign fields are compared with each member, just like in find_attribute()
+
+        return (model_val,)
+
+    def supports(self, option: str) -> bool:
+        return option in self.options
+
+    @abstractmethod
+    def add(self, key: Any, model: BaseModel) -> None:
+        raise NotImplementedError("add() is not implemented in the index")
+
+    @abstractmethod
+    def remove(self, key: Any) -> None:
+        raise NotImplementedError("remove() is not implemented in the index")
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError("clear() is not implemented in the index")
+
+    @abstractmethod
+    def find(self, option: str, value: Any) -> Collection[Any]:
+        """
+        Returns the keys of all the models that may satisfy the filtering option.
+        The result can contain extra keys, so the filter must still be checked for them.
+        """
+        raise NotImplementedError("find() is not implemented in the index")
+
+    @abstractmethod
+    def count(self, option: str, value: Any) -> int:
+        """ Returns the number of keys that find() is going to return without creating them """
+        raise NotImplementedError("count() is not implemented in the index")
+
+    def is_exact(self, option: str, value: Any = None) -> bool:
+        """ Returns True if find() returns only the keys that satisfy the filtering option with the value """
+        return False
+
+    def is_ordered(self) -> bool:
+        """ Returns True if iter_keys() can be used for ordering """
+        return False
+
+    def iter_keys(self, reverse: bool = False) -> Iterator[Any]:
+        raise NotImplementedError("iter_keys() is not implemented in the index")
+
+    def iter_keys_after(self, value: Any, reverse: bool = False) -> Iterator[Any]:
+        """ Same as iter_keys(), but only the keys whose values come strictly after the value. Used by seek() """
+        raise NotImplementedError("iter_keys_after() is not implemented in the index")
+
+    def distinct_count(self) -> Optional[int]:
+        """ Returns the number of different values in the index if the index knows it """
+        return None
+
+    def count_values(self) -> Optional[Dict[Any, int]]:
+        """ Returns the number of models for every value if each model has exactly one value in the index """
+        return None
+
+    def rebuild(self, session: Dict[Any, BaseModel]) -> None:
+        self.clear()
+
+        for key, model in session.items():
+            self.add(key=key, model=model)
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.field})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class HashIndex(InternalIndex):
+    """ Maps the values of the field to the keys of the models. Used for eq, is and in filtering options. """
+    options = frozenset({'eq', 'is', 'in'})
+
+    def __init__(self, field: str):
+        super(HashIndex, self).__init__(field=field)
+        self._buckets: Dict[Any, Dict[Any, None]] = {}  # dicts are used as ordered sets
+        self._key_values: Dict[Any, List[Any]] = {}
+        self._unhashable: Dict[Any, None] = {}
+        self._multi_valued = 0
+
+    def add(self, key: Any, model: BaseModel) -> None:
+        if key in self._key_values or key in self._unhashable:
+            self.remove(key)
+
+        try:
+            values = list(self._get_values(model))
+        except AttributeError:
+            self._unhashable[key] = None
+            return
+
+        for value in values:
+            try:
+                self._buckets.setdefault(value, {})[key] = None
+            except TypeError:   # unhashable values are always returned as candidates
+                self._unhashable[key] = None
+
+        self._key_values[key] = values
+        self._multi_valued += len(values) != 1
+
+    def remove(self, key: Any) -> None:
+        self._unhashable.pop(key, None)
+        values = self._key_values.pop(key, None)
+
+        if values is None:
+            return
+
+        self._multi_valued -= len(values) != 1
+
+        for value in values:
+            try:
+                bucket = self._buckets.get(value)
+            except TypeError:
+                continue
+
+            if bucket is None:
+                continue
+
+            bucket.pop(key, None)
+            if not bucket:
+                del self._buckets[value]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._key_values.clear()
+        self._unhashable.clear()
+        self._multi_valued = 0
+
+    @staticmethod
+    def _get_members(option: str, value: Any) -> Optional[Dict[Any, None]]:
+        """
+        Returns the values that must be looked up, or None if the index cannot find them. Unhashable values can
+        only be found with a scan, and the in option checks strings for substrings instead of their characters.
+        """
+        if option != 'in':
+            value = (value,)
+        elif isinstance(value, str):
+            return None
+
+        try:
+            return dict.fromkeys(value)     # the same member must not be found twice
+        except TypeError:
+            return None
+
+    def find(self, option: str, value: Any) -> Collection[Any]:
+        members = self._get_members(option=option, value=value)
+        if members is None:
+            return {**dict.fromkeys(self._key_values), **self._unhashable}
+        elif len(members) == 1 and not self._unhashable:
+            return self._buckets.get(next(iter(members)), {})
+
+        found_keys = {}
+        for member in members:
+            found_keys.update(self._buckets.get(member, {}))
+
+        found_keys.update(self._unhashable)
+        return found_keys
+
+    def count(self, option: str, value: Any) -> int:
+        members = self._get_members(option=option, value=value)
+        if members is None:
+            return len(self._key_values) + len(self._unhashable)
+
+        return sum(len(self._buckets.get(member, ())) for member in members) + len(self._unhashable)
+
+    def distinct_count(self) -> int:
+        return len(self._buckets)
+
+    def count_values(self) -> Optional[Dict[Any, int]]:
+        if self._unhashable or self._multi_valued:
+            return None
+
+        return {value: len(keys) for value, keys in self._buckets.items()}
+
+    def is_exact(self, option: str, value: Any = None) -> bool:
+        return (
+            option in ('eq', 'in') and not self._unhashable and not self._multi_valued
+            and self._get_members(option=option, value=value) is not None
+        )
+
+
+class SortedIndex(InternalIndex):
+    """
+    Keeps the values of the field sorted. Used for range filtering options and ordering.
+    Values are stored in buckets, so insertions and deletions do not move the whole index.
+    """
+    options = frozenset({'eq', 'gt', 'gte', 'lt', 'lte'})
+    bucket_size: ClassVar[int] = 1000
+
+    def __init__(self, field: str):
+        super(SortedIndex, self).__init__(field=field)
+        self._values: List[List[Any]] = []
+        self._keys: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._size = 0
+        self._key_values: Dict[Any, List[Any]] = {}
+        self._unsortable: Dict[Any, None] = {}
+
+    def _insert(self, key: Any, value: Any) -> None:
+        if value is None:
+            raise TypeError("None cannot be sorted")
+        elif not self._maxes:
+            self._values.append([value])
+            self._keys.append([key])
+            self._maxes.append(value)
+            self._size += 1
+            return
+
+        position = min(bisect_right(self._maxes, value), len(self._maxes) - 1)
+        values, keys = self._values[position], self._keys[position]
+        value_position = bisect_right(values, value)
+
+        values.insert(value_position, value)
+        keys.insert(value_position, key)
+        self._maxes[position] = values[-1]
+        self._size += 1
+
+        if len(values) > self.bucket_size * 2:
+            self._values[position:position + 1] = values[:self.bucket_size], values[self.bucket_size:]
+            self._keys[position:position + 1] = keys[:self.bucket_size], keys[self.bucket_size:]
+            self._maxes[position:position + 1] = values[self.bucket_size - 1], values[-1]
+
+    def _delete(self, key: Any, value: Any) -> None:
+        position = bisect_left(self._maxes, value)
+
+        while position < len(self._maxes):
+            values, keys = self._values[position], self._keys[position]
+            value_position = bisect_left(values, value)
+
+            while value_position < len(values) and values[value_position] == value:
+                if keys[value_position] == key:
+                    del values[value_position]
+                    del keys[value_position]
+                    self._size -= 1
+
+                    if values:
+                        self._maxes[position] = values[-1]
+                    else:
+                        del self._values[position], self._keys[position], self._maxes[position]
+
+                    return
+
+                value_position += 1
+
+            if value_position < len(values):
+                return
+
+            position += 1
+
+    def add(self, key: Any, model: BaseModel) -> None:
+        if key in self._key_values or key in self._unsortable:
+            self.remove(key)
+
+        try:
+            values = list(self._get_values(model))
+        except AttributeError:
+            self._unsortable[key] = None
+            return
+
+        sorted_values = []
+        for value in values:
+            try:
+                self._insert(key=key, value=value)
+                sorted_values.append(value)
+            except TypeError:   # values that cannot be compared are always returned as candidates
+                self._unsortable[key] = None
+
+        self._key_values[key] = sorted_values
+
+    def remove(self, key: Any) -> None:
+        self._unsortable.pop(key, None)
+
+        for value in self._key_values.pop(key, ()):
+            self._delete(key=key, value=value)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._keys.clear()
+        self._maxes.clear()
+        self._size = 0
+        self._key_values.clear()
+        self._unsortable.clear()
+
+    def _find_position(self, value: Any, bisect_func: Callable) -> Tuple[int, int]:
+        position = bisect_func(self._maxes, value)
+        if position == len(self._maxes):
+            return position, 0
+
+        return position, bisect_func(self._values[position], value)
+
+    def _iter_range(self, start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Any]:
+        start_position, start_value = start
+        end_position, end_value = end
+
+        for position in range(start_position, min(end_position + 1, len(self._keys))):
+            keys = self._keys[position]
+            yield from keys[
+                (start_value if position == start_position else 0):
+                (end_value if position == end_position else len(keys))
+            ]
+
+    def iter_keys(self, reverse: bool = False) -> Iterator[Any]:
+        """ Iterates over the keys of the models ordered by the value of the field """
+        if reverse:
+            return (key for keys in reversed(self._keys) for key in reversed(keys))
+
+        return (key for keys in self._keys for key in keys)
+
+    def iter_keys_after(self, value: Any, reverse: bool = False) -> Iterator[Any]:
+        """ Iterates over the ordered keys of the models whose values come strictly after the value """
+        if not reverse:
+            position, value_position = self._find_position(value, bisect_right)
+            return self._iter_range(start=(position, value_position), end=(len(self._keys), 0))
+
+        position, value_position = self._find_position(value, bisect_left)
+        return (
+            key
+            for keys_position in range(min(position, len(self._keys) - 1), -1, -1)
+            for key in reversed(
+                self._keys[keys_position][:value_position] if keys_position == position
+                else self._keys[keys_position]
+            )
+        )
+
+    def is_ordered(self) -> bool:
+        """ Returns True if the index contains exactly one value for each model and can be used for ordering """
+        return not self._unsortable and self._size == len(self._key_values)
+
+    def _find_range(self, option: str, value: Any) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        first, last = (0, 0), (len(self._maxes), 0)
+
+        if option == 'eq':
+            first = self._find_position(value, bisect_left)
+            last = self._find_position(value, bisect_right)
+        elif option == 'gt':
+            first = self._find_position(value, bisect_right)
+        elif option == 'gte':
+            first = self._find_position(value, bisect_left)
+        elif option == 'lt':
+            last = self._find_position(value, bisect_left)
+        elif option == 'lte':
+            last = self._find_position(value, bisect_right)
+
+        return first, last
+
+    def find(self, option: str, value: Any) -> Collection[Any]:
+        first, last = self._find_range(option=option, value=value)
+
+        found_keys = dict.fromkeys(self._iter_range(start=first, end=last))
+        found_keys.update(self._unsortable)
+        return found_keys
+
+    def count(self, option: str, value: Any) -> int:
+        (start_position, start_value), (end_position, end_value) = self._find_range(option=option, value=value)
+
+        if start_position >= len(self._keys):
+            return len(self._unsortable)
+
+        found_count = sum(len(keys) for keys in self._keys[start_position:end_position]) - start_value
+        if end_position < len(self._keys):
+            found_count += end_value
+
+        return max(found_count, 0) + len(self._unsortable)
+
+    def is_exact(self, option: str, value: Any = None) -> bool:
+        return self.is_ordered()
+
+
+class OrderedQuery:
+    """ Query that is already ordered by the field. Ordering specifications use it to skip sorting. """
+
+    def __init__(self, query: Iterable[BaseModel], ordering: str):
+        self.query = query
+        self.ordering = ordering
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        return iter(self.query)
+
+
+class IndexedValues(ValuesView):
+    """ Values of the IndexedSession. Specifications use it to find the indexes of the session. """
+
+    @property
+    def session(self) -> 'IndexedSession':
+        return self._mapping
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        return iter(dict.values(self._mapping))
+
+
+class IndexedSession(dict):
+    """
+    Session for the InternalRepository that keeps all the indexes up to date
+    whenever the data is changed. Indexes are only updated when a model is set in the session,
+    so models that are changed in place must be saved again, or the indexes keep their old values.
+    """
+
+    def __init__(self, *args, indexes: Optional[Iterable[InternalIndex]] = None, **kwargs):
+        self.indexes: List[InternalIndex] = []
+        super(IndexedSession, self).__init__(*args, **kwargs)
+
+        for index in (indexes or ()):
+            self.add_index(index)
+
+    def add_index(self, index: Union[InternalIndex, str]) -> InternalIndex:
+        if isinstance(index, str):
+            index = HashIndex(field=index)
+
+        for existing_index in self.indexes:
+            if type(existing_index) is type(index) and existing_index.field == index.field:
+                return existing_index
+
+        index.rebuild(self)
+        self.indexes.append(index)
+        return index
+
+    def get_index(self, field: str, option: str) -> Optional[InternalIndex]:
+        for index in self.indexes:
+            if index.field == field and index.supports(option):
+                return index
+
+        return None
+
+    def get_ordered_index(self, field: str) -> Optional[InternalIndex]:
+        """ Returns the index that can be used to order the models by the field """
+        for index in self.indexes:
+            if index.field == field and index.is_ordered():
+                return index
+
+        return None
+
+    def values(self) -> IndexedValues:
+        return IndexedValues(self)
+
+    def __setitem__(self, key, value):
+        super(IndexedSession, self).__setitem__(key, value)
+
+        for index in self.indexes:
+            index.add(key=key, model=value)
+
+    def __delitem__(self, key):
+        super(IndexedSession, self).__delitem__(key)
+
+        for index in self.indexes:
+            index.remove(key)
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super(IndexedSession, self).pop(key, *default)
+
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self):
+        key, value = super(IndexedSession, self).popitem()
+
+        for index in self.indexes:
+            index.remove(key)
+
+        return key, value
+
+    def clear(self) -> None:
+        super(IndexedSession, self).clear()
+
+        for index in self.indexes:
+            index.clear()
+
+    def copy(self) -> 'IndexedSession':
+        copied_session = type(self)()
+        dict.update(copied_session, self)
+        copied_session.indexes = deepcopy(self.indexes)
+        return copied_session
+
+    def __deepcopy__(self, memo: dict) -> 'IndexedSession':
+        copied_session = type(self)()
+        memo[id(self)] = copied_session
+
+        dict.update(copied_session, deepcopy(dict(self), memo))
+        copied_session.indexes = deepcopy(self.indexes, memo)
+        return copied_session
+
+    __copy__ = copy
+
+
+def get_model_indexes(model) -> Iterable[Union[InternalIndex, str]]:
+    config = getattr(model, 'AssimilatorConfig', None)
+    return getattr(config, 'indexes', None) or ()
+
+
+__all__ = [
+    'InternalIndex',
+    'HashIndex',
+    'SortedIndex',
+    'OrderedQuery',
+    'IndexedSession',
+    'IndexedValues',
+    'get_model_indexes',
+]
@@ -0,0 +1,298 @@
+from copy import deepcopy
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Collection, Mapping
+
+from assimilator.core.database.models import BaseModel
+from assimilator.internal.database.indexes import InternalIndex, IndexedValues
+from assimilator.internal.database.specifications.planner import FilterPredicate, FilterLookupProtocol
+
+
+class JournaledIndex(InternalIndex):
+    """
+    Read-only view of the index of the base session that takes the changes
+    of the JournaledSession into account. Changed models are always returned as candidates.
+    """
+
+    def __init__(self, index: InternalIndex, session: 'JournaledSession'):
+        super(JournaledIndex, self).__init__(field=index.field)
+        self.index = index
+        self.session = session
+
+    def supports(self, option: str) -> bool:
+        return self.index.supports(option)
+
+    def add(self, key: Any, model: BaseModel) -> None:
+        raise TypeError("JournaledIndex is changed by the base session only")
+
+    def remove(self, key: Any) -> None:
+        raise TypeError("JournaledIndex is changed by the base session only")
+
+    def clear(self) -> None:
+        raise TypeError("JournaledIndex is changed by the base session only")
+
+    def find(self, option: str, value: Any) -> Collection[Any]:
+        changed_keys = self.session.changed_keys()
+        deleted_keys = self.session.deleted_keys()
+
+        found_keys = {
+            key: None for key in self.index.find(option=option, value=value)
+            if key not in changed_keys and key not in deleted_keys
+        }
+        found_keys.update(changed_keys)
+        return found_keys
+
+    def count(self, option: str, value: Any) -> int:
+        return self.index.count(option=option, value=value) + len(self.session.changed_keys())
+
+    def is_exact(self, option: str, value: Any = None) -> bool:
+        """ count() does not know which of the deleted keys it contains, so it is only exact without changes """
+        return (
+            not self.session.changed_keys() and not self.session.deleted_keys()
+            and self.index.is_exact(option, value)
+        )
+
+    def is_ordered(self) -> bool:
+        return not self.session.changed_keys() and self.index.is_ordered()
+
+    def iter_keys(self, reverse: bool = False) -> Iterator[Any]:
+        deleted_keys = self.session.deleted_keys()
+        return (key for key in self.index.iter_keys(reverse=reverse) if key not in deleted_keys)
+
+    def iter_keys_after(self, value: Any, reverse: bool = False) -> Iterator[Any]:
+        """ Only used when is_ordered() is True, so there are no changed keys to merge, only deleted ones """
+        deleted_keys = self.session.deleted_keys()
+        return (key for key in self.index.iter_keys_after(value, reverse=reverse) if key not in deleted_keys)
+
+    def distinct_count(self) -> Optional[int]:
+        return self.index.distinct_count()
+
+    def count_values(self) -> Optional[Dict[Any, int]]:
+        if self.session.changed_keys() or self.session.deleted_keys():
+            return None
+
+        return self.index.count_values()
+
+
+class JournaledLookup:
+    """
+    Lookup of the base session that takes the changes of the JournaledSession into account.
+    Changed models are always returned as candidates.
+    """
+    ordering = None
+
+    def __init__(self, lookup: FilterLookupProtocol, session: 'JournaledSession'):
+        self.lookup = lookup
+        self.session = session
+
+    @property
+    def predicates(self) -> List[FilterPredicate]:
+        return self.lookup.predicates
+
+    @property
+    def exact(self) -> bool:
+        return not self.session.changed_keys() and not self.session.deleted_keys() and self.lookup.exact
+
+    @property
+    def count(self) -> int:
+        return self.lookup.count + len(self.session.changed_keys())
+
+    def find_models(self, session: 'JournaledSession') -> Iterator[BaseModel]:
+        changed_keys = session.changed_keys()
+        deleted_keys = session.deleted_keys()
+
+        for model in self.lookup.find_models(session.base):
+            if model.id not in changed_keys and model.id not in deleted_keys:
+                yield model
+
+        for key in changed_keys:
+            yield session[key]
+
+    def __str__(self):
+        return f"{self.lookup} + {len(self.session.changed_keys())} changed models"
+
+
+class JournaledValues(IndexedValues):
+    def __iter__(self) -> Iterator[BaseModel]:
+        session: JournaledSession = self._mapping
+        return session.iter_models()
+
+
+class JournaledSession(MutableMapping):
+    """
+    Copy-on-write session that is used by the InternalUnitOfWork.
+    Only the changed keys and the copies of the models that were read are stored.
+    The base session is not changed until apply() is called.
+    """
+
+    def __init__(self, base: Mapping):
+        self.base = base
+        self._written: Dict[Any, BaseModel] = {}
+        self._copies: Dict[Any, Tuple[BaseModel, BaseModel]] = {}
+        self._deleted: Set[Any] = set()
+        self._versions: Dict[Any, Optional[int]] = {}
+
+    @property
+    def indexes(self) -> List[JournaledIndex]:
+        return [JournaledIndex(index=index, session=self) for index in getattr(self.base, 'indexes', ())]
+
+    def get_index(self, field: str, option: str) -> Optional[JournaledIndex]:
+        if not hasattr(self.base, 'get_index'):
+            return None
+
+        index = self.base.get_index(field=field, option=option)
+        return None if index is None else JournaledIndex(index=index, session=self)
+
+    def get_ordered_index(self, field: str) -> Optional[JournaledIndex]:
+        if not hasattr(self.base, 'get_ordered_index'):
+            return None
+
+        index = self.base.get_ordered_index(field=field)
+        return None if index is None else JournaledIndex(index=index, session=self)
+
+    def find_lookup(self, predicates: List[FilterPredicate]) -> Optional[JournaledLookup]:
+        if not hasattr(self.base, 'find_lookup'):
+            return None
+
+        lookup = self.base.find_lookup(predicates)
+        return None if lookup is None else JournaledLookup(lookup=lookup, session=self)
+
+    def changed_keys(self) -> Dict[Any, None]:
+        return {**dict.fromkeys(self._copies), **dict.fromkeys(self._written)}
+
+    def deleted_keys(self) -> Set[Any]:
+        return self._deleted
+
+    def _record_version(self, key: Any) -> None:
+        """ Remembers the version of the key that the transaction has seen first """
+        if key not in self._versions and hasattr(self.base, 'get_version'):
+            self._versions[key] = self.base.get_version(key)
+
+    def checkout(self, model: BaseModel) -> BaseModel:
+        """
+        Returns a copy of the model that belongs to the transaction. We copy the models that are read from
+        the base session, so that changes made to them are only visible after apply().
+        """
+        key = model.id
+
+        if key in self._written:
+            return self._written[key]
+        elif key in self._copies:
+            return self._copies[key][1]
+
+        self._record_version(key)
+        base_model = self.base.get(key)     # read after the version, so that the version is never newer
+        if base_model is None:
+            return model
+
+        model_copy = deepcopy(base_model)
+        self._copies[key] = (base_model, model_copy)
+        return model_copy
+
+    def iter_models(self) -> Iterator[BaseModel]:
+        for key, model in self.base.items():
+            if key in self._deleted:
+                continue
+            elif key in self._written:
+                yield self._written[key]
+            elif key in self._copies:
+                yield self._copies[key][1]
+            else:
+                yield model
+
+        for key, model in self._written.items():
+            if key not in self.base:
+                yield model
+
+    def values(self) -> JournaledValues:
+        return JournaledValues(self)
+
+    def __getitem__(self, key: Any) -> BaseModel:
+        if key in self._written:
+            return self._written[key]
+        elif key in self._deleted:
+            raise KeyError(key)
+        elif key in self._copies:
+            return self._copies[key][1]
+
+        return self.base[key]
+
+    def __setitem__(self, key: Any, model: BaseModel) -> None:
+        self._record_version(key)
+        self._deleted.discard(key)
+        self._copies.pop(key, None)
+        self._written[key] = model
+
+    def __delitem__(self, key: Any) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        self._record_version(key)
+        self._written.pop(key, None)
+        self._copies.pop(key, None)
+
+        if key in self.base:
+            self._deleted.add(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._written or (key not in self._deleted and key in self.base)
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in self.base:
+            if key not in self._deleted:
+                yield key
+
+        for key in self._written:
+            if key not in self.base:
+                yield key
+
+    def __len__(self) -> int:
+        created_count = sum(1 for key in self._written if key not in self.base)
+        return len(self.base) - len(self._deleted) + created_count
+
+    def apply(self) -> None:
+        """
+        Applies all the changes to the base session. Takes O(changes) time.
+        If the base session supports versions, ConflictError is raised when
+        another transaction changed the same keys first.
+        """
+        changes = {
+            key: model_copy
+            for key, (original, model_copy) in self._copies.items()
+            if model_copy != original
+        }
+        changes.update(self._written)
+
+        if hasattr(self.base, 'commit_changes'):
+            self.base.commit_changes(changes=changes, deleted=self._deleted, versions=self._versions)
+        else:
+            for key in self._deleted:
+                if key in self.base:
+                    del self.base[key]
+
+            for key, model in changes.items():
+                self.base[key] = model
+
+        self.clear_journal()
+
+    def clear_journal(self) -> None:
+        self._written.clear()
+        self._copies.clear()
+        self._deleted.clear()
+        self._versions.clear()
+
+    def __str__(self):
+        return (
+            f"{type(self).__name__}(written={len(self._written)}, "
+            f"copied={len(self._copies)}, deleted={len(self._deleted)})"
+        )
+
+    def __repr__(self):
+        return str(self)
+
+
+__all__ = [
+    'JournaledSession',
+    'JournaledIndex',
+    'JournaledValues',
+    'JournaledLookup',
+]
@@ -1,6 +1,8 @@
-from typing import Type, Union, Optional, TypeVar, List
+from collections import Counter
+from typing import Type, Union, Optional, TypeVar, List, Iterable, Sequence, Dict, Any, ClassVar
 
 from assimilator.core.patterns.error_wrapper import ErrorWrapper
+from assimilator.core.patterns.context_values import ContextValues
 from assimilator.internal.database.error_wrapper import InternalErrorWrapper
 from assimilator.core.database import (
     Repository,
@@ -12,7 +14,12 @@ from assimilator.core.database import (
 )
 from assimilator.core.database import MultipleResultsError
 from assimilator.internal.database.specifications.specifications import InternalSpecificationList
+from assimilator.internal.database.specifications.filter_specifications import InternalFilter, CompositeFilter
+from assimilator.internal.database.specifications.internal_operator import compile_getter
+from assimilator.internal.database.specifications.planner import FilterLookupProtocol
 from assimilator.internal.database.models_utils import dict_to_internal_models
+from assimilator.internal.database.indexes import InternalIndex, IndexedSession, get_model_indexes
+from assimilator.internal.database.journal import JournaledSession
 
 ModelT = TypeVar("ModelT", bound=BaseModel)
 
@@ -20,6 +27,7 @@ ModelT = TypeVar("ModelT", bound=BaseModel)
 class InternalRepository(Repository):
     session: dict
     model: Type[ModelT]
+    _transactions: ClassVar[ContextValues[dict]] = ContextValues("internal_repository_transactions")
 
     def __init__(
         self,
@@ -28,6 +36,7 @@ class InternalRepository(Repository):
         initial_query: Optional[str] = '',
         specifications: Type[InternalSpecificationList] = InternalSpecificationList,
         error_wrapper: Optional[ErrorWrapper] = None,
+        indexes: Optional[Iterable[Union[InternalIndex, str]]] = None,
     ):
         super(InternalRepository, self).__init__(
             model=model,
@@ -36,6 +45,19 @@ class InternalRepository(Repository):
             specifications=specifications,
             error_wrapper=error_wrapper or InternalErrorWrapper(),
         )
+        if isinstance(session, IndexedSession):
+            for index in (*(indexes or ()), *get_model_indexes(model)):
+                session.add_index(index)
+
+    @property
+    def transaction(self) -> dict:
+        """ Session that is used by the current thread or task. InternalUnitOfWork replaces it for its transactions """
+        transaction = self._transactions.get(self)   # every thread and asyncio task has its own transaction
+        return self.session if transaction is None else transaction
+
+    @transaction.setter
+    def transaction(self, transaction: dict) -> None:
+        self._transactions.set(self, None if transaction is self.session else transaction)
 
     def get(
         self,
@@ -49,10 +71,10 @@ class InternalRepository(Repository):
         )
 
         if query:   # Dict key was not provided, we must use other search parameters
-            return self.session[query]
+            return self._checkout(self.transaction[query])
 
         found_models = list(self._apply_specifications(
-            query=self.session.values(),
+            query=self.transaction.values(),
             specifications=specifications,
         ))
 
@@ -61,7 +83,7 @@ class InternalRepository(Repository):
         elif len(found_models) != 1:
             raise MultipleResultsError(f"{self} repository found multiple results: {found_models}")
 
-        return found_models[0]
+        return self._checkout(found_models[0])
 
     def filter(
         self,
@@ -69,10 +91,30 @@ class InternalRepository(Repository):
         lazy: bool = False,
         initial_query: Optional[str] = None,
     ) -> Union[LazyCommand[List[ModelT]], List[ModelT]]:
-        return list(self._apply_specifications(
-            query=self.session.values(),
+        found_models = self._apply_specifications(
+            query=self.transaction.values(),
             specifications=specifications,
-        ))
+        )
+
+        if isinstance(self.transaction, JournaledSession):
+            return [self.transaction.checkout(model) for model in found_models]
+
+        return list(found_models)
+
+    def load_many(self, field: str, values: Iterable[Any]) -> List[ModelT]:
+        """ Finds the models for BatchLoader. Ids are the keys of the session, so they are read without filters """
+        if field != 'id':
+            return self.filter(self.specs.filter(**{f"{field}__in": list(values)}))
+
+        transaction = self.transaction
+        return [self._checkout(transaction[value]) for value in values if value in transaction]
+
+    def _checkout(self, model: ModelT) -> ModelT:
+        """ Models that are read in a transaction are copied, so that the changes are only applied on commit """
+        if isinstance(self.transaction, JournaledSession):
+            return self.transaction.checkout(model)
+
+        return model
 
     def dict_to_models(self, data: dict) -> ModelT:
         return self.model(**dict_to_internal_models(data=data, model=self.model))
@@ -81,17 +123,29 @@ class InternalRepository(Repository):
         if obj is None:
             obj = self.dict_to_models(obj_data)
 
-        self.session[obj.id] = obj
+        self.transaction[obj.id] = obj
         return obj
 
+    def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        objs = list(objs)
+        self.transaction.update((obj.id, obj) for obj in objs)
+        return objs
+
+    def update_many(self, objs: Iterable[ModelT]) -> None:
+        self.save_many(objs)
+
+    def delete_many(self, objs: Iterable[ModelT]) -> None:
+        for obj in objs:
+            del self.transaction[obj.id]
+
     def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
         obj, specifications = self._check_obj_is_specification(obj, specifications)
 
         if specifications:
             for model in self.filter(*specifications, lazy=True):
-                del self.session[model.id]
+                del self.transaction[model.id]
         elif obj is not None:
-            del self.session[obj.id]
+            del self.transaction[obj.id]
 
     def update(
         self,
@@ -122,18 +176,89 @@ class InternalRepository(Repository):
         fresh_obj = self.get(self.specs.filter(id=obj.id), lazy=False)
         obj.__dict__.update(fresh_obj.__dict__)
 
+    def explain(self, *specifications: SpecificationType) -> str:
+        """ Shows how the specifications are going to be applied to the session """
+        query = self.transaction.values()
+        steps = []
+
+        for specification in specifications:
+            if isinstance(specification, InternalFilter):
+                steps.append(str(specification.explain(query=query)))
+            else:
+                steps.append(getattr(specification, '__name__', str(specification)))
+
+            query = None    # only the first specification works with the whole session
+
+        return "\n".join(steps)
+
+    def _find_exact_lookup(self, specifications: Sequence[SpecificationType]) -> Optional[FilterLookupProtocol]:
+        """ Returns the index or column lookup that finds exactly the filtered models, so that they are not checked """
+        if len(specifications) != 1:
+            return None
+
+        specification, = specifications
+        if not isinstance(specification, InternalFilter) or isinstance(specification, CompositeFilter):
+            return None
+
+        plan = specification.explain(query=self.transaction.values())
+        if plan.lookup is None or plan.predicates or not plan.lookup.exact:
+            return None
+
+        return plan.lookup
+
+    def _count_values(self, field: str, specifications: Sequence[SpecificationType]) -> Dict[Any, int]:
+        session = self.transaction
+        lookup = None
+
+        if not specifications:
+            for index in getattr(session, 'indexes', ()):
+                counted_values = index.count_values() if index.field == field else None
+                if counted_values is not None:
+                    return counted_values
+        else:
+            lookup = self._find_exact_lookup(specifications)
+
+        if hasattr(session, 'count_values') and (lookup is not None or not specifications):
+            counted_values = session.count_values(field=field, lookup=lookup)
+            if counted_values is not None:
+                return counted_values
+
+        found_models = self._apply_specifications(query=session.values(), specifications=specifications)
+        return dict(Counter(map(compile_getter(field), found_models)))
+
     def count(
         self,
         *specifications: SpecificationType,
         lazy: bool = False,
         initial_query: Optional[str] = None,
-    ) -> Union[LazyCommand[int], int]:
-        if specifications:
-            return len(list(self._apply_specifications(  # We do not call filter() for list() optimization
-                query=self.session.values(),
-                specifications=specifications,
-            )))
-        return len(self.session)
+        distinct: Optional[str] = None,
+        group_by: Optional[str] = None,
+    ) -> Union[LazyCommand[Union[int, Dict[Any, int]]], int, Dict[Any, int]]:
+        """
+        Counts the models without creating a list of them. Use distinct to count the different values of
+        the field, or group_by to get the number of models for every value of the field.
+        """
+        if distinct is not None and group_by is not None:
+            raise InvalidQueryError("count() accepts either distinct or group_by, not both")
+        elif distinct is not None:
+            return len(self._count_values(field=distinct, specifications=specifications))
+        elif group_by is not None:
+            return self._count_values(field=group_by, specifications=specifications)
+        elif not specifications:
+            return len(self.transaction)
+
+        lookup = self._find_exact_lookup(specifications)
+        if lookup is not None:  # index or column cardinality
+            return lookup.count
+
+        models_count = 0
+        for models_count, _ in enumerate(self._apply_specifications(
+            query=self.transaction.values(),
+            specifications=specifications,
+        ), start=1):
+            pass
+
+        return models_count
 
 
 __all__ = [
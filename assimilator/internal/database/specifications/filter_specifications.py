@@ -1,18 +1,21 @@
 from operator import or_, and_
-from typing import Union, List, Generator, Any
+from typing import Union, List, Optional, Iterable, Callable, Hashable
 
 from assimilator.core.database.models import BaseModel
-from assimilator.core.database import FilterSpecification
-from assimilator.internal.database.specifications.internal_operator import invert
+from assimilator.core.database import FilterSpecification, get_fingerprint
+from assimilator.internal.database.specifications.internal_operator import invert, all_of, any_of
 from assimilator.internal.database.specifications.filtering_options import InternalFilteringOptions
+from assimilator.internal.database.specifications.planner import QueryPlanner, FilterPredicate, FilterPlan
 
 QueryT = Union[str, List[BaseModel]]
 
 
 class InternalFilter(FilterSpecification):
     filtering_options_cls = InternalFilteringOptions
+    planner: QueryPlanner = QueryPlanner()
 
     def __init__(self, *filters, **named_filters):
+        fingerprint_arguments = (filters, dict(named_filters))    # id is removed from the named filters below
         self.text_filters = [filter_ for filter_ in filters if isinstance(filter_, str)]
 
         if named_filters.get('id'):
@@ -23,16 +26,41 @@ class InternalFilter(FilterSpecification):
             **named_filters,
         )
 
-    def __call__(self, query: QueryT, **context) -> Union[str, Generator[BaseModel, Any, None]]:
+        direct_filters_count = len(self.filters) - len(named_filters)
+        self.predicates: List[FilterPredicate] = [
+            FilterPredicate(func=filter_func) for filter_func in self.filters[:direct_filters_count]
+        ]
+
+        for filter_func, (raw_field, value) in zip(self.filters[direct_filters_count:], named_filters.items()):
+            field, option = self.filtering_options.split_field(raw_field)
+            self.predicates.append(FilterPredicate(
+                func=filter_func,
+                field=field,
+                option=option or 'eq',
+                value=value,
+            ))
+
+        self._compiled: Optional[Callable[[BaseModel], bool]] = None
+        self._fingerprint_arguments = fingerprint_arguments
+
+    def compile(self) -> Callable[[BaseModel], bool]:
+        """ Returns one predicate that checks all the filters. It is created once for every filter """
+        if self._compiled is None:
+            self._compiled = all_of(*self.filters)
+
+        return self._compiled
+
+    def explain(self, query: Optional[Iterable[BaseModel]] = None) -> FilterPlan:
+        """ Returns the plan that is going to be used to filter the query. Use str() to see it. """
+        return self.planner.plan(predicates=self.predicates, query=query)
+
+    def __call__(self, query: QueryT, **context) -> Union[str, Iterable[BaseModel]]:
         if isinstance(query, str):
             return f'{query}{"".join(str(filter_) for filter_ in self.text_filters)}'
         elif not self.filters:
             return query
 
-        return (
-            model for model in query
-            if all(filter_func(model) for filter_func in self.filters)
-        )
+        return self.explain(query=query).execute(query)
 
     def __or__(self, other: Union['InternalFilter', 'CompositeFilter']) -> 'InternalFilter':
         return CompositeFilter(first=self, second=other, operation=or_)
@@ -56,16 +84,45 @@ class CompositeFilter(InternalFilter):
         self.second = second
         self.operation = operation
 
+    def _get_operands(self) -> List[InternalFilter]:
+        """
+        Returns the filters that are combined with the same operation. (a | b) | c has a, b and c, so
+        that long chains are checked with one any()/all() instead of nested calls.
+        """
+        operands = []
+        filters = [self.second, self.first]
+
+        while filters:
+            filter_ = filters.pop()
+
+            if isinstance(filter_, CompositeFilter) and filter_.operation is self.operation:
+                filters.extend((filter_.second, filter_.first))
+            else:
+                operands.append(filter_)
+
+        return operands
+
+    def compile(self) -> Callable[[BaseModel], bool]:
+        if self._compiled is None:
+            combine = any_of if self.operation is or_ else all_of
+            self._compiled = combine(*(operand.compile() for operand in self._get_operands()))
+
+        return self._compiled
+
     def __call__(self, query: QueryT, **context) -> Union[str, QueryT]:
         if isinstance(query, str):
             first_result = self.first(query=query, **context)
             second_result = self.second(query=query, **context)
             return f'{query}{first_result.replace(query, "")}{second_result.replace(query, "")}'
 
-        first_result = self.first(query=query, **context)
-        second_result = self.second(query=query, **context)
+        # One pass in the order of the query, so generators are read only once
+        return filter(self.compile(), query)
+
+    def __invert__(self):
+        return InternalFilter(invert(self.compile()))
 
-        return list(self.operation(set(first_result), set(second_result)))
+    def fingerprint(self) -> Optional[Hashable]:
+        return get_fingerprint((type(self).__qualname__, self.operation.__name__, self.first, self.second))
 
     def __str__(self):
         return f"{self.first} {self.operation} {self.second}"
@@ -1,19 +1,40 @@
+from functools import lru_cache
 from typing import Any, Callable
 
 from assimilator.core.database import BaseModel, FilteringOptions
 from assimilator.internal.database.specifications.internal_operator import (
-    find_attribute, eq, gte, gt, lte, lt, is_, not_, like, regex,
+    find_attribute, eq, gte, gt, lte, lt, is_, not_, like, regex, in_,
 )
 
 
 AttrFinderType = Callable[[Callable, str, Any], Callable[[BaseModel], bool]]
 
 
+@lru_cache(maxsize=1024)
+def compile_filter(filter_option: Callable, field: str, value_type: type, value: Any) -> Callable[[BaseModel], bool]:
+    """
+    Compiles the filtering option once for every signature. The value type is a part of it,
+    so that is_(field, 1) and is_(field, True) stay different filters.
+    """
+    return filter_option(field, value)
+
+
 class InternalFilteringOptions(FilteringOptions):
     def __init__(self, attr_finder: AttrFinderType = find_attribute):
         super(InternalFilteringOptions, self).__init__()
         self.attr_finder = attr_finder
 
+    def parse_field(self, raw_field: str, value: Any) -> Callable[[BaseModel], bool]:
+        field, option = self.split_field(raw_field)
+        filter_option = self.get_default_filter() if option is None else self.filter_options[option]
+
+        try:
+            hash(value)
+        except TypeError:   # lists in in_(), for example
+            return filter_option(field, value)
+
+        return compile_filter(filter_option, field, type(value), value)
+
     _eq = staticmethod(eq)
     _gt = staticmethod(gt)
     _gte = staticmethod(gte)
@@ -23,10 +44,12 @@ class InternalFilteringOptions(FilteringOptions):
     _is = staticmethod(is_)
     _like = staticmethod(like)
     _regex = staticmethod(regex)
+    _in = staticmethod(in_)
 
 
 __all__ = [
     'InternalFilteringOptions',
+    'compile_filter',
     'find_attribute',
     "eq",
     "gte",
@@ -37,4 +60,5 @@ __all__ = [
     "not_",
     "like",
     "regex",
+    "in_",
 ]
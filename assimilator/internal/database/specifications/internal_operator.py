@@ -2,37 +2,78 @@ import operator
 import re
 from functools import wraps
 from numbers import Number
-from typing import Any, Callable, Union, Literal
+from typing import Any, Callable, Union, Literal, Collection, Sequence
 
 from assimilator.core.database.models import BaseModel
 from assimilator.core.database.specifications.filtering_options import FILTERING_OPTIONS_SEPARATOR
 from assimilator.internal.database.specifications.utils import InternalContainers, find_model_value
 
 
+def _can_use_attrgetter(fields: Sequence[str]) -> bool:
+    """
+    Dotted attrgetter() is used for foreign fields unless the field can be confused with
+    the attribute of a container(list.count, for example), as containers are looked through.
+    """
+    return not any(
+        hasattr(container, field)
+        for field in fields[1:]
+        for container in (*InternalContainers, dict)
+    )
+
+
+def compile_getter(field: str) -> Callable[[BaseModel], Any]:
+    """ Returns the function that finds the value of the field in the model """
+    foreign_fields = field.split(FILTERING_OPTIONS_SEPARATOR)
+
+    if len(foreign_fields) == 1:
+        return operator.attrgetter(field)
+
+    def find_foreign_value(model: BaseModel) -> Any:
+        return find_model_value(fields=foreign_fields, model=model)
+
+    if not _can_use_attrgetter(foreign_fields):
+        return find_foreign_value
+
+    get_value = operator.attrgetter(".".join(foreign_fields))
+
+    def get_foreign_value(model: BaseModel) -> Any:
+        try:
+            return get_value(model)
+        except AttributeError:  # one of the values is a container
+            return find_foreign_value(model)
+
+    return get_foreign_value
+
+
 def find_attribute(func: callable, field: str, value: Any) -> Callable[[BaseModel], bool]:
     """
     That decorator is used to get the value of the field from a BaseModel that is provided in the query.
     We do that because we need to get the value of the field in the internal specifications, not just the name
     of it. For example, User(id=1) will use field='id' to get 1 as the result.
 
+    The field is compiled once, so the returned function only gets the value and compares it.
+
     :param func: filtering option function that is going to be decorated.
     :param field: field name that is used in getattr(model, field)
     :param value: value of the field.
     :return: function to be called with a model to find an attribute and call the comparison function.
     """
+    get_value = compile_getter(field)
 
-    @wraps(func)
-    def find_attribute_wrapper(model: BaseModel) -> bool:
-        foreign_fields = field.split(FILTERING_OPTIONS_SEPARATOR)
+    if FILTERING_OPTIONS_SEPARATOR not in field:
+        @wraps(func)
+        def find_attribute_wrapper(model: BaseModel) -> bool:
+            return func(get_value(model), value)
 
-        if len(foreign_fields) == 1:
-            return func(getattr(model, foreign_fields[0]), value)
+    else:
+        @wraps(func)
+        def find_attribute_wrapper(model: BaseModel) -> bool:
+            model_val = get_value(model)
 
-        model_val = find_model_value(fields=foreign_fields, model=model)
-        if isinstance(model_val, InternalContainers):
-            return any(func(member, value) for member in model_val)
+            if isinstance(model_val, InternalContainers):
+                return any(func(member, value) for member in model_val)
 
-        return func(model_val, value)
+            return func(model_val, value)
 
     find_attribute_wrapper: func
     return find_attribute_wrapper
@@ -67,15 +108,29 @@ def is_(field: str, value: Union[Literal[True], Literal[False], Literal[None]]):
 
 
 def regex(field: str, value: str):
+    pattern = re.compile(value)
+
     return find_attribute(
-        func=lambda model_val, val: re.compile(value).match(model_val),
+        func=lambda model_val, val: pattern.match(model_val),
         field=field,
         value=value,
     )
 
 
+def like_to_regex(value: str) -> str:
+    return f'^{value.replace("%", ".*?")}$'
+
+
 def like(field: str, value: str):
-    return regex(field, f'^{value.replace("%", ".*?")}$')
+    return regex(field, like_to_regex(value))
+
+
+def in_(field: str, value: Collection):
+    return find_attribute(
+        func=lambda model_val, val: model_val in val,
+        field=field,
+        value=value,
+    )
 
 
 def invert(func: Callable):
@@ -88,6 +143,38 @@ def invert(func: Callable):
     return invert_wrapper
 
 
+def all_of(*funcs: Callable[[BaseModel], bool]) -> Callable[[BaseModel], bool]:
+    """ Combines the filter functions into one that short-circuits on the first failed check """
+    if not funcs:
+        return lambda model: True
+    elif len(funcs) == 1:
+        return funcs[0]
+    elif len(funcs) == 2:
+        first, second = funcs
+        return lambda model: first(model) and second(model)
+    elif len(funcs) == 3:
+        first, second, third = funcs
+        return lambda model: first(model) and second(model) and third(model)
+
+    return lambda model: all(func(model) for func in funcs)
+
+
+def any_of(*funcs: Callable[[BaseModel], bool]) -> Callable[[BaseModel], bool]:
+    """ Combines the filter functions into one that short-circuits on the first passed check """
+    if not funcs:
+        return lambda model: False
+    elif len(funcs) == 1:
+        return funcs[0]
+    elif len(funcs) == 2:
+        first, second = funcs
+        return lambda model: first(model) or second(model)
+    elif len(funcs) == 3:
+        first, second, third = funcs
+        return lambda model: first(model) or second(model) or third(model)
+
+    return lambda model: any(func(model) for func in funcs)
+
+
 __all__ = [
     'find_attribute',
     'eq',
@@ -99,5 +186,10 @@ __all__ = [
     'is_',
     'regex',
     'like',
+    'like_to_regex',
+    'in_',
     'invert',
+    'all_of',
+    'any_of',
+    'compile_getter',
 ]
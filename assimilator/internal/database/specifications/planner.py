@@ -0,0 +1,264 @@
+from typing import Any, Callable, Iterable, List, Optional, Dict, Iterator, Sized, Protocol
+
+from assimilator.core.database.models import BaseModel
+from assimilator.internal.database.indexes import IndexedSession, IndexedValues, InternalIndex, OrderedQuery
+from assimilator.internal.database.specifications.internal_operator import all_of
+
+
+class FilterPredicate:
+    """ One filter of the InternalFilter. Named filters know their field, option and value. """
+
+    def __init__(
+        self,
+        func: Callable[[BaseModel], bool],
+        field: Optional[str] = None,
+        option: Optional[str] = None,
+        value: Any = None,
+    ):
+        self.func = func
+        self.field = field
+        self.option = option
+        self.value = value
+
+    def __str__(self):
+        if self.field is None:
+            return getattr(self.func, '__name__', str(self.func))
+
+        return f"{self.option}({self.field}, {self.value!r})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class PlannedPredicate:
+    def __init__(self, predicate: FilterPredicate, cost: float, selectivity: float):
+        self.predicate = predicate
+        self.cost = cost
+        self.selectivity = selectivity
+
+    @property
+    def rank(self) -> float:
+        """ Predicates that remove more models for a lower price are checked first """
+        return -(1 - self.selectivity) / self.cost
+
+    def __str__(self):
+        return f"check {self.predicate} cost={self.cost} selectivity={self.selectivity:.3f}"
+
+
+class FilterLookupProtocol(Protocol):
+    """ Finds the candidates for the filter without checking every model. exact lookups check their predicates """
+    predicates: List[FilterPredicate]
+    count: int
+    exact: bool
+    ordering: Optional[str]
+
+    def find_models(self, session: Any) -> Iterable[BaseModel]:
+        ...
+
+
+class IndexLookup:
+    def __init__(self, index: InternalIndex, predicate: FilterPredicate, count: int):
+        self.index = index
+        self.predicate = predicate
+        self.count = count
+
+    @property
+    def predicates(self) -> List[FilterPredicate]:
+        return [self.predicate]
+
+    @property
+    def exact(self) -> bool:
+        return self.index.is_exact(self.predicate.option, self.predicate.value)
+
+    @property
+    def ordering(self) -> Optional[str]:
+        """ Field that the found models are ordered by, if there is one """
+        return self.index.field if self.index.is_ordered() else None
+
+    def find(self) -> Iterable:
+        return self.index.find(option=self.predicate.option, value=self.predicate.value)
+
+    def find_models(self, session: IndexedSession) -> Iterable[BaseModel]:
+        found_models = map(session.get, self.find())    # keys can be deleted by other threads
+        return [model for model in found_models if model is not None]
+
+    def __str__(self):
+        return (
+            f"index {self.index} {self.predicate.option} {self.predicate.value!r} "
+            f"-> {self.count} candidates{' (exact)' if self.exact else ''}"
+        )
+
+
+class FilterPlan:
+    """ The way InternalFilter is going to find the models. Use str() to see the plan. """
+
+    def __init__(
+        self,
+        predicates: List[PlannedPredicate],
+        lookup: Optional[FilterLookupProtocol] = None,
+        total: Optional[int] = None,
+    ):
+        self.predicates = predicates
+        self.lookup = lookup
+        self.total = total
+
+    def _check(self, models: Iterable[BaseModel]) -> Iterator[BaseModel]:
+        if not self.predicates:
+            return iter(models)
+
+        return filter(all_of(*(planned.predicate.func for planned in self.predicates)), models)
+
+    def execute(self, query: Iterable[BaseModel]) -> Iterable[BaseModel]:
+        if self.lookup is None:
+            return self._check(query)
+        elif self.lookup.count == 0:
+            return iter(())
+
+        models = self._check(self.lookup.find_models(query.session))
+
+        ordering = self.lookup.ordering
+        if ordering is not None:
+            return OrderedQuery(query=models, ordering=ordering)
+
+        return models
+
+    def __str__(self):
+        steps = [f"FilterPlan(models={'unknown' if self.total is None else self.total})"]
+
+        if self.lookup is None:
+            steps.append("scan all models")
+        else:
+            steps.append(str(self.lookup))
+
+        steps.extend(str(planned) for planned in self.predicates)
+        return "\n".join(
+            step if position == 0 else f"  {position}. {step}"
+            for position, step in enumerate(steps)
+        )
+
+    def __repr__(self):
+        return str(self)
+
+
+class QueryPlanner:
+    """
+    Orders the predicates of the InternalFilter by their cost and selectivity,
+    and chooses the index that returns the least candidates.
+    """
+
+    option_costs: Dict[str, float] = {
+        'eq': 1,
+        'is': 1,
+        'not': 1,
+        'gt': 1,
+        'gte': 1,
+        'lt': 1,
+        'lte': 1,
+        'in': 2,
+        'like': 10,
+        'regex': 10,
+    }
+    option_selectivity: Dict[str, float] = {
+        'eq': 0.1,
+        'is': 0.5,
+        'not': 0.9,
+        'gt': 0.5,
+        'gte': 0.5,
+        'lt': 0.5,
+        'lte': 0.5,
+        'in': 0.2,
+        'like': 0.25,
+        'regex': 0.25,
+    }
+    default_cost: float = 5     # direct filters that we know nothing about
+    default_selectivity: float = 0.5
+
+    def _estimate_selectivity(
+        self,
+        predicate: FilterPredicate,
+        session: Optional[IndexedSession],
+        total: Optional[int],
+    ) -> float:
+        if predicate.field is None:
+            return self.default_selectivity
+
+        selectivity = self.option_selectivity.get(predicate.option, self.default_selectivity)
+        if session is None or not total:
+            return selectivity
+
+        for index in session.indexes:
+            if index.field != predicate.field:
+                continue
+
+            try:
+                if index.supports(predicate.option):
+                    return min(index.count(option=predicate.option, value=predicate.value) / total, 1)
+                elif predicate.option == 'not' and index.supports('eq'):
+                    return 1 - min(index.count(option='eq', value=predicate.value) / total, 1)
+                elif index.distinct_count():
+                    selectivity = min(selectivity, 1 / index.distinct_count())
+            except TypeError:   # the value cannot be compared, the filter is going to fail later
+                continue
+
+        return selectivity
+
+    def _find_lookup(
+        self,
+        predicates: Iterable[FilterPredicate],
+        session: IndexedSession,
+    ) -> Optional[IndexLookup]:
+        best_lookup = None
+
+        for predicate in predicates:
+            if predicate.field is None:
+                continue
+
+            index = session.get_index(field=predicate.field, option=predicate.option)
+            if index is None:
+                continue
+
+            try:
+                count = index.count(option=predicate.option, value=predicate.value)
+            except TypeError:   # SortedIndex cannot compare the value(None with floats), so the models are checked
+                continue
+
+            lookup = IndexLookup(index=index, predicate=predicate, count=count)
+            if best_lookup is None or lookup.count < best_lookup.count:
+                best_lookup = lookup
+
+        return best_lookup
+
+    def plan(self, predicates: List[FilterPredicate], query: Any = None) -> FilterPlan:
+        session = query.session if isinstance(query, IndexedValues) else None
+        total = len(query) if isinstance(query, Sized) else None
+        lookup = None
+
+        if hasattr(session, 'find_lookup'):     # ColumnarSession checks the filters with its columns
+            lookup = session.find_lookup(predicates)
+
+        if lookup is None and session is not None and session.indexes:
+            lookup = self._find_lookup(predicates=predicates, session=session)
+
+            if lookup is not None and lookup.count >= total and not lookup.exact:
+                lookup = None   # the index does not remove anything, scanning is cheaper
+
+        planned_predicates = [
+            PlannedPredicate(
+                predicate=predicate,
+                cost=self.option_costs.get(predicate.option, self.default_cost),
+                selectivity=self._estimate_selectivity(predicate=predicate, session=session, total=total),
+            )
+            for predicate in predicates
+            if lookup is None or not lookup.exact or all(predicate is not found for found in lookup.predicates)
+        ]
+        planned_predicates.sort(key=lambda planned: planned.rank)
+
+        return FilterPlan(predicates=planned_predicates, lookup=lookup, total=total)
+
+
+__all__ = [
+    'FilterPredicate',
+    'FilterLookupProtocol',
+    'FilterPlan',
+    'QueryPlanner',
+]
@@ -1,6 +1,12 @@
-from typing import List, Iterable, Union, Optional, Collection
+from heapq import nsmallest, nlargest
+from functools import cmp_to_key
+from operator import attrgetter, itemgetter
+from itertools import islice
+from typing import List, Iterable, Iterator, Union, Optional, Collection, Tuple, Any, Callable
 
-from assimilator.core.database import specification, SpecificationList, BaseModel
+from assimilator.core.database import specification, SpecificationList, BaseModel, SeekSpecification
+from assimilator.core.database.specifications.filtering_options import FILTERING_OPTIONS_SEPARATOR
+from assimilator.internal.database.indexes import IndexedValues, OrderedQuery
 from assimilator.internal.database.specifications.filter_specifications import InternalFilter
 from assimilator.internal.database.specifications.utils import find_model_value
 
@@ -8,30 +14,160 @@ QueryT = Union[str, List[BaseModel]]
 internal_filter = InternalFilter
 
 
-def _internal_ordering(sorting_field: str):
-    fields = sorting_field.strip("-").split(".")
+class _NoneLast:
+    """ Replaces None in the ordering keys. It is greater than any other value, so None values are sorted last """
+    __slots__ = ()
 
-    def _internal_ordering_wrapper(item: BaseModel):
-        current = find_model_value(fields=fields, model=item)
+    def __lt__(self, other: Any) -> bool:
+        return False
 
-        return current
+    def __gt__(self, other: Any) -> bool:
+        return other is not self
 
-    return _internal_ordering_wrapper
+    def __le__(self, other: Any) -> bool:
+        return other is self
+
+    def __ge__(self, other: Any) -> bool:
+        return True
+
+
+_NONE_LAST = _NoneLast()
+
+
+class _Descending:
+    """ Reverses the comparison of the value, so that descending fields can be compared with ascending ones """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: '_Descending') -> bool:
+        return self.value == other.value
+
+
+class _InternalOrdering:
+    """
+    Orders the models by all the clauses at once. The key of every model is found once, and the models
+    are sorted by these keys. None values come after all other values, so they are last in ascending
+    and first in descending order.
+    """
+
+    def __init__(self, *clauses: str):
+        fields = [clause.lstrip("-").split(".") for clause in clauses]
+        self.descending = [clause.startswith("-") for clause in clauses]
+        self.reverse = bool(self.descending) and all(self.descending)
+        self.is_mixed = len(set(self.descending)) > 1
+
+        if all(len(field) == 1 for field in fields):
+            getter = attrgetter(*(field[0] for field in fields)) if fields else lambda item: ()
+        else:
+            getters = [
+                attrgetter(field[0]) if len(field) == 1
+                else (lambda item, field=field: find_model_value(fields=field, model=item))
+                for field in fields
+            ]
+            getter = lambda item: tuple(field_getter(item) for field_getter in getters)  # noqa: E731
+
+        if len(fields) == 1:
+            def _ordering_key(item: BaseModel) -> Any:
+                value = getter(item)
+                return _NONE_LAST if value is None else value
+
+            self.key = _ordering_key
+        else:
+            def _ordering_key(item: BaseModel) -> Tuple[Any, ...]:
+                values = getter(item)
+                if None not in values:
+                    return values
+
+                return tuple(_NONE_LAST if value is None else value for value in values)
+
+            self.key = _ordering_key
+
+    def _get_heap_key(self) -> Callable[[BaseModel], Any]:
+        if not self.is_mixed:
+            return self.key
+
+        return lambda item: tuple(
+            _Descending(value) if descending else value
+            for value, descending in zip(self.key(item), self.descending)
+        )
+
+    def top(self, models: Iterable[BaseModel], count: int) -> List[BaseModel]:
+        """ Returns the first count models in O(N log count) with a heap """
+        return (nlargest if self.reverse else nsmallest)(count, models, key=self._get_heap_key())
+
+    def sort(self, models: Iterable[BaseModel]) -> List[BaseModel]:
+        if not self.is_mixed:
+            return sorted(models, key=self.key, reverse=self.reverse)
+
+        rows = [(*self.key(model), model) for model in models]
+
+        # Stable sorts by the groups of clauses with the same direction, from the last group to the first.
+        # Keys are already found, so every sort only compares the values in C.
+        group_end = len(self.descending)
+        for position in range(len(self.descending) - 1, -1, -1):
+            if position == 0 or self.descending[position - 1] != self.descending[position]:
+                rows.sort(key=itemgetter(*range(position, group_end)), reverse=self.descending[position])
+                group_end = position
+
+        return [row[-1] for row in rows]
+
+
+def _order_with_index(clause: str, query: QueryT) -> Optional[Iterable[BaseModel]]:
+    """ Orders the query with a SortedIndex if the query comes from an indexed session """
+    field = clause.strip("-").replace(".", FILTERING_OPTIONS_SEPARATOR)
+    reverse = clause.startswith("-")
+
+    if isinstance(query, OrderedQuery) and query.ordering == field:
+        models = list(query)
+        if reverse:
+            models.reverse()
+
+        return models
+
+    elif isinstance(query, IndexedValues):
+        index = query.session.get_ordered_index(field)
+        if index is None or not index.is_ordered():
+            return None
+
+        models = map(query.session.get, index.iter_keys(reverse=reverse))
+        return (model for model in models if model is not None)    # paginate() stops reading the index early
+
+    return None
+
+
+class OrderingQuery:
+    """
+    Query that is sorted when it is iterated. internal_paginate() only needs the first results,
+    so it takes them with a heap in O(N log K) instead of sorting the whole query.
+    """
+
+    def __init__(self, query: Iterable[BaseModel], ordering: _InternalOrdering):
+        self.query = query
+        self.ordering = ordering
+
+    def top(self, count: int) -> List[BaseModel]:
+        """ Returns the first count models of the sorted query """
+        return self.ordering.top(self.query, count=count)
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        return iter(self.ordering.sort(self.query))
 
 
 @specification
 def internal_order(*clauses: str, query: QueryT, **_) -> Iterable[BaseModel]:
     if isinstance(query, str):
         return query
+    elif len(clauses) == 1:
+        ordered_models = _order_with_index(clause=clauses[0], query=query)
+        if ordered_models is not None:
+            return ordered_models
 
-    query = list(query)
-    for field in clauses:
-        query.sort(
-            key=_internal_ordering(sorting_field=field),
-            reverse=field.startswith("-"),
-        )
-
-    return query
+    return OrderingQuery(query=query, ordering=_InternalOrdering(*clauses))
 
 
 @specification
@@ -45,7 +181,66 @@ def internal_paginate(
     if isinstance(query, str):
         return query
 
-    return list(query)[offset:limit]
+    offset = offset or 0
+    if isinstance(query, OrderingQuery) and limit is not None:
+        return query.top(offset + limit)[offset:]
+
+    return islice(query, offset, None if limit is None else offset + limit)
+
+
+class InternalSeek(SeekSpecification):
+    """
+    Keyset pagination for Python objects. If the session has a SortedIndex for the only
+    ordering field, the position of the last key is found with a bisect.
+    """
+
+    def _compare_keys(self, first_key: Tuple[Any, ...], second_key: Tuple[Any, ...]) -> int:
+        for first_value, second_value, descending in zip(first_key, second_key, self.descending):
+            if first_value == second_value:
+                continue
+
+            result = -1 if first_value < second_value else 1
+            return -result if descending else result
+
+        return 0
+
+    def _seek_with_index(self, query: QueryT) -> Optional[List[BaseModel]]:
+        if len(self.clauses) != 1 or not isinstance(query, IndexedValues):
+            return None
+
+        index = query.session.get_ordered_index(self.fields[0].replace(".", FILTERING_OPTIONS_SEPARATOR))
+        if index is None or not index.is_ordered():   # changed models of a transaction are not in the index
+            return None
+        elif self.after is None:
+            keys = index.iter_keys(reverse=self.descending[0])
+        else:
+            keys = index.iter_keys_after(self.after[0], reverse=self.descending[0])
+
+        models = (query.session.get(key) for key in keys)
+        return list(islice((model for model in models if model is not None), self.limit))
+
+    def __call__(self, query: QueryT, **context: Any) -> Iterable[BaseModel]:
+        if isinstance(query, str):
+            return query
+
+        models = self._seek_with_index(query)
+        if models is not None:
+            return models
+
+        models = query
+        if self.after is not None:
+            models = (model for model in models if self._compare_keys(self.get_key(model), self.after) > 0)
+
+        comparable_key = cmp_to_key(self._compare_keys)
+        sorting_key = lambda model: comparable_key(self.get_key(model))  # noqa: E731
+
+        if self.limit is None:
+            return sorted(models, key=sorting_key)
+
+        return nsmallest(self.limit, models, key=sorting_key)
+
+
+internal_seek = InternalSeek
 
 
 @specification
@@ -66,6 +261,7 @@ class InternalSpecificationList(SpecificationList):
     filter = internal_filter
     order = internal_order
     paginate = internal_paginate
+    seek = internal_seek
     join = internal_join
     only = internal_only
 
@@ -75,6 +271,9 @@ __all__ = [
     'InternalFilter',
     'internal_order',
     'internal_paginate',
+    'OrderingQuery',
+    'InternalSeek',
+    'internal_seek',
     'internal_join',
     'internal_only',
     'InternalSpecificationList',
@@ -1,12 +1,14 @@
-from copy import deepcopy
-from typing import Optional
+from typing import Optional, ClassVar
 
 from assimilator.core.database import UnitOfWork, Repository
 from assimilator.internal.database.error_wrapper import InternalErrorWrapper
-from assimilator.core.patterns import ErrorWrapper
+from assimilator.internal.database.journal import JournaledSession
+from assimilator.core.patterns import ErrorWrapper, ContextValues
 
 
 class InternalUnitOfWork(UnitOfWork):
+    _saved_sessions: ClassVar[ContextValues[dict]] = ContextValues("internal_unit_of_work_saved_sessions")
+
     def __init__(
         self,
         repository: Repository,
@@ -18,24 +20,32 @@ class InternalUnitOfWork(UnitOfWork):
             error_wrapper=error_wrapper or InternalErrorWrapper(),
             autocommit=autocommit,
         )
-        self._saved_data: Optional[dict] = None
+
+    @property
+    def _saved_data(self) -> Optional[dict]:
+        return self._saved_sessions.get(self)    # every thread and asyncio task has its own transaction
+
+    @_saved_data.setter
+    def _saved_data(self, saved_data: Optional[dict]) -> None:
+        self._saved_sessions.set(self, saved_data)
 
     def begin(self):
-        self._saved_data = self.repository.session
-        self.repository.session = deepcopy(self._saved_data)
+        self._saved_data = self.repository.transaction
+        self.repository.transaction = JournaledSession(base=self._saved_data)
 
     def rollback(self):
-        self.repository.session = self._saved_data
+        self.repository.transaction = self._saved_data
 
     def commit(self):
-        self._saved_data.update(self.repository.session)
-
-        for deleted_key in set(self._saved_data.keys()) - set(self.repository.session.keys()):
-            del self._saved_data[deleted_key]
-
-        self.repository.session = self._saved_data
+        try:
+            self.repository.transaction.apply()
+        finally:
+            self.repository.transaction = self._saved_data
 
     def close(self):
+        if self._saved_data is not None:   # changes that were not committed are dropped
+            self.repository.transaction = self._saved_data
+
         self._saved_data = None
 
 
@@ -3,3 +3,5 @@ from assimilator.mongo.database.repository import *
 from assimilator.mongo.database.unit_of_work import *
 from assimilator.mongo.database.specifications.filtering_options import *
 from assimilator.mongo.database.specifications.specifications import *
+from assimilator.mongo.database.async_repository import *
+from assimilator.mongo.database.async_unit_of_work import *
@@ -0,0 +1,216 @@
+from typing import Union, Optional, Collection, Type, TypeVar, Iterable, List, AsyncIterator
+
+from pymongo import UpdateOne
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession
+
+from assimilator.mongo.database.models import MongoModel
+from assimilator.core.patterns import AsyncLazyCommand, ErrorWrapper
+from assimilator.mongo.database.error_wrapper import MongoErrorWrapper
+from assimilator.mongo.database.repository import MongoRepository
+from assimilator.core.database import AsyncRepository, SpecificationType, \
+    SpecificationList, NotFoundError, MultipleResultsError
+from assimilator.mongo.database.specifications.specifications import MongoSpecificationList
+from assimilator.internal.database.models_utils import dict_to_internal_models
+
+ModelT = TypeVar("ModelT", bound=MongoModel)
+
+
+class AsyncMongoRepository(AsyncRepository):
+    """
+    Repository that works with Motor. iter_filter() streams the documents from the cursor
+    in batches of batch_size, and all the queries use the session of AsyncMongoUnitOfWork.
+    """
+    session: AsyncIOMotorClient
+    transaction: Optional[AsyncIOMotorClientSession]
+    model: Type[MongoModel]
+
+    def __init__(
+        self,
+        session: AsyncIOMotorClient,
+        model: Type[MongoModel],
+        database: str,
+        specifications: Type[SpecificationList] = MongoSpecificationList,
+        initial_query: Optional[dict] = None,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        batch_size: int = 1000,
+    ):
+        super(AsyncMongoRepository, self).__init__(
+            session=session,
+            model=model,
+            initial_query=initial_query or {},
+            specifications=specifications,
+            error_wrapper=error_wrapper or MongoErrorWrapper(),
+        )
+        self.database = database
+        self.batch_size = batch_size
+        self.transaction = None
+
+    def get_initial_query(self, override_query: Optional[dict] = None) -> dict:
+        return dict(super(AsyncMongoRepository, self).get_initial_query(override_query))
+
+    _model_id_name = MongoRepository._model_id_name
+    _collection_name = MongoRepository._collection_name
+    _collection = MongoRepository._collection
+
+    def dict_to_models(self, data: dict) -> ModelT:
+        return self.model(**dict_to_internal_models(data, model=self.model))
+
+    async def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: dict = None,
+    ) -> Union[ModelT, AsyncLazyCommand[ModelT]]:
+        query = self._apply_specifications(query=initial_query, specifications=specifications)
+        data = await self._collection.find(session=self.transaction, **query).to_list(length=2)
+
+        if not data:
+            raise NotFoundError(f"{self} repository get() did not find "
+                                f"any entities with {query} filter")
+        elif len(data) != 1:
+            raise MultipleResultsError(f"{self} repository get() returned"
+                                       f" multiple results with {query} query")
+
+        return self.model(**data[0])
+
+    async def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: dict = None,
+        stream: bool = False,
+    ) -> Union[Collection[ModelT], AsyncLazyCommand[Collection[ModelT]], AsyncIterator[ModelT]]:
+        if stream:
+            return self.iter_filter(*specifications, initial_query=initial_query)
+
+        query = self._apply_specifications(query=initial_query, specifications=specifications)
+        cursor = self._collection.find(session=self.transaction, **query).batch_size(self.batch_size)
+        return [self.model(**data) async for data in cursor]
+
+    def iter_filter(
+        self,
+        *specifications: SpecificationType,
+        initial_query: dict = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[ModelT]:
+        """
+        Same as filter(), but yields the models while the cursor is read. MongoDB sends
+        batch_size documents at a time, so the whole result is never kept in memory.
+        """
+        return self._wrap_errors(self._stream_models(
+            specifications=specifications,
+            initial_query=initial_query,
+            batch_size=batch_size,
+        ))
+
+    async def _stream_models(
+        self,
+        specifications: Iterable[SpecificationType],
+        initial_query: Optional[dict] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[ModelT]:
+        query = self._apply_specifications(query=initial_query, specifications=specifications)
+        cursor = self._collection.find(session=self.transaction, **query).batch_size(batch_size or self.batch_size)
+
+        async for data in cursor:
+            yield self.model(**data)
+
+    async def save(self, obj: Optional[ModelT] = None, **obj_data) -> ModelT:
+        if obj is None:
+            obj = self.dict_to_models(data=obj_data)
+
+        await self._collection.insert_one(obj.dict(), session=self.transaction)
+        return obj
+
+    async def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        objs = list(objs)
+        if objs:
+            await self._collection.insert_many([obj.dict() for obj in objs], session=self.transaction)
+
+        return objs
+
+    async def update_many(self, objs: Iterable[ModelT]) -> None:
+        operations = [
+            UpdateOne(
+                {self._model_id_name: obj.id},
+                update={'$set': obj.dict()},
+                upsert=getattr(obj, 'upsert', False),
+            )
+            for obj in objs
+        ]
+
+        if operations:
+            await self._collection.bulk_write(operations, session=self.transaction)
+
+    async def delete_many(self, objs: Iterable[ModelT]) -> None:
+        object_ids = [obj.id for obj in objs]
+        if object_ids:
+            await self._collection.delete_many(
+                {self._model_id_name: {"$in": object_ids}},
+                session=self.transaction,
+            )
+
+    async def _find_ids(self, specifications: Iterable[SpecificationType]) -> list:
+        id_name = self._model_id_name
+        cursor = self._collection.find(session=self.transaction, **self._apply_specifications(
+            query=self.get_initial_query(),
+            specifications=(*specifications, self.specs.only(id_name)),
+        ))
+        return [result[id_name] async for result in cursor]
+
+    async def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
+        obj, specifications = self._check_obj_is_specification(obj, specifications)
+
+        if specifications:
+            await self._collection.delete_many(
+                {self._model_id_name: {"$in": await self._find_ids(specifications)}},
+                session=self.transaction,
+            )
+        elif obj is not None:
+            await self._collection.delete_one(obj.dict(), session=self.transaction)
+
+    async def update(
+        self,
+        obj: Optional[ModelT] = None,
+        *specifications: SpecificationType,
+        **update_values,
+    ) -> None:
+        obj, specifications = self._check_obj_is_specification(obj, specifications)
+
+        if specifications:
+            await self._collection.update_many(
+                filter={self._model_id_name: {"$in": await self._find_ids(specifications)}},
+                update={'$set': update_values},
+                session=self.transaction,
+            )
+        elif obj is not None:
+            await self._collection.update_one(
+                {self._model_id_name: obj.id},
+                update={'$set': obj.dict()},
+                upsert=getattr(obj, 'upsert', False),
+                session=self.transaction,
+            )
+
+    async def is_modified(self, obj: ModelT) -> bool:
+        return await self.get(self.specs.filter(id=obj.id)) == obj
+
+    async def refresh(self, obj: ModelT) -> None:
+        fresh_obj = await self.get(self.specs.filter(id=obj.id))
+        obj.__dict__.update(fresh_obj.__dict__)
+
+    async def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[dict] = None,
+    ) -> Union[AsyncLazyCommand[int], int]:
+        return await self._collection.count_documents(
+            filter=self._apply_specifications(
+                query=initial_query,
+                specifications=specifications,
+            ).get('filter', {}),
+            session=self.transaction,
+        )
+
+
+__all__ = ['AsyncMongoRepository']
@@ -0,0 +1,44 @@
+from typing import Optional
+
+from assimilator.core.database import AsyncUnitOfWork
+from assimilator.core.patterns import ErrorWrapper
+from assimilator.mongo.database.async_repository import AsyncMongoRepository
+from assimilator.mongo.database.error_wrapper import MongoErrorWrapper
+
+
+class AsyncMongoUnitOfWork(AsyncUnitOfWork):
+    """ Starts a client session with a transaction. The repository uses that session for all the queries """
+    repository: AsyncMongoRepository
+
+    def __init__(
+        self,
+        repository: AsyncMongoRepository,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        autocommit: bool = False,
+    ):
+        super(AsyncMongoUnitOfWork, self).__init__(
+            repository=repository,
+            error_wrapper=error_wrapper or MongoErrorWrapper(),
+            autocommit=autocommit,
+        )
+
+    async def begin(self):
+        self.repository.transaction = await self.repository.session.start_session()
+        self.repository.transaction.start_transaction()
+
+    async def rollback(self):
+        await self.repository.transaction.abort_transaction()
+
+    async def commit(self):
+        await self.repository.transaction.commit_transaction()
+
+    async def close(self):
+        if self.repository.transaction is not None:
+            await self.repository.transaction.end_session()   # transactions that were not committed are aborted
+
+        self.repository.transaction = None
+
+
+__all__ = [
+    'AsyncMongoUnitOfWork',
+]
@@ -1,6 +1,6 @@
-from typing import Union, Optional, Collection, Type, TypeVar, Any
+from typing import Union, Optional, Collection, Type, TypeVar, Any, Iterable, List
 
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 
 from assimilator.mongo.database.models import MongoModel
 from assimilator.core.patterns import LazyCommand, ErrorWrapper
@@ -93,6 +93,31 @@ class MongoRepository(Repository):
         self._collection.insert_one(obj.dict())
         return obj
 
+    def save_many(self, objs: Iterable[ModelT]) -> List[ModelT]:
+        objs = list(objs)
+        if objs:
+            self._collection.insert_many([obj.dict() for obj in objs])
+
+        return objs
+
+    def update_many(self, objs: Iterable[ModelT]) -> None:
+        operations = [
+            UpdateOne(
+                {self._model_id_name: obj.id},
+                update={'$set': obj.dict()},
+                upsert=getattr(obj, 'upsert', False),
+            )
+            for obj in objs
+        ]
+
+        if operations:
+            self._collection.bulk_write(operations)
+
+    def delete_many(self, objs: Iterable[ModelT]) -> None:
+        object_ids = [obj.id for obj in objs]
+        if object_ids:
+            self._collection.delete_many({self._model_id_name: {"$in": object_ids}})
+
     def delete(self, obj: Optional[ModelT] = None, *specifications: SpecificationType) -> None:
         obj, specifications = self._check_obj_is_specification(obj, specifications)
 
@@ -51,6 +51,13 @@ class MongoFilteringOptions(FilteringOptions):
         field, value = self._convert_option(field=field, value=value)
         return {field: {"$regex": value}}
 
+    def _in(self, field: str, value):
+        field = rename_mongo_id(field.replace(FILTERING_OPTIONS_SEPARATOR, "."))
+        if contains_mongo_id(field):
+            value = [ObjectId(member) for member in value]
+
+        return {field: {"$in": list(value)}}
+
 
 __all__ = [
     'MongoFilteringOptions',
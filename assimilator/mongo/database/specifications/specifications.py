@@ -1,8 +1,11 @@
 from typing import Any, Optional, Collection
 
+from bson import ObjectId
+
 from assimilator.mongo.database.specifications.utils import rename_mongo_id
 from assimilator.mongo.database.specifications.filtering_options import MongoFilteringOptions
-from assimilator.core.database import SpecificationList, FilterSpecification, specification, AdaptiveFilter
+from assimilator.core.database import SpecificationList, FilterSpecification, specification, AdaptiveFilter, \
+    SeekSpecification
 
 
 class MongoFilter(FilterSpecification):
@@ -73,6 +76,50 @@ def mongo_paginate(
     return query
 
 
+class MongoSeek(SeekSpecification):
+    """ Keyset pagination with {"$or": [{k1: {"$gt": v1}}, {k1: v1, k2: {"$gt": v2}}]}, sort and limit """
+
+    def encode_value(self, value: Any) -> Any:
+        if isinstance(value, ObjectId):
+            return {"$oid": str(value)}
+
+        return super(MongoSeek, self).encode_value(value)
+
+    def decode_value(self, value: Any) -> Any:
+        if isinstance(value, dict) and set(value) == {"$oid"}:
+            return ObjectId(value["$oid"])
+
+        return super(MongoSeek, self).decode_value(value)
+
+    def _get_after_filter(self, fields: list) -> dict:
+        after_filters = []
+
+        for position, (field, value, descending) in enumerate(zip(fields, self.after, self.descending)):
+            after_filter = dict(zip(fields[:position], self.after[:position]))
+            after_filter[field] = {"$lt" if descending else "$gt": value}
+            after_filters.append(after_filter)
+
+        return after_filters[0] if len(after_filters) == 1 else {"$or": after_filters}
+
+    def __call__(self, query: dict, **context: Any) -> dict:
+        fields = ["_id" if field == "id" else field for field in self.fields]
+
+        if self.after is not None:
+            after_filter = self._get_after_filter(fields)
+            query['filter'] = {"$and": [query['filter'], after_filter]} if query.get('filter') else after_filter
+
+        query['sort'] = query.get('sort', []) + [
+            (field, -1 if descending else 1) for field, descending in zip(fields, self.descending)
+        ]
+        if self.limit is not None:
+            query['limit'] = self.limit
+
+        return query
+
+
+mongo_seek = MongoSeek
+
+
 @specification
 def mongo_join(*targets: Collection, query: dict, **join_args: dict) -> dict:
     return query
@@ -88,6 +135,7 @@ class MongoSpecificationList(SpecificationList):
     filter = MongoFilter
     order = mongo_order
     paginate = mongo_paginate
+    seek = mongo_seek
     join = mongo_join
     only = mongo_only
 
@@ -98,6 +146,8 @@ __all__ = [
     'mongo_filter',
     'mongo_order',
     'mongo_paginate',
+    'MongoSeek',
+    'mongo_seek',
     'mongo_join',
     'mongo_only',
 ]
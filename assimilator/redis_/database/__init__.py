@@ -1,3 +1,8 @@
 from assimilator.redis_.database.models import *
+from assimilator.redis_.database.indexes import *
+from assimilator.redis_.database.scripts import *
 from assimilator.redis_.database.repository import *
 from assimilator.redis_.database.unit_of_work import *
+from assimilator.redis_.database.async_repository import *
+from assimilator.redis_.database.async_unit_of_work import *
+from assimilator.redis_.database.cache import *
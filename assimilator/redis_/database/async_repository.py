@@ -0,0 +1,355 @@
+import json
+from typing import Type, Union, Optional, TypeVar, List, Iterable, AsyncIterator, Callable, Any
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from assimilator.core.patterns.error_wrapper import ErrorWrapper
+from assimilator.core.database import (
+    SpecificationList,
+    SpecificationType,
+    AsyncRepository,
+    AsyncLazyCommand,
+    BaseModel,
+)
+from assimilator.core.database.exceptions import (
+    DataLayerError,
+    NotFoundError,
+    InvalidQueryError,
+    MultipleResultsError,
+)
+from assimilator.internal.database import InternalSpecificationList, InternalFilter
+from assimilator.internal.database.models_utils import dict_to_internal_models
+from assimilator.redis_.database.repository import RedisRepository
+
+RedisModelT = TypeVar("RedisModelT", bound=BaseModel)
+
+
+class AsyncRedisRepository(AsyncRepository):
+    """
+    Repository that works with redis.asyncio. Keys are found with SCAN and read with MGET in chunks,
+    like in RedisRepository. Indexes and server filters are not supported yet.
+    """
+    session: Redis
+    transaction: Union[Pipeline, Redis]
+    model: Type[RedisModelT]
+
+    def __init__(
+        self,
+        session: Redis,
+        model: Type[RedisModelT],
+        initial_query: Optional[str] = '',
+        specifications: Type[SpecificationList] = InternalSpecificationList,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        use_double_filter: bool = True,
+        scan_count: Optional[int] = 1000,
+        chunk_size: int = 1000,
+        batch_size: int = 1000,
+    ):
+        super(AsyncRedisRepository, self).__init__(
+            session=session,
+            model=model,
+            initial_query=initial_query,
+            specifications=specifications,
+            error_wrapper=error_wrapper or ErrorWrapper(
+                default_error=DataLayerError,
+                skipped_errors=(NotFoundError,)
+            )
+        )
+        self.transaction = session
+        self.use_double_specifications = use_double_filter
+        self.scan_count = scan_count
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    async def _iter_keys(self, key_pattern: str) -> AsyncIterator[str]:
+        if key_pattern and not RedisRepository._is_pattern(key_pattern):
+            yield key_pattern
+            return
+
+        seen_keys = set()   # SCAN can return the same key multiple times
+
+        async for key in self.session.scan_iter(match=key_pattern, count=self.scan_count):
+            if key not in seen_keys:
+                seen_keys.add(key)
+                yield key
+
+    async def _iter_values(self, keys: AsyncIterator[str]) -> AsyncIterator[Optional[bytes]]:
+        """ Reads the values with MGET in chunks, so that one command never reads the whole keyspace """
+        keys_chunk = []
+
+        async for key in keys:
+            keys_chunk.append(key)
+
+            if len(keys_chunk) >= self.chunk_size:
+                for value in await self.session.mget(keys_chunk):
+                    yield value
+
+                keys_chunk = []
+
+        if keys_chunk:
+            for value in await self.session.mget(keys_chunk):
+                yield value
+
+    def _get_key_pattern(
+        self,
+        specifications: Iterable[SpecificationType],
+        initial_query: Optional[str] = None,
+    ) -> str:
+        if self.use_double_specifications and specifications:
+            return self._apply_specifications(
+                query=initial_query,
+                specifications=specifications,
+            ) or "*"
+
+        return "*"
+
+    def _load_model(self, value: bytes) -> RedisModelT:
+        if isinstance(self.model, BaseModel):
+            return self.model.loads(value)
+
+        return self.model(**json.loads(value))
+
+    async def _iter_models(self, key_pattern: str) -> AsyncIterator[RedisModelT]:
+        async for value in self._iter_values(self._iter_keys(key_pattern)):
+            if value is not None:   # the key was deleted after we found it
+                yield self._load_model(value)
+
+    async def _read_models(self, key_pattern: str) -> List[RedisModelT]:
+        return [model async for model in self._iter_models(key_pattern)]
+
+    async def get(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+    ) -> Union[AsyncLazyCommand[RedisModelT], RedisModelT]:
+        query = self._apply_specifications(query=initial_query, specifications=specifications) or '*'
+        parsed_objects = list(self._apply_specifications(
+            query=await self._read_models(query),
+            specifications=specifications,
+        ))
+
+        if not parsed_objects:
+            raise NotFoundError(f"{self} repository get() did not find "
+                                f"any results with this query: {query}")
+        elif len(parsed_objects) != 1:
+            raise MultipleResultsError(f"{self} repository get() did not"
+                                       f" find any results with this query: {query}")
+
+        return parsed_objects[0]
+
+    async def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+    ) -> Union[AsyncLazyCommand[List[RedisModelT]], List[RedisModelT]]:
+        query = await self._read_models(
+            self._get_key_pattern(specifications=specifications, initial_query=initial_query),
+        )
+        return list(self._apply_specifications(specifications=specifications, query=query))
+
+    def iter_filter(
+        self,
+        *specifications: SpecificationType,
+        initial_query: Optional[str] = None,
+    ) -> AsyncIterator[RedisModelT]:
+        """
+        Same as filter(), but yields the models while the keys are read. Only one chunk of values is
+        kept in memory, unless your specifications are not filters(ordering, for example).
+        """
+        return self._wrap_errors(self._stream_models(specifications=specifications, initial_query=initial_query))
+
+    async def _stream_models(
+        self,
+        specifications: Iterable[SpecificationType],
+        initial_query: Optional[str] = None,
+    ) -> AsyncIterator[RedisModelT]:
+        key_pattern = self._get_key_pattern(specifications=specifications, initial_query=initial_query)
+
+        if not all(isinstance(specification, InternalFilter) for specification in specifications):
+            for model in self._apply_specifications(
+                specifications=specifications,
+                query=await self._read_models(key_pattern),
+            ):
+                yield model
+
+            return
+
+        chunk = []
+        async for model in self._iter_models(key_pattern):
+            chunk.append(model)
+
+            if len(chunk) >= self.chunk_size:
+                for found_model in self._apply_specifications(specifications=specifications, query=chunk):
+                    yield found_model
+
+                chunk = []
+
+        for found_model in self._apply_specifications(specifications=specifications, query=chunk):
+            yield found_model
+
+    async def load_many(self, field: str, values: Iterable[Any]) -> List[RedisModelT]:
+        """ Finds the models for AsyncBatchLoader. Ids are the keys, so they are read with MGET without any filters """
+        if field != 'id':
+            return await self.filter(self.specs.filter(**{f"{field}__in": list(values)}))
+
+        values, models = list(values), []
+        for position in range(0, len(values), self.chunk_size):
+            for value in await self.session.mget(values[position:position + self.chunk_size]):
+                if value is not None:
+                    models.append(self._load_model(value))
+
+        return models
+
+    def dict_to_models(self, data: dict) -> RedisModelT:
+        return self.model(**dict_to_internal_models(data=data, model=self.model))
+
+    async def _execute(self, transaction: Union[Pipeline, Redis]) -> None:
+        """ Commands of RedisUnitOfWork are sent on commit, other pipelines are sent right away """
+        if transaction is not self.transaction:
+            await transaction.execute()
+
+    async def save(self, obj: Optional[RedisModelT] = None, **obj_data) -> RedisModelT:
+        if obj is None:
+            obj = self.dict_to_models(data=obj_data)
+
+        return await self._save(obj)
+
+    async def _save(self, obj: RedisModelT, only_update: bool = False) -> RedisModelT:
+        if self.transaction is self.session:
+            await self.session.set(
+                name=obj.id,
+                value=obj.json(),
+                ex=getattr(obj, 'expire_in', None),
+                px=getattr(obj, 'expire_in_px', None),
+                nx=getattr(obj, 'only_create', False),
+                xx=only_update or getattr(obj, 'only_update', False),
+                keepttl=getattr(obj, 'keep_ttl', False),
+            )
+        else:
+            RedisRepository._set_model(transaction=self.transaction, obj=obj, only_update=only_update)
+
+        return obj
+
+    async def _write_many(
+        self,
+        objs: Iterable,
+        write: Callable[[Pipeline, List], None],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """ Writes the objects with non-transactional pipelines, or adds them to the AsyncRedisUnitOfWork """
+        objs = list(objs)
+        batch_size = batch_size or self.batch_size
+
+        for start in range(0, len(objs), batch_size):
+            if self.transaction is self.session:
+                pipeline = self.session.pipeline(transaction=False)
+            else:
+                pipeline = self.transaction
+
+            write(pipeline, objs[start:start + batch_size])
+            await self._execute(pipeline)
+
+    async def save_many(self, objs: Iterable[RedisModelT], batch_size: Optional[int] = None) -> List[RedisModelT]:
+        return await self._save_many(objs, batch_size=batch_size)
+
+    async def _save_many(
+        self,
+        objs: Iterable[RedisModelT],
+        batch_size: Optional[int] = None,
+        only_update: bool = False,
+    ) -> List[RedisModelT]:
+        objs = list(objs)
+
+        def write_batch(pipeline: Pipeline, batch: List[RedisModelT]) -> None:
+            for obj in batch:
+                RedisRepository._set_model(transaction=pipeline, obj=obj, only_update=only_update)
+
+        await self._write_many(objs=objs, write=write_batch, batch_size=batch_size)
+        return objs
+
+    async def update_many(self, objs: Iterable[RedisModelT], batch_size: Optional[int] = None) -> None:
+        await self._save_many(objs, batch_size=batch_size, only_update=True)
+
+    async def delete_many(self, objs: Iterable[RedisModelT], batch_size: Optional[int] = None) -> None:
+
+        def write_batch(pipeline: Pipeline, batch: List[RedisModelT]) -> None:
+            pipeline.delete(*[str(obj.id) for obj in batch])
+
+        await self._write_many(objs=objs, write=write_batch, batch_size=batch_size)
+
+    async def delete(self, obj: Optional[RedisModelT] = None, *specifications: SpecificationType) -> None:
+        obj, specifications = self._check_obj_is_specification(obj, specifications)
+
+        if specifications:
+            keys = [str(model.id) for model in await self.filter(*specifications)]
+        elif obj is not None:
+            keys = [obj.id]
+        else:
+            keys = []
+
+        if not keys:
+            return
+        elif self.transaction is self.session:
+            await self.session.delete(*keys)
+        else:
+            self.transaction.delete(*keys)
+
+    async def update(
+        self,
+        obj: Optional[RedisModelT] = None,
+        *specifications: SpecificationType,
+        **update_values,
+    ) -> None:
+        obj, specifications = self._check_obj_is_specification(obj, specifications)
+
+        if specifications:
+            if not update_values:
+                raise InvalidQueryError(
+                    "You did not provide any update_values "
+                    "to the update() yet provided specifications"
+                )
+
+            updated_models = {}
+            for model in await self.filter(*specifications):
+                model.__dict__.update(update_values)
+                updated_models[str(model.id)] = model.json()
+
+            if not updated_models:
+                return
+            elif self.transaction is self.session:
+                await self.session.mset(updated_models)
+            else:
+                self.transaction.mset(updated_models)
+
+        elif obj is not None:
+            await self._save(obj, only_update=True)
+
+    async def is_modified(self, obj: RedisModelT) -> bool:
+        return await self.get(self.specifications.filter(obj.id)) == obj
+
+    async def refresh(self, obj: RedisModelT) -> None:
+        fresh_obj = await self.get(self.specifications.filter(obj.id))
+        obj.__dict__.update(fresh_obj.__dict__)
+
+    async def count(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+    ) -> Union[AsyncLazyCommand[int], int]:
+        if not specifications:
+            return await self.session.dbsize()
+
+        count = 0
+        async for _ in self.iter_filter(*specifications, initial_query=initial_query):
+            count += 1
+
+        return count
+
+
+__all__ = [
+    'AsyncRedisRepository',
+]
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from assimilator.core.patterns import ErrorWrapper
+from assimilator.core.database import AsyncUnitOfWork
+from assimilator.redis_.database.async_repository import AsyncRedisRepository
+from assimilator.internal.database.error_wrapper import InternalErrorWrapper
+
+
+class AsyncRedisUnitOfWork(AsyncUnitOfWork):
+    repository: AsyncRedisRepository
+
+    def __init__(
+        self,
+        repository: AsyncRedisRepository,
+        error_wrapper: Optional[ErrorWrapper] = None,
+        autocommit: bool = False,
+    ):
+        super(AsyncRedisUnitOfWork, self).__init__(
+            repository=repository,
+            error_wrapper=error_wrapper or InternalErrorWrapper(),
+            autocommit=autocommit,
+        )
+
+    async def begin(self):
+        self.repository.transaction = self.repository.session.pipeline()
+
+    async def rollback(self):
+        await self.repository.transaction.reset()
+
+    async def commit(self):
+        await self.repository.transaction.execute()
+
+    async def close(self):
+        await self.repository.transaction.reset()
+        self.repository.transaction = self.repository.session
+
+
+__all__ = [
+    'AsyncRedisUnitOfWork',
+]
@@ -0,0 +1,84 @@
+import pickle
+import hashlib
+from typing import Any, Hashable, Optional
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from assimilator.core.database.cache import CacheBackend
+
+
+class RedisCache(CacheBackend):
+    """
+    Stores the results of the CachedRepository in Redis, so that they are shared by all the processes.
+    The version of every namespace is stored in its own key and changed with INCR. Results of the old
+    versions are not removed, they expire after ttl seconds.
+    """
+
+    def __init__(
+        self,
+        session: Redis,
+        prefix: str = 'assimilator_cache:',
+        ttl: Optional[int] = 600,
+        serializer=pickle,
+    ):
+        self.session = session
+        self.prefix = prefix
+        self.ttl = ttl
+        self.serializer = serializer
+
+    def _get_version_key(self, namespace: str) -> str:
+        return f"{self.prefix}{namespace}:version"
+
+    def _get_entry_key(self, namespace: str, key: Hashable) -> str:
+        """ Fingerprints only contain plain values, so their repr() is the same in every process """
+        return f"{self.prefix}{namespace}:{hashlib.sha256(repr(key).encode()).hexdigest()}"
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        data = self.session.get(self._get_entry_key(namespace, key))
+        if data is None:
+            raise KeyError(key)
+
+        return self.serializer.loads(data)
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        self.session.set(self._get_entry_key(namespace, key), self.serializer.dumps(value), ex=self.ttl)
+
+    def get_version(self, namespace: str) -> int:
+        return int(self.session.get(self._get_version_key(namespace)) or 0)
+
+    def invalidate(self, namespace: str) -> None:
+        self.session.incr(self._get_version_key(namespace))
+
+    def __str__(self):
+        return f"{type(self).__name__}(prefix={self.prefix}, ttl={self.ttl})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class AsyncRedisCache(RedisCache):
+    """ RedisCache for redis.asyncio. Use it with AsyncCachedRepository """
+    session: AsyncRedis
+
+    async def get(self, namespace: str, key: Hashable) -> Any:
+        data = await self.session.get(self._get_entry_key(namespace, key))
+        if data is None:
+            raise KeyError(key)
+
+        return self.serializer.loads(data)
+
+    async def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        await self.session.set(self._get_entry_key(namespace, key), self.serializer.dumps(value), ex=self.ttl)
+
+    async def get_version(self, namespace: str) -> int:
+        return int(await self.session.get(self._get_version_key(namespace)) or 0)
+
+    async def invalidate(self, namespace: str) -> None:
+        await self.session.incr(self._get_version_key(namespace))
+
+
+__all__ = [
+    'RedisCache',
+    'AsyncRedisCache',
+]
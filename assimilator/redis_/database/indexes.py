@@ -0,0 +1,322 @@
+import json
+from abc import ABC, abstractmethod
+from weakref import finalize
+from datetime import date, datetime
+from typing import Any, ClassVar, FrozenSet, Iterable, Iterator, List, Optional, Set, Union, Dict
+
+from redis import Redis
+from redis.client import Pipeline
+
+from assimilator.core.database.models import BaseModel
+from assimilator.core.database.specifications.filtering_options import FILTERING_OPTIONS_SEPARATOR
+from assimilator.internal.database.specifications.planner import FilterPredicate
+from assimilator.internal.database.specifications.utils import InternalContainers, find_model_value
+
+
+class RedisIndex(ABC):
+    """
+    Index that is stored in Redis next to the models. RedisRepository changes it in the same
+    pipeline as the models, and uses it to find the keys before the values are read.
+    """
+    options: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __init__(self, field: str):
+        self.field = field
+        self._fields = field.split(FILTERING_OPTIONS_SEPARATOR)
+        self.prefix: Optional[str] = None   # set by the RedisIndexes
+
+    def supports(self, option: str) -> bool:
+        return option in self.options
+
+    def get_values(self, model: BaseModel) -> List[Any]:
+        try:
+            model_val = find_model_value(fields=self._fields, model=model)
+        except AttributeError:
+            return []
+
+        if len(self._fields) > 1 and isinstance(model_val, InternalContainers):
+            return list(model_val)
+
+        return [model_val]
+
+    @abstractmethod
+    def add(self, transaction: Union[Pipeline, Redis], key: str, values: List[str]) -> None:
+        raise NotImplementedError("add() is not implemented in the index")
+
+    @abstractmethod
+    def remove(self, transaction: Union[Pipeline, Redis], key: str, values: List[str]) -> None:
+        raise NotImplementedError("remove() is not implemented in the index")
+
+    @abstractmethod
+    def encode(self, value: Any) -> Optional[str]:
+        """ Converts the value of the field to the value that is stored in the index """
+        raise NotImplementedError("encode() is not implemented in the index")
+
+    @abstractmethod
+    def find(self, session: Redis, option: str, value: Any) -> Optional[Set[bytes]]:
+        """ Returns the keys that may satisfy the filtering option, or None if the index cannot be used """
+        raise NotImplementedError("find() is not implemented in the index")
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.field})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class RedisSetIndex(RedisIndex):
+    """ Stores a Redis set with the keys of the models for every value of the field. Used for eq and in. """
+    options = frozenset({'eq', 'in'})
+
+    def encode(self, value: Any) -> Optional[str]:
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)      # 1 == 1.0, so they must be stored in the same set
+
+        return json.dumps(value, default=str)
+
+    def get_set_key(self, encoded_value: str) -> str:
+        return f"{self.prefix}:{self.field}:{encoded_value}"
+
+    def add(self, transaction: Union[Pipeline, Redis], key: str, values: List[str]) -> None:
+        for value in values:
+            transaction.sadd(self.get_set_key(value), key)
+
+    def remove(self, transaction: Union[Pipeline, Redis], key: str, values: List[str]) -> None:
+        for value in values:
+            transaction.srem(self.get_set_key(value), key)
+
+    def find(self, session: Redis, option: str, value: Any) -> Optional[Set[bytes]]:
+        if option == 'in':
+            set_keys = [self.get_set_key(self.encode(member)) for member in value]
+            return session.sunion(set_keys) if set_keys else set()
+
+        return session.smembers(self.get_set_key(self.encode(value)))
+
+
+class RedisSortedIndex(RedisIndex):
+    """
+    Stores a Redis sorted set with the keys of the models scored by the value of the field.
+    Used for range filtering options on fields with a single number or date.
+    """
+    options = frozenset({'eq', 'gt', 'gte', 'lt', 'lte'})
+
+    def get_sorted_set_key(self) -> str:
+        return f"{self.prefix}:{self.field}"
+
+    def encode(self, value: Any) -> Optional[str]:
+        if isinstance(value, datetime):
+            return repr(value.timestamp())
+        elif isinstance(value, date):
+            return repr(datetime(value.year, value.month, value.day).timestamp())
+        elif isinstance(value, (int, float)):
+            return repr(float(value))
+
+        return None     # the value cannot be used as a score
+
+    def add(self, transaction: Union[Pipeline, Redis], key: str, values: List[str]) -> None:
+        if len(values) == 1 and values[0] is not None:
+            transaction.zadd(self.get_sorted_set_key(), {key: float(values[0])})
+
+    def remove(self, transaction: Union[Pipeline, Redis], key: str, values: List[str]) -> None:
+        transaction.zrem(self.get_sorted_set_key(), key)
+
+    def find(self, session: Redis, option: str, value: Any) -> Optional[Set[bytes]]:
+        score = self.encode(value)
+        if score is None:
+            return None
+
+        min_score, max_score = {
+            'eq': (score, score),
+            'gt': (f"({score}", "+inf"),
+            'gte': (score, "+inf"),
+            'lt': ("-inf", f"({score}"),
+            'lte': ("-inf", score),
+        }[option]
+
+        return set(session.zrangebyscore(self.get_sorted_set_key(), min_score, max_score))
+
+
+class RedisIndexes:
+    """
+    All the indexes of the RedisRepository. The values that were indexed for every key are
+    stored in a Redis hash, so that old index entries can be removed when the model is changed.
+    Pipelines are executed later, so the values that were written to a pipeline are remembered
+    until the pipeline is deleted, and the next changes in the same pipeline remove them.
+    """
+
+    def __init__(self, indexes: Iterable[Union[RedisIndex, str]], prefix: str):
+        self.prefix = prefix
+        self.indexes: List[RedisIndex] = []
+        self._pending_values: Dict[int, Dict[str, Dict[str, List[str]]]] = {}   # id() of the pipeline -> values
+
+        for index in indexes:
+            if isinstance(index, str):
+                index = RedisSetIndex(field=index)
+
+            index.prefix = prefix
+            self.indexes.append(index)
+
+    def get_values_key(self, key: Union[str, bytes]) -> str:
+        if isinstance(key, bytes):
+            key = key.decode()
+
+        return f"{self.prefix}:values:{key}"
+
+    def _read_stored_values(self, session: Redis, values_keys: List[str]) -> List[Dict[str, List[str]]]:
+        if not values_keys:
+            return []
+
+        pipeline = session.pipeline(transaction=False)
+        for values_key in values_keys:
+            pipeline.hgetall(values_key)
+
+        return [
+            {
+                (field.decode() if isinstance(field, bytes) else field): json.loads(values)
+                for field, values in indexed_values.items()
+            }
+            for indexed_values in pipeline.execute()
+        ]
+
+    def _get_pending_values(self, transaction: Pipeline) -> Dict[str, Dict[str, List[str]]]:
+        pending_values = self._pending_values.get(id(transaction))
+
+        if pending_values is None:
+            pending_values = self._pending_values[id(transaction)] = {}
+            finalize(transaction, self._pending_values.pop, id(transaction), None)
+
+        return pending_values
+
+    def _read_values(
+        self,
+        session: Redis,
+        transaction: Union[Pipeline, Redis],
+        keys: List[str],
+    ) -> List[Dict[str, List[str]]]:
+        """ Reads the indexed values of the keys with the changes of the transaction that were not executed yet """
+        values_keys = [self.get_values_key(key) for key in keys]
+        pending_values = self._pending_values.get(id(transaction), {}) if transaction is not session else {}
+
+        stored_keys = [values_key for values_key in values_keys if values_key not in pending_values]
+        stored_values = dict(zip(stored_keys, self._read_stored_values(session=session, values_keys=stored_keys)))
+
+        return [
+            pending_values[values_key] if values_key in pending_values else stored_values[values_key]
+            for values_key in values_keys
+        ]
+
+    def _write_values(
+        self,
+        session: Redis,
+        transaction: Union[Pipeline, Redis],
+        key: str,
+        values: Dict[str, List[str]],
+    ) -> None:
+        values_key = self.get_values_key(key)
+        transaction.delete(values_key)
+
+        if values:
+            transaction.hset(values_key, mapping={
+                field: json.dumps(field_values) for field, field_values in values.items()
+            })
+
+        if transaction is not session:
+            self._get_pending_values(transaction)[values_key] = values
+
+    def remove(self, session: Redis, transaction: Union[Pipeline, Redis], keys: Iterable[str]) -> None:
+        keys = [key.decode() if isinstance(key, bytes) else str(key) for key in keys]
+        if not keys:
+            return
+
+        for key, old_values in zip(keys, self._read_values(session=session, transaction=transaction, keys=keys)):
+            for index in self.indexes:
+                index.remove(transaction=transaction, key=key, values=old_values.get(index.field, []))
+
+            self._write_values(session=session, transaction=transaction, key=key, values={})
+
+    def add(self, session: Redis, transaction: Union[Pipeline, Redis], models: Iterable[BaseModel]) -> None:
+        models = list(models)
+        if not models:
+            return
+
+        keys = [str(model.id) for model in models]
+        old_values_list = self._read_values(session=session, transaction=transaction, keys=keys)
+
+        for key, model, old_values in zip(keys, models, old_values_list):
+            new_values = {}
+
+            for index in self.indexes:
+                values = [index.encode(value) for value in index.get_values(model)]
+                index.remove(transaction=transaction, key=key, values=old_values.get(index.field, []))
+                index.add(transaction=transaction, key=key, values=values)
+                new_values[index.field] = values
+
+            self._write_values(session=session, transaction=transaction, key=key, values=new_values)
+
+    def is_index_key(self, key: Union[str, bytes]) -> bool:
+        """ Index sets and values hashes are stored next to the models, but they are not models """
+        if isinstance(key, bytes):
+            key = key.decode()
+
+        return key.startswith(f"{self.prefix}:")
+
+    def iter_indexed_keys(self, session: Redis, scan_count: Optional[int] = None) -> Iterator[str]:
+        """ Iterates over the keys of all the models that have values in the indexes """
+        values_prefix = self.get_values_key('')
+
+        for values_key in session.scan_iter(match=f"{values_prefix}*", count=scan_count):
+            if isinstance(values_key, bytes):
+                values_key = values_key.decode()
+
+            yield values_key[len(values_prefix):]
+
+    def find_keys(self, session: Redis, predicates: Iterable[FilterPredicate]) -> Optional[Set[bytes]]:
+        """
+        Returns the keys that may satisfy all the predicates, or None if no index can be used.
+        Equality predicates on set indexes are intersected in Redis with a single SINTER.
+        """
+        set_keys = []
+        found_keys: Optional[Set[bytes]] = None
+
+        for predicate in predicates:
+            if predicate.field is None:
+                continue
+
+            for index in self.indexes:
+                if index.field != predicate.field or not index.supports(predicate.option):
+                    continue
+                elif isinstance(index, RedisSetIndex) and predicate.option == 'eq':
+                    set_keys.append(index.get_set_key(index.encode(predicate.value)))
+                    break
+
+                try:
+                    index_keys = index.find(session=session, option=predicate.option, value=predicate.value)
+                except TypeError:
+                    continue
+
+                if index_keys is not None:
+                    found_keys = index_keys if found_keys is None else found_keys & index_keys
+                    break
+
+        if set_keys:
+            intersected_keys = set(session.sinter(set_keys))
+            found_keys = intersected_keys if found_keys is None else found_keys & intersected_keys
+
+        return found_keys
+
+    def __iter__(self):
+        return iter(self.indexes)
+
+    def __bool__(self):
+        return bool(self.indexes)
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.indexes})"
+
+
+__all__ = [
+    'RedisIndex',
+    'RedisSetIndex',
+    'RedisSortedIndex',
+    'RedisIndexes',
+]
@@ -1,5 +1,7 @@
 import json
-from typing import Type, Union, Optional, TypeVar, List
+from fnmatch import fnmatchcase
+from itertools import islice
+from typing import Type, Union, Optional, TypeVar, List, Iterable, Iterator, Callable, Any
 
 from redis import Redis
 from redis.client import Pipeline
@@ -11,7 +13,11 @@ from assimilator.core.database import (
     Repository,
     LazyCommand,
 )
-from assimilator.internal.database import InternalSpecificationList
+from assimilator.internal.database import InternalSpecificationList, InternalFilter
+from assimilator.internal.database.specifications.filter_specifications import CompositeFilter
+from assimilator.internal.database.specifications.planner import FilterPredicate
+from assimilator.redis_.database.indexes import RedisIndex, RedisIndexes
+from assimilator.redis_.database.scripts import RedisFilterScript, compile_predicates
 from assimilator.internal.database.models_utils import dict_to_internal_models
 from assimilator.core.database.exceptions import (
     DataLayerError,
@@ -37,6 +43,13 @@ class RedisRepository(Repository):
         specifications: Type[SpecificationList] = InternalSpecificationList,
         error_wrapper: Optional[ErrorWrapper] = None,
         use_double_filter: bool = True,
+        use_scan: bool = True,
+        scan_count: Optional[int] = 1000,
+        chunk_size: int = 1000,
+        indexes: Optional[Iterable[Union[RedisIndex, str]]] = None,
+        index_prefix: Optional[str] = None,
+        use_server_filter: bool = False,
+        batch_size: int = 1000,
     ):
         super(RedisRepository, self).__init__(
             session=session,
@@ -50,6 +63,154 @@ class RedisRepository(Repository):
         )
         self.transaction = session
         self.use_double_specifications = use_double_filter
+        self.use_scan = use_scan
+        self.scan_count = scan_count
+        self.chunk_size = chunk_size
+        self.indexes = RedisIndexes(
+            indexes=indexes or (),
+            prefix=index_prefix or f"assimilator:index:{model.__name__}",
+        )
+        self.filter_script = RedisFilterScript(session) if use_server_filter else None
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _is_pattern(key_pattern: str) -> bool:
+        return any(symbol in key_pattern for symbol in '*?[\\')
+
+    def _iter_keys(self, key_pattern: str) -> Iterator[str]:
+        """
+        Iterates over the keys that match the pattern. SCAN is used by default, since KEYS
+        blocks the whole Redis server until every key in the database is checked.
+        """
+        if key_pattern and not self._is_pattern(key_pattern):
+            yield key_pattern   # that is a key, we do not have to look for it
+            return
+        elif not self.use_scan:
+            yield from self.session.keys(key_pattern)
+            return
+
+        seen_keys = set()   # SCAN can return the same key multiple times
+
+        for key in self.session.scan_iter(match=key_pattern, count=self.scan_count):
+            if key not in seen_keys:
+                seen_keys.add(key)
+                yield key
+
+    def _iter_model_keys(self, key_pattern: str) -> Iterator[str]:
+        """ Iterates over the keys that match the pattern, except for the keys of the indexes """
+        keys = self._iter_keys(key_pattern)
+
+        if not self.indexes:
+            return keys
+
+        return (key for key in keys if not self.indexes.is_index_key(key))
+
+    def _iter_chunks(self, keys: Iterable, chunk_size: Optional[int] = None) -> Iterator[List]:
+        keys = iter(keys)
+
+        while True:
+            keys_chunk = list(islice(keys, chunk_size or self.chunk_size))
+            if not keys_chunk:
+                return
+
+            yield keys_chunk
+
+    def _iter_values(self, keys: Iterable[str]) -> Iterator[Optional[bytes]]:
+        """ Reads the values with MGET in chunks, so that one command never reads the whole keyspace """
+        for keys_chunk in self._iter_chunks(keys):
+            yield from self.session.mget(keys_chunk)
+
+    def _get_server_predicates(self, specifications: Iterable[SpecificationType]) -> List[list]:
+        if self.filter_script is None:
+            return []
+
+        predicates, _ = compile_predicates(self._get_filter_predicates(specifications))
+        return predicates
+
+    def _iter_server_values(self, keys: Iterable[str], predicates: List[list]) -> Iterator[bytes]:
+        """ Checks the filters in Redis with Lua, so that only the matching documents are sent back """
+        for keys_chunk in self._iter_chunks(keys):
+            yield from self.filter_script.filter(keys=keys_chunk, predicates=predicates)
+
+    @staticmethod
+    def _get_filter_predicates(specifications: Iterable[SpecificationType]) -> Iterator[FilterPredicate]:
+        for specification in specifications:
+            if not isinstance(specification, InternalFilter):
+                return  # other specifications change the results, so the next filters cannot use indexes
+
+            yield from specification.predicates
+
+    def _find_index_keys(self, key_pattern: str, specifications: Iterable[SpecificationType]) -> Optional[List]:
+        """ Finds the keys with the indexes, or returns None if they cannot be used """
+        if not self.indexes or (key_pattern and not self._is_pattern(key_pattern)):
+            return None
+
+        found_keys = self.indexes.find_keys(
+            session=self.session,
+            predicates=self._get_filter_predicates(specifications),
+        )
+
+        if found_keys is None:
+            return None
+        elif key_pattern in ('', '*'):
+            return list(found_keys)
+
+        return [
+            key for key in found_keys
+            if fnmatchcase(key.decode() if isinstance(key, bytes) else key, key_pattern)
+        ]
+
+    def _find_keys(self, key_pattern: str, specifications: Iterable[SpecificationType]) -> Iterable[str]:
+        """ Finds the keys with the indexes if they can be used, or with the key pattern otherwise """
+        found_keys = self._find_index_keys(key_pattern, specifications)
+        return self._iter_model_keys(key_pattern) if found_keys is None else found_keys
+
+    def _iter_indexed_values(self, keys: List) -> Iterator[Optional[bytes]]:
+        """
+        Reads the values of the keys that were found with the indexes. Redis removes the models that expired,
+        but not their index entries, so the entries of the keys that do not exist anymore are removed.
+        """
+        for keys_chunk in self._iter_chunks(keys):
+            values = self.session.mget(keys_chunk)
+            missing_keys = [key for key, value in zip(keys_chunk, values) if value is None]
+
+            if missing_keys:
+                self._remove_index_entries(missing_keys)
+
+            yield from values
+
+    def _remove_index_entries(self, keys: List) -> None:
+        pipeline = self.session.pipeline(transaction=False)
+        for key in keys:
+            pipeline.exists(key)
+
+        missing_keys = [key for key, exists in zip(keys, pipeline.execute()) if not exists]
+        if not missing_keys:
+            return
+
+        pipeline = self.session.pipeline()
+        self.indexes.remove(session=self.session, transaction=pipeline, keys=missing_keys)
+        pipeline.execute()
+
+    def clean_indexes(self) -> None:
+        """
+        Removes the index entries of the models that do not exist anymore. Models that were saved with
+        expire_in are removed by Redis, but their index entries are only removed when the indexes find them.
+        Call it from time to time if you filter by other values than the ones of the expired models.
+        """
+        for keys_chunk in self._iter_chunks(self.indexes.iter_indexed_keys(self.session, scan_count=self.scan_count)):
+            self._remove_index_entries(keys_chunk)
+
+    def _begin_writes(self) -> Union[Pipeline, Redis]:
+        """ Models and their indexes are written in one pipeline. RedisUnitOfWork already uses a pipeline """
+        if self.indexes and self.transaction is self.session:
+            return self.session.pipeline()
+
+        return self.transaction
+
+    def _end_writes(self, transaction: Union[Pipeline, Redis]) -> None:
+        if transaction is not self.transaction:
+            transaction.execute()
 
     def get(
         self,
@@ -58,10 +219,10 @@ class RedisRepository(Repository):
         initial_query: Optional[str] = None,
     ) -> Union[LazyCommand[RedisModelT], RedisModelT]:
         query = self._apply_specifications(query=initial_query, specifications=specifications) or '*'
-        found_objects = self.session.mget(self.session.keys(query))
-
-        if not all(found_objects):
-            raise NotFoundError(f"{self} repository get() did not find any results with this query: {query}")
+        found_objects = [
+            found_object for found_object in self._iter_values(self._find_keys(query, specifications))
+            if found_object is not None
+        ]
 
         parsed_objects = list(self._apply_specifications(
             query=[self.model.loads(found_object) for found_object in found_objects],
@@ -77,29 +238,105 @@ class RedisRepository(Repository):
 
         return parsed_objects[0]
 
-    def filter(
+    def _get_key_pattern(
         self,
-        *specifications: SpecificationType,
-        lazy: bool = False,
+        specifications: Iterable[SpecificationType],
         initial_query: Optional[str] = None,
-    ) -> Union[LazyCommand[List[RedisModelT]], List[RedisModelT]]:
+    ) -> str:
         if self.use_double_specifications and specifications:
-            key_name = self._apply_specifications(
+            return self._apply_specifications(
                 query=initial_query,
                 specifications=specifications,
             ) or "*"
-        else:
-            key_name = "*"
 
-        models = self.session.mget(self.session.keys(key_name))
+        return "*"
 
+    def _load_model(self, value: bytes) -> RedisModelT:
         if isinstance(self.model, BaseModel):
-            query = [self.model.loads(value) for value in models]
+            return self.model.loads(value)
+
+        return self.model(**json.loads(value))
+
+    def _iter_models(
+        self,
+        key_pattern: str,
+        specifications: Iterable[SpecificationType] = (),
+    ) -> Iterator[RedisModelT]:
+        index_keys = self._find_index_keys(key_pattern, specifications)
+        keys = self._iter_model_keys(key_pattern) if index_keys is None else index_keys
+        server_predicates = self._get_server_predicates(specifications)
+
+        if server_predicates:
+            values = self._iter_server_values(keys=keys, predicates=server_predicates)
+        elif index_keys is not None:
+            values = self._iter_indexed_values(index_keys)
         else:
-            query = [self.model(**json.loads(value)) for value in models]
+            values = self._iter_values(keys)
+
+        for value in values:
+            if value is not None:   # the key was deleted after we found it
+                yield self._load_model(value)
+
+    def _wrap_errors(self, iterator: Iterable) -> Iterator:
+        """ Errors of the generators are raised when we iterate over them, so we wrap every step """
+        iterator = iter(iterator)
+
+        while True:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            except BaseException as error:
+                self.error_wrapper.raise_wrapped_error(error)
+                raise
+
+            yield item
+
+    def iter_filter(
+        self,
+        *specifications: SpecificationType,
+        initial_query: Optional[str] = None,
+    ) -> Iterator[RedisModelT]:
+        """
+        Same as filter(), but yields the models while the keys are read. Only one chunk of values is
+        kept in memory, unless your specifications need all the models(ordering, for example).
+        """
+        return self._wrap_errors(self._stream_models(specifications=specifications, initial_query=initial_query))
+
+    def _stream_models(
+        self,
+        specifications: Iterable[SpecificationType],
+        initial_query: Optional[str] = None,
+    ) -> Iterator[RedisModelT]:
+        models = self._iter_models(
+            key_pattern=self._get_key_pattern(specifications=specifications, initial_query=initial_query),
+            specifications=specifications,
+        )
+        yield from self._apply_specifications(specifications=specifications, query=models)
+
+    def filter(
+        self,
+        *specifications: SpecificationType,
+        lazy: bool = False,
+        initial_query: Optional[str] = None,
+        stream: bool = False,
+    ) -> Union[LazyCommand[List[RedisModelT]], List[RedisModelT], Iterator[RedisModelT]]:
+        if stream:
+            return self.iter_filter(*specifications, initial_query=initial_query)
 
+        query = list(self._iter_models(
+            key_pattern=self._get_key_pattern(specifications=specifications, initial_query=initial_query),
+            specifications=specifications,
+        ))
         return list(self._apply_specifications(specifications=specifications, query=query))
 
+    def load_many(self, field: str, values: Iterable[Any]) -> List[RedisModelT]:
+        """ Finds the models for BatchLoader. Ids are the keys, so they are read with MGET without any filters """
+        if field != 'id':
+            return self.filter(self.specs.filter(**{f"{field}__in": list(values)}))
+
+        return [self._load_model(value) for value in self._iter_values(values) if value is not None]
+
     def dict_to_models(self, data: dict) -> RedisModelT:
         return self.model(**dict_to_internal_models(data=data, model=self.model))
 
@@ -107,24 +344,127 @@ class RedisRepository(Repository):
         if obj is None:
             obj = self.dict_to_models(data=obj_data)
 
-        self.transaction.set(
+        return self._save(obj)
+
+    def _save(self, obj: RedisModelT, only_update: bool = False) -> RedisModelT:
+        transaction = self._begin_writes()
+        self._set_model(transaction=transaction, obj=obj, only_update=only_update)
+
+        if self.indexes:
+            written_objs = self._find_written([obj], only_update=only_update)
+            self.indexes.add(session=self.session, transaction=transaction, models=written_objs)
+
+        self._end_writes(transaction)
+        return obj
+
+    @staticmethod
+    def _set_model(transaction: Union[Pipeline, Redis], obj: RedisModelT, only_update: bool = False) -> None:
+        """ update() sets XX with only_update, so that the models of the caller are not changed """
+        transaction.set(
             name=obj.id,
             value=obj.json(),
             ex=getattr(obj, 'expire_in', None),     # for Pydantic model compatability
             px=getattr(obj, 'expire_in_px', None),
             nx=getattr(obj, 'only_create', False),
-            xx=getattr(obj, 'only_update', False),
+            xx=only_update or getattr(obj, 'only_update', False),
             keepttl=getattr(obj, 'keep_ttl', False),
         )
-        return obj
+
+    def _find_written(self, objs: List[RedisModelT], only_update: bool = False) -> List[RedisModelT]:
+        """ Finds the models that SET is going to change, so that the indexes are not changed for nothing """
+        checked_objs = [
+            obj for obj in objs
+            if only_update or getattr(obj, 'only_create', False) or getattr(obj, 'only_update', False)
+        ]
+        if not checked_objs:
+            return objs
+
+        pipeline = self.session.pipeline(transaction=False)
+        for obj in checked_objs:
+            pipeline.exists(obj.id)
+
+        skipped_objs = {
+            id(obj) for obj, exists in zip(checked_objs, pipeline.execute())
+            if bool(exists) == getattr(obj, 'only_create', False)
+        }
+        return [obj for obj in objs if id(obj) not in skipped_objs]
+
+    def _write_many(
+        self,
+        objs: Iterable,
+        write: Callable[[Union[Pipeline, Redis], List], None],
+        batch_size: Optional[int] = None,
+    ) -> None:
+        """
+        Writes the objects with non-transactional pipelines, so that we do not wait for every command.
+        RedisUnitOfWork already uses a pipeline, so the commands are added to it instead.
+        """
+        for batch in self._iter_chunks(objs, chunk_size=batch_size or self.batch_size):
+            if self.transaction is self.session:
+                pipeline = self.session.pipeline(transaction=False)
+            else:
+                pipeline = self.transaction
+
+            write(pipeline, batch)
+
+            if pipeline is not self.transaction:
+                pipeline.execute()
+
+    def save_many(self, objs: Iterable[RedisModelT], batch_size: Optional[int] = None) -> List[RedisModelT]:
+        """ Saves all the models in batches of batch_size. TTL, NX and XX options of every model are used """
+        return self._save_many(objs, batch_size=batch_size)
+
+    def _save_many(
+        self,
+        objs: Iterable[RedisModelT],
+        batch_size: Optional[int] = None,
+        only_update: bool = False,
+    ) -> List[RedisModelT]:
+        objs = list(objs)
+
+        def write_batch(pipeline: Union[Pipeline, Redis], batch: List[RedisModelT]) -> None:
+            written_objs = self._find_written(batch, only_update=only_update) if self.indexes else ()
+
+            for obj in batch:
+                self._set_model(transaction=pipeline, obj=obj, only_update=only_update)
+
+            if written_objs:
+                self.indexes.add(session=self.session, transaction=pipeline, models=written_objs)
+
+        self._write_many(objs=objs, write=write_batch, batch_size=batch_size)
+        return objs
+
+    def update_many(self, objs: Iterable[RedisModelT], batch_size: Optional[int] = None) -> None:
+        """ Updates all the models in batches of batch_size. Models that do not exist are not created """
+        self._save_many(objs, batch_size=batch_size, only_update=True)
+
+    def delete_many(self, objs: Iterable[RedisModelT], batch_size: Optional[int] = None) -> None:
+        """ Deletes all the models in batches of batch_size """
+
+        def write_batch(pipeline: Union[Pipeline, Redis], batch: List[RedisModelT]) -> None:
+            keys = [str(obj.id) for obj in batch]
+            pipeline.delete(*keys)
+            self.indexes.remove(session=self.session, transaction=pipeline, keys=keys)
+
+        self._write_many(objs=objs, write=write_batch, batch_size=batch_size)
 
     def delete(self, obj: Optional[RedisModelT] = None, *specifications: SpecificationType) -> None:
         obj, specifications = self._check_obj_is_specification(obj, specifications)
 
         if specifications:
-            self.transaction.delete(*[str(model.id) for model in self.filter(*specifications)])
+            keys = [str(model.id) for model in self.filter(*specifications)]
         elif obj is not None:
-            self.transaction.delete(obj.id)
+            keys = [obj.id]
+        else:
+            keys = []
+
+        if not keys:
+            return
+
+        transaction = self._begin_writes()
+        transaction.delete(*keys)
+        self.indexes.remove(session=self.session, transaction=transaction, keys=keys)
+        self._end_writes(transaction)
 
     def update(
         self,
@@ -148,11 +488,13 @@ class RedisRepository(Repository):
                 model.__dict__.update(update_values)
                 updated_models[str(model.id)] = model.json()
 
-            self.transaction.mset(updated_models)
+            transaction = self._begin_writes()
+            transaction.mset(updated_models)
+            self.indexes.add(session=self.session, transaction=transaction, models=models)
+            self._end_writes(transaction)
 
         elif obj is not None:
-            obj.only_update = True
-            self.save(obj)
+            self._save(obj, only_update=True)
 
     def is_modified(self, obj: RedisModelT) -> None:
         return self.get(self.specifications.filter(obj.id), lazy=False) == obj
@@ -163,20 +505,71 @@ class RedisRepository(Repository):
         for key, value in fresh_obj.dict().items():
             setattr(obj, key, value)
 
+    def _count_on_server(
+        self,
+        specifications: Iterable[SpecificationType],
+        initial_query: Optional[str] = None,
+    ) -> Optional[int]:
+        """ Counts the models with Lua if all the specifications are filters that Redis can check """
+        if self.filter_script is None or not all(
+            isinstance(specification, InternalFilter) and not isinstance(specification, CompositeFilter)
+            for specification in specifications
+        ):
+            return None
+
+        predicates, all_compiled = compile_predicates(self._get_filter_predicates(specifications))
+        if not predicates or not all_compiled:
+            return None
+
+        keys = self._find_keys(self._get_key_pattern(specifications, initial_query), specifications)
+        models_count = 0
+
+        for keys_chunk in self._iter_chunks(keys):
+            found_count, unchecked_documents = self.filter_script.count(keys=keys_chunk, predicates=predicates)
+            models_count += found_count
+
+            if unchecked_documents:
+                models_count += sum(1 for _ in self._apply_specifications(
+                    query=[self._load_model(document) for document in unchecked_documents],
+                    specifications=specifications,
+                ))
+
+        return models_count
+
     def count(
         self,
         *specifications: SpecificationType,
         lazy: bool = False,
         initial_query: Optional[str] = None,
     ) -> Union[LazyCommand[int], int]:
-        if not specifications:
-            return self.session.dbsize()
+        if not specifications:  # DBSIZE also counts the indexes and the keys of other models
+            key_pattern = self._apply_specifications(query=initial_query, specifications=()) or '*'
+            return sum(1 for _ in self._iter_model_keys(key_pattern))
+
+        server_count = self._count_on_server(specifications=specifications, initial_query=initial_query)
+        if server_count is not None:
+            return server_count
+        elif not self._filters_keys_only(specifications):   # the models must be checked, like in filter()
+            return sum(1 for _ in self.iter_filter(*specifications, initial_query=initial_query))
 
         filter_query = self._apply_specifications(
             query=initial_query,
             specifications=specifications,
+        ) or '*'
+        if not self._is_pattern(filter_query):
+            return self.session.exists(filter_query)
+
+        return sum(1 for _ in self._iter_model_keys(filter_query))
+
+    @staticmethod
+    def _filters_keys_only(specifications: Iterable[SpecificationType]) -> bool:
+        """ Returns True if the specifications only have key filters, so the models can be counted by the keys """
+        return all(
+            isinstance(specification, InternalFilter)
+            and not isinstance(specification, CompositeFilter)
+            and not specification.filters
+            for specification in specifications
         )
-        return len(self.session.keys(filter_query))
 
 
 __all__ = [
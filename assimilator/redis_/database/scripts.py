@@ -0,0 +1,192 @@
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+from redis import Redis
+
+from assimilator.core.database.specifications.filtering_options import FILTERING_OPTIONS_SEPARATOR
+from assimilator.internal.database.specifications.planner import FilterPredicate
+
+MAX_EXACT_NUMBER = 2 ** 53  # Lua numbers are doubles
+
+FILTER_SCRIPT = """
+local predicates = cjson.decode(ARGV[1])
+local count_only = ARGV[2] == '1'
+local unknown = {}
+
+local function find_value(document, path)
+    local value = document
+    for _, field in ipairs(path) do
+        if type(value) ~= 'table' or value[1] ~= nil then
+            return unknown  -- lists are compared with every member, we leave them to Python
+        end
+
+        value = value[field]
+        if value == nil then
+            return unknown
+        end
+    end
+
+    if type(value) == 'table' then
+        return unknown
+    end
+    return value
+end
+
+local function compare(option, value, expected)
+    if option == 'in' then
+        for _, member in ipairs(expected) do
+            local result = compare('eq', value, member)
+            if result ~= false then
+                return result
+            end
+        end
+        return false
+    elseif option == 'eq' then
+        if type(value) == 'boolean' and type(expected) == 'number' then
+            value = value and 1 or 0    -- True == 1 in Python
+        elseif type(value) == 'number' and type(expected) == 'boolean' then
+            expected = expected and 1 or 0
+        end
+        return value == expected
+    elseif option == 'is' then
+        return type(value) == type(expected) and value == expected
+    elseif type(value) ~= type(expected) then
+        return unknown  -- Python raises an error for these values, so the document is checked there
+    elseif type(value) ~= 'number' and type(value) ~= 'string' then
+        return unknown
+    elseif option == 'gt' then
+        return value > expected
+    elseif option == 'gte' then
+        return value >= expected
+    elseif option == 'lt' then
+        return value < expected
+    elseif option == 'lte' then
+        return value <= expected
+    end
+    return unknown
+end
+
+local found = {}
+local found_count = 0
+
+for _, key in ipairs(KEYS) do
+    local raw_document = redis.pcall('GET', key)
+
+    if type(raw_document) == 'string' then
+        local decoded, document = pcall(cjson.decode, raw_document)
+        local matches = decoded and type(document) == 'table'
+        local checked = matches
+
+        if matches then
+            for _, predicate in ipairs(predicates) do
+                local value = find_value(document, predicate[1])
+                local result = unknown
+
+                if value ~= unknown then
+                    result = compare(predicate[2], value, predicate[3])
+                end
+
+                if result == false then
+                    matches = false
+                    break
+                elseif result == unknown then
+                    checked = false
+                end
+            end
+        end
+
+        if matches and checked and count_only then
+            found_count = found_count + 1
+        elseif matches then
+            table.insert(found, raw_document)   -- Python checks the filters that Lua could not check
+        end
+    end
+end
+
+if count_only then
+    return {found_count, found}
+end
+return found
+"""
+
+
+def _is_scalar(value: Any) -> bool:
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return True
+    elif isinstance(value, (int, float)):
+        return abs(value) < MAX_EXACT_NUMBER
+
+    return False
+
+
+def compile_predicate(predicate: FilterPredicate) -> Optional[list]:
+    """ Converts the predicate to [path, option, value] for FILTER_SCRIPT, or returns None if Lua cannot check it """
+    if predicate.field is None:
+        return None
+
+    option, value = predicate.option, predicate.value
+
+    if option == 'is':
+        if value is not True and value is not False:
+            return None     # cjson.decode() turns null into a userdata, so Python checks it
+    elif option == 'in':
+        if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            return None
+
+        value = list(value)
+        if not value or not all(_is_scalar(member) and member is not None for member in value):
+            return None
+    elif option not in ('eq', 'gt', 'gte', 'lt', 'lte'):
+        return None
+
+    if option != 'in' and not _is_scalar(value):
+        return None
+    elif option == 'eq' and value is None:
+        return None
+
+    return [predicate.field.split(FILTERING_OPTIONS_SEPARATOR), option, value]
+
+
+def compile_predicates(predicates: Iterable[FilterPredicate]) -> Tuple[List[list], bool]:
+    """ Returns the compiled predicates and whether all the predicates were compiled """
+    compiled_predicates = []
+    all_compiled = True
+
+    for predicate in predicates:
+        compiled_predicate = compile_predicate(predicate)
+
+        if compiled_predicate is None:
+            all_compiled = False
+        else:
+            compiled_predicates.append(compiled_predicate)
+
+    return compiled_predicates, all_compiled
+
+
+class RedisFilterScript:
+    """
+    Checks the filters inside Redis with a Lua script, so that only the matching documents
+    are sent to Python. The script is loaded once and called with EVALSHA.
+    """
+
+    def __init__(self, session: Redis):
+        self.script = session.register_script(FILTER_SCRIPT)
+
+    def filter(self, keys: List[Any], predicates: List[list]) -> List[bytes]:
+        return self.script(keys=keys, args=[json.dumps(predicates), '0'])
+
+    def count(self, keys: List[Any], predicates: List[list]) -> Tuple[int, List[bytes]]:
+        """
+        Returns the number of documents that satisfy all the predicates, and the documents that Lua could not
+        check(lists, missing fields or values of other types). These documents must be checked in Python.
+        """
+        found_count, unchecked_documents = self.script(keys=keys, args=[json.dumps(predicates), '1'])
+        return found_count, unchecked_documents
+
+
+__all__ = [
+    'FILTER_SCRIPT',
+    'RedisFilterScript',
+    'compile_predicate',
+    'compile_predicates',
+]
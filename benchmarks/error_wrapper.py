@@ -0,0 +1,71 @@
+"""
+Measures the overhead of ErrorWrapper in the get() hot loop of a repository,
+when the error is raised and when it is not. Run it from the root of the repository:
+
+    python -m benchmarks.error_wrapper
+
+"""
+
+import timeit
+
+from assimilator.core.patterns import ErrorWrapper
+from assimilator.core.database import BaseModel, NotFoundError
+from assimilator.internal.database import InternalRepository
+
+
+class User(BaseModel):
+    balance: int
+
+
+repository = InternalRepository(session={}, model=User)
+user = repository.save(User(balance=1))
+found_user = repository.specs.filter(id=user.id)
+missing_user = repository.specs.filter(id="missing")
+
+error_wrapper = ErrorWrapper({KeyError: NotFoundError})
+
+
+def do_nothing():
+    return None
+
+
+wrapped_do_nothing = error_wrapper.decorate(do_nothing)
+
+
+def get_loop():
+    for _ in range(1000):
+        repository.get(found_user)
+
+
+def get_missing_loop():
+    for _ in range(1000):
+        try:
+            repository.get(missing_user)
+        except NotFoundError:
+            pass
+
+
+def with_error_wrapper_loop():
+    for _ in range(1000):
+        with error_wrapper:
+            do_nothing()
+
+
+def decorated_loop():
+    for _ in range(1000):
+        wrapped_do_nothing()
+
+
+def measure(loop, number: int) -> float:
+    """ Returns the best time of one call in microseconds. Every loop makes 1000 calls """
+    return min(timeit.repeat(loop, number=number, repeat=7)) / number / 1000 * 1_000_000
+
+
+if __name__ == '__main__':
+    for label, loop, number in [
+        ("get() by id", get_loop, 50),
+        ("get() raising NotFoundError", get_missing_loop, 20),
+        ("with ErrorWrapper: no-op", with_error_wrapper_loop, 200),
+        ("ErrorWrapper.decorate() no-op", decorated_loop, 200),
+    ]:
+        print(f"{label:30} {measure(loop, number):6.3f} us")
@@ -0,0 +1,54 @@
+"""
+Measures how long internal_order() takes to sort one million models by three fields.
+Run it from the root of the repository:
+
+    python -m benchmarks.internal_order [number of models]
+
+"""
+
+import sys
+import time
+import random
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database.specifications.specifications import internal_order
+
+
+class User(BaseModel):
+    balance: int
+    username: str
+    age: int
+
+
+def create_models(models_count: int):
+    random.seed(1)
+    return [
+        User.construct(
+            id=str(number),
+            balance=random.randint(0, 1000),
+            username=f"user-{random.randint(0, 10000)}",
+            age=random.randint(18, 80),
+        ) for number in range(models_count)
+    ]
+
+
+def measure(models, *clauses: str, repeat: int = 3) -> float:
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(internal_order(*clauses)(models))
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+if __name__ == '__main__':
+    models = create_models(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+
+    for clauses in [
+        ('balance', 'username', 'age'),
+        ('-balance', '-username', '-age'),
+        ('balance', '-username', 'age'),
+    ]:
+        print(f"order{clauses}: {measure(models, *clauses):.0f} ms")
@@ -0,0 +1,40 @@
+"""
+Measures how long it takes to create a repository and a unit of work, and the overhead
+that the error wrapper and lazy commands add to the calls of the repository.
+Run it from the root of the repository:
+
+    python -m benchmarks.repository_overhead
+
+"""
+
+import timeit
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import InternalRepository, InternalUnitOfWork
+
+
+class User(BaseModel):
+    balance: int
+
+
+session = {}
+repository = InternalRepository(session=session, model=User)
+user = repository.save(User(balance=1))
+specification = repository.specs.filter(balance=1)
+
+
+def measure(statement: str, number: int) -> float:
+    """ Returns the best time of one call in microseconds """
+    return min(timeit.repeat(statement, number=number, repeat=5, globals=globals())) / number * 1_000_000
+
+
+if __name__ == '__main__':
+    for label, statement, number in [
+        ("InternalRepository(...)", "InternalRepository(session=session, model=User)", 20_000),
+        ("InternalUnitOfWork(repository)", "InternalUnitOfWork(repository)", 20_000),
+        ("repository.save(user)", "repository.save(user)", 200_000),
+        ("repository.get(filter(balance=1))", "repository.get(specification)", 100_000),
+        ("repository.count()", "repository.count()", 200_000),
+        ("repository.count(lazy=True)", "repository.count(lazy=True)", 200_000),
+    ]:
+        print(f"{label:35} {measure(statement, number):6.2f} us")
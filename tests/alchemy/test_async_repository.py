@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from assimilator.core.patterns import AsyncLazyCommand
+from assimilator.core.services import AsyncCRUDService
+from assimilator.alchemy.database import AsyncAlchemyRepository, AsyncAlchemyUnitOfWork
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker     # noqa: E402
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+    age: Mapped[int] = mapped_column(Integer, default=0)
+
+
+def run_with_repository(test):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        session = async_sessionmaker(engine, expire_on_commit=False)()
+        try:
+            await test(AsyncAlchemyRepository(session=session, model=User))
+        finally:
+            await session.close()
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_filter_and_count():
+    async def test(repository: AsyncAlchemyRepository):
+        await repository.save_many([User(name=f"user-{number % 3}", age=number) for number in range(10)])
+        await repository.session.commit()
+
+        specification = repository.specs.filter(name='user-1')
+        lazy_users = repository.filter(specification, repository.specs.order('-age'), lazy=True)
+        assert isinstance(lazy_users, AsyncLazyCommand)
+        assert [user.age async for user in lazy_users] == [7, 4, 1]
+
+        assert [user.age for user in await repository.filter(repository.specs.filter(age__gte=8))] == [8, 9]
+        assert await repository.count() == 10
+        assert await repository.count(specification) == 3
+        assert (await repository.get(repository.specs.filter(age=5))).name == 'user-2'
+
+        await repository.update(specification, age=100)
+        await repository.delete(repository.specs.filter(name='user-0'))
+        await repository.session.commit()
+        assert await repository.count(repository.specs.filter(age=100)) == 3
+        assert await repository.count() == 6
+
+    run_with_repository(test)
+
+
+def test_unit_of_work():
+    async def test(repository: AsyncAlchemyRepository):
+        uow = AsyncAlchemyUnitOfWork(repository)
+
+        async with uow:
+            await uow.repository.save(name='Andrey')
+            await uow.commit()
+
+        with pytest.raises(ValueError):
+            async with uow:
+                await uow.repository.save(name='Ivan')
+                raise ValueError()
+
+        assert [user.name for user in await repository.filter()] == ['Andrey']
+
+        service = AsyncCRUDService(uow)
+        user = await service.create({'name': 'Petr', 'age': 30})
+        assert await service.get(id=user.id) is user
+        assert [user.name for user in await service.list(age__gt=20)] == ['Petr']
+
+    run_with_repository(test)
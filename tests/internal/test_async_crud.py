@@ -0,0 +1,49 @@
+import asyncio
+
+from assimilator.core.database import BaseModel
+from assimilator.core.patterns import AsyncLazyCommand
+from assimilator.core.services import AsyncCRUDService
+from assimilator.internal.database import AsyncInternalRepository, AsyncInternalUnitOfWork
+
+
+class User(BaseModel):
+    name: str
+    age: int = 0
+
+
+def create_service() -> AsyncCRUDService:
+    return AsyncCRUDService(AsyncInternalUnitOfWork(AsyncInternalRepository(session={}, model=User)))
+
+
+def test_lazy_commands_are_returned_right_away():
+    async def main():
+        service = create_service()
+        users = await service.create_many([{'name': f"user-{number}", 'age': number} for number in range(3)])
+
+        lazy_users = [service.get(id=user.id, lazy=True) for user in users]
+        lazy_list = service.list(age__gte=1, lazy=True)
+        assert all(isinstance(command, AsyncLazyCommand) for command in [*lazy_users, lazy_list])
+
+        assert await asyncio.gather(*lazy_users) == users
+        assert await lazy_list == users[1:]
+        assert await service.get(name='user-1', lazy=True) == users[1]
+
+    asyncio.run(main())
+
+
+def test_crud_operations():
+    async def main():
+        service = create_service()
+        user = await service.create({'name': 'Andrey', 'age': 20})
+
+        assert await service.get(id=user.id) == user
+        assert await service.list(age=20) == [user]
+
+        updated_user = await service.update({'name': 'Andrey', 'age': 30}, id=user.id)
+        assert updated_user.age == 30
+        assert (await service.get(id=user.id)).age == 30
+
+        await service.delete(id=user.id)
+        assert await service.list() == []
+
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from assimilator.core.database import BaseModel, NotFoundError
+from assimilator.core.patterns import AsyncLazyCommand
+from assimilator.internal.database import (
+    InternalRepository,
+    AsyncInternalRepository,
+    AsyncInternalUnitOfWork,
+    HashIndex,
+)
+
+
+class User(BaseModel):
+    name: str
+    age: int = 0
+
+
+def create_repositories():
+    repository = InternalRepository(session={}, model=User)
+    async_repository = AsyncInternalRepository(session={}, model=User, indexes=[HashIndex('name')])
+
+    for number in range(20):
+        user = repository.save(name=f"user-{number % 5}", age=number)
+        asyncio.run(async_repository.save(user.copy()))
+
+    return repository, async_repository
+
+
+@pytest.mark.parametrize('filters', [{}, {'name': 'user-1'}, {'age__gte': 15}, {'name': 'user-2', 'age__lt': 10}])
+def test_results_are_the_same_as_sync(filters):
+    repository, async_repository = create_repositories()
+    specification = repository.specs.filter(**filters)
+    order = repository.specs.order('-age')
+
+    async def main():
+        lazy_users = async_repository.filter(specification, order, lazy=True)
+        assert isinstance(lazy_users, AsyncLazyCommand)
+        assert [user async for user in lazy_users] == repository.filter(specification, order)
+
+        assert await async_repository.filter(specification, order) == repository.filter(specification, order)
+        assert await async_repository.count(specification) == repository.count(specification)
+        assert await async_repository.count(specification, lazy=True) == repository.count(specification)
+
+    asyncio.run(main())
+
+
+def test_get_raises_not_found():
+    _, async_repository = create_repositories()
+
+    async def main():
+        with pytest.raises(NotFoundError):
+            await async_repository.get(async_repository.specs.filter(name='missing'))
+
+    asyncio.run(main())
+
+
+def test_tasks_have_their_own_transactions():
+    _, async_repository = create_repositories()
+    uow = AsyncInternalUnitOfWork(async_repository)
+
+    async def save_in_transaction(name: str, commit: bool):
+        async with uow:
+            await uow.repository.save(name=name)
+            await asyncio.sleep(0.01)
+            assert await uow.repository.count(uow.repository.specs.filter(name=name)) == 1
+
+            if commit:
+                await uow.commit()
+
+    async def count_during_transactions():
+        await asyncio.sleep(0.005)
+        return await async_repository.count()
+
+    async def main():
+        *_, count = await asyncio.gather(
+            save_in_transaction('committed', commit=True),
+            save_in_transaction('rolled back', commit=False),
+            count_during_transactions(),
+        )
+
+        assert count == 20
+        assert await async_repository.count() == 21
+        assert [user.name for user in await async_repository.filter(async_repository.specs.filter(age=0))] == [
+            'user-0', 'committed',
+        ]
+
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import threading
+from uuid import UUID, uuid4
+
+from assimilator.core.database import BaseModel, BatchLoader
+from assimilator.internal.database import InternalRepository
+
+
+class User(BaseModel):
+    name: str
+
+
+class Document(BaseModel):
+    key: UUID
+
+
+class DocumentRepository(InternalRepository):
+    """ Stores the keys as UUID, like databases that do not return the ids as strings """
+
+    def __init__(self, *args, **kwargs):
+        super(DocumentRepository, self).__init__(*args, **kwargs)
+        self.loaded_values = []
+
+    def load_many(self, field, values):
+        values = list(values)
+        self.loaded_values.append(values)
+        return [model for model in self.session.values() if str(getattr(model, field)) in values]
+
+
+def test_values_are_loaded_in_one_batch():
+    repository = InternalRepository(session={}, model=User)
+    users = [repository.save(name=f"user-{number}") for number in range(10)]
+    loader = BatchLoader(repository)
+
+    commands = loader.load_many(user.id for user in users)
+    assert [command() for command in commands] == users
+
+
+def test_threads_add_values_to_the_same_batch():
+    repository = InternalRepository(session={}, model=User)
+    users = [repository.save(name=f"user-{number}") for number in range(400)]
+    loader = BatchLoader(repository)
+    commands = {}
+
+    def load(thread_users):
+        for user in thread_users:
+            commands[user.id] = loader.load(user.id)
+
+    threads = [threading.Thread(target=load, args=(users[number::4],)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loader._batch) == len(users)
+    assert all(commands[user.id]() == user for user in users)
+
+
+def test_string_values_find_other_types():
+    repository = DocumentRepository(session={}, model=Document)
+    documents = [repository.save(key=uuid4()) for _ in range(10)]
+    loader = BatchLoader(repository, field='key')
+
+    commands = loader.load_many(str(document.key) for document in documents)
+    assert [command() for command in commands] == documents
+    assert len(repository.loaded_values) == 1
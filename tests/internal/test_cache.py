@@ -0,0 +1,76 @@
+from typing import Optional
+
+import pytest
+
+from assimilator.core.database import BaseModel, CachedRepository, MemoryCache
+from assimilator.internal.database import InternalRepository, InternalUnitOfWork, IndexedSession
+
+
+class User(BaseModel):
+    name: str
+    age: int = 0
+
+
+class CountingRepository(InternalRepository):
+    def __init__(self, *args, **kwargs):
+        super(CountingRepository, self).__init__(*args, **kwargs)
+        self.filter_calls = 0
+
+    def filter(self, *specifications, lazy=False, initial_query=None, **kwargs):
+        self.filter_calls += 1
+        return super(CountingRepository, self).filter(*specifications, initial_query=initial_query, **kwargs)
+
+
+def create_session(session: Optional[dict] = None) -> dict:
+    repository = InternalRepository(session={} if session is None else session, model=User)
+    repository.save(name='Andrey', age=20)
+    repository.save(name='Ivan', age=30)
+    return repository.session
+
+
+def test_repositories_share_the_default_cache():
+    session = create_session(IndexedSession())
+    first_repository = CountingRepository(session=session, model=User)
+    second_repository = CountingRepository(session=session, model=User)
+
+    first_results = CachedRepository(first_repository).filter(first_repository.specs.filter(age__gt=25))
+    second_results = CachedRepository(second_repository).filter(second_repository.specs.filter(age__gt=25))
+
+    assert first_results == second_results
+    assert (first_repository.filter_calls, second_repository.filter_calls) == (1, 0)
+
+
+@pytest.mark.parametrize('session_type', [dict, IndexedSession])
+def test_sessions_do_not_share_the_default_cache(session_type):
+    first_repository = CachedRepository(InternalRepository(session=create_session(session_type()), model=User))
+    second_repository = CachedRepository(InternalRepository(session=session_type(), model=User))
+
+    assert len(first_repository.filter()) == 2
+    assert second_repository.filter() == []
+    assert second_repository.count() == 0
+
+
+def test_cached_results_are_copied():
+    repository = CachedRepository(InternalRepository(session=create_session(), model=User), cache=MemoryCache())
+    user = repository.get(repository.specs.filter(name='Andrey'))
+
+    user.age = 100
+    assert repository.get(repository.specs.filter(name='Andrey')).age == 20
+    assert repository.get(repository.specs.filter(name='Andrey')) is not repository.get(
+        repository.specs.filter(name='Andrey'),
+    )
+
+
+def test_results_are_not_cached_in_unit_of_work():
+    repository = CachedRepository(CountingRepository(session=create_session(), model=User), cache=MemoryCache())
+
+    with InternalUnitOfWork(repository) as uow:
+        uow.repository.filter(uow.repository.specs.filter(age__gt=25))
+        uow.repository.filter(uow.repository.specs.filter(age__gt=25))
+
+    assert repository.repository.filter_calls == 2
+    assert CachedRepository._transactions._values.get() == {}
+
+    repository.filter(repository.specs.filter(age__gt=25))
+    repository.filter(repository.specs.filter(age__gt=25))
+    assert repository.repository.filter_calls == 3
@@ -0,0 +1,119 @@
+import random
+from typing import Optional
+
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import InternalRepository, InternalUnitOfWork
+
+np = pytest.importorskip('numpy')
+from assimilator.internal.database.columnar import ColumnarSession    # noqa: E402
+
+
+class User(BaseModel):
+    age: int
+    balance: float
+    username: str
+    active: bool
+    rating: Optional[int] = None
+
+
+FILTERS = [
+    {'age': 30},
+    {'age__gt': 40, 'active': True},
+    {'age__lte': 25.5},
+    {'age__in': [20, 30, 2 ** 70]},
+    {'balance__gte': 500.0, 'balance__lt': 750},
+    {'username': 'user-7'},
+    {'username__like': 'user-1%'},
+    {'username__regex': r'user-\d$'},
+    {'username__in': ['user-1', 'user-2']},
+    {'active': False},
+    {'rating': None},
+    {'rating__is': None},
+    {'age': 2 ** 70},
+]
+
+
+def fill(repository: InternalRepository, generator: random.Random) -> None:
+    for number in range(300):
+        repository.save(User(
+            id=str(number),
+            age=generator.randint(18, 60),
+            balance=round(generator.uniform(0, 1000), 2),
+            username=f"user-{generator.randint(0, 20)}",
+            active=generator.random() < 0.5,
+            rating=generator.choice([None, generator.randint(0, 10)]),
+        ))
+
+    for number in generator.sample(range(300), 200):    # deleted rows are compacted
+        repository.delete(repository.get(repository.specs.filter(str(number))))
+
+    for user in repository.filter()[::3]:
+        user.age = 2 ** 70 if user.age == 30 else user.age + 1     # the int column becomes an object column
+        repository.update(user)
+
+
+@pytest.fixture
+def repositories():
+    columnar = InternalRepository(session=ColumnarSession(), model=User)
+    plain = InternalRepository(session={}, model=User)
+
+    fill(columnar, random.Random(1))
+    fill(plain, random.Random(1))
+    return columnar, plain
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_filter_finds_the_same_models_as_dict(repositories, filters):
+    columnar, plain = repositories
+
+    expected = plain.filter(plain.specs.filter(**filters))
+    assert columnar.filter(columnar.specs.filter(**filters)) == expected
+    assert columnar.count(columnar.specs.filter(**filters)) == len(expected)
+
+
+@pytest.mark.parametrize('field', ['age', 'username', 'active', 'rating'])
+def test_count_values_is_the_same_as_dict(repositories, field):
+    columnar, plain = repositories
+    specification = columnar.specs.filter(balance__gt=300)
+
+    assert columnar.count(group_by=field) == plain.count(group_by=field)
+    assert columnar.count(specification, group_by=field) == plain.count(specification, group_by=field)
+    assert columnar.count(specification, distinct=field) == plain.count(specification, distinct=field)
+
+
+def test_order_and_composite_filters_are_the_same_as_dict(repositories):
+    columnar, plain = repositories
+
+    for repository in (columnar, plain):
+        repository.results = repository.filter(
+            repository.specs.filter(age__gt=30) | repository.specs.filter(username='user-3'),
+            repository.specs.order('-balance', 'id'),
+        )
+
+    assert columnar.results == plain.results
+
+
+def test_models_are_copies(repositories):
+    columnar, _ = repositories
+    user = columnar.filter()[0]
+
+    user.username = 'changed'
+    assert columnar.filter(columnar.specs.filter(username='changed')) == []
+
+
+def test_unit_of_work(repositories):
+    columnar, plain = repositories
+
+    for repository in (columnar, plain):
+        with InternalUnitOfWork(repository) as uow:
+            uow.repository.delete(uow.repository.specs.filter(active=True))
+            uow.repository.save(User(id='new', age=99, balance=1, username='new', active=True))
+            uow.commit()
+
+        with InternalUnitOfWork(repository) as uow:
+            uow.repository.delete(uow.repository.specs.filter(age__lt=30))
+
+    assert columnar.filter() == plain.filter()
+    assert columnar.count(columnar.specs.filter(active=True)) == 1
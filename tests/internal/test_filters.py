@@ -0,0 +1,97 @@
+import random
+from functools import reduce
+from operator import or_, and_
+
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import InternalRepository
+from assimilator.internal.database.specifications.filter_specifications import InternalFilter
+
+
+class User(BaseModel):
+    status: str
+    age: int
+
+
+USERS = [User(id=str(number), status='abc'[number % 3], age=number % 50) for number in range(500)]
+
+
+def create_leaf(generator: random.Random):
+    age = generator.randint(0, 50)
+    status = generator.choice('abc')
+
+    return generator.choice([
+        (InternalFilter(age__gt=age), lambda user: user.age > age),
+        (InternalFilter(age__lte=age), lambda user: user.age <= age),
+        (InternalFilter(status=status), lambda user: user.status == status),
+        (InternalFilter(status=status, age__lt=age), lambda user: user.status == status and user.age < age),
+    ])
+
+
+def create_tree(generator: random.Random, depth: int):
+    """ Returns a random filter and a plain Python function that must find the same users """
+    if depth == 0 or generator.random() < 0.2:
+        return create_leaf(generator)
+
+    first_filter, first_check = create_tree(generator, depth - 1)
+    second_filter, second_check = create_tree(generator, depth - 1)
+    operation = generator.choice(['or', 'and', 'invert'])
+
+    if operation == 'or':
+        return first_filter | second_filter, lambda user: first_check(user) or second_check(user)
+    elif operation == 'and':
+        return first_filter & second_filter, lambda user: first_check(user) and second_check(user)
+
+    return ~(first_filter | second_filter), lambda user: not (first_check(user) or second_check(user))
+
+
+@pytest.mark.parametrize('make_query', [list, iter, lambda users: (user for user in users)])
+def test_nested_filters(make_query):
+    generator = random.Random(1)
+
+    for _ in range(100):
+        filter_, check = create_tree(generator, depth=8)
+        assert list(filter_(make_query(USERS))) == [user for user in USERS if check(user)]
+
+
+def test_long_filter_chains():
+    filters = [InternalFilter(age=age) for age in range(5000)]
+
+    assert list(reduce(or_, filters)(USERS)) == USERS
+    assert list(reduce(and_, filters)(USERS)) == []
+    assert list((~reduce(or_, filters[10:]))(iter(USERS))) == [user for user in USERS if user.age < 10]
+
+
+def test_composite_filters_read_generators_once():
+    users = (user for user in USERS)
+    found = (InternalFilter(status='a') | InternalFilter(age__gt=45))(users)
+
+    assert list(found) == [user for user in USERS if user.status == 'a' or user.age > 45]
+    assert next(users, None) is None
+
+
+def test_or_stops_at_the_first_match():
+    checked = []
+
+    def check_age(user: User) -> bool:
+        checked.append(user)
+        return user.age > 10
+
+    found = list((InternalFilter(status='a') | InternalFilter(check_age))(USERS))
+
+    assert found == [user for user in USERS if user.status == 'a' or user.age > 10]
+    assert checked == [user for user in USERS if user.status != 'a']
+
+
+def test_nested_filters_in_repository():
+    repository = InternalRepository(session={user.id: user for user in USERS}, model=User)
+    filter_ = ~(repository.specs.filter(status='a') | repository.specs.filter(age__gte=25)) \
+        & (repository.specs.filter(age__lt=5) | repository.specs.filter(status='c'))
+
+    expected = [
+        user for user in USERS
+        if not (user.status == 'a' or user.age >= 25) and (user.age < 5 or user.status == 'c')
+    ]
+    assert repository.filter(filter_) == expected
+    assert repository.count(filter_) == len(expected)
@@ -0,0 +1,107 @@
+from typing import Optional, Tuple
+
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import InternalRepository, IndexedSession, HashIndex, SortedIndex
+
+
+class User(BaseModel):
+    status: str
+    age: int
+
+
+def create_repository() -> InternalRepository:
+    repository = InternalRepository(
+        session=IndexedSession(),
+        model=User,
+        indexes=[HashIndex('status'), SortedIndex('age')],
+    )
+
+    for age in range(10):
+        repository.save(status='a' if age < 5 else 'b', age=age)
+
+    return repository
+
+
+def test_saved_changes_update_indexes():
+    repository = create_repository()
+    user = repository.get(repository.specs.filter(age=1))
+
+    user.status = 'b'
+    user.age = 100
+    repository.update(user)
+
+    assert [found.id for found in repository.filter(repository.specs.filter(status='b'))][-1] == user.id
+    assert repository.count(repository.specs.filter(status='b')) == 6
+    assert repository.count(repository.specs.filter(status='a')) == 4
+    assert repository.count(repository.specs.filter(age__gte=100)) == 1
+    assert repository.filter(repository.specs.filter(age=1)) == []
+
+
+def test_unsaved_changes_are_not_indexed():
+    """ Indexes are only updated by the session, so the models that are changed in place must be saved """
+    repository = create_repository()
+    user = repository.get(repository.specs.filter(age=1))
+
+    user.status = 'b'
+
+    assert user not in repository.filter(repository.specs.filter(status='b'))
+    assert repository.count(repository.specs.filter(status='b')) == 5
+
+    repository.save(user)
+    assert user in repository.filter(repository.specs.filter(status='b'))
+    assert repository.count(repository.specs.filter(status='b')) == 6
+
+
+class Point(BaseModel):
+    status: str
+    coords: Tuple[int, int]
+
+
+def create_points_repository(session: dict) -> InternalRepository:
+    repository = InternalRepository(session=session, model=Point, indexes=[HashIndex('status'), HashIndex('coords')])
+    repository.save(Point(status='a', coords=(1, 2)))
+    repository.save(Point(status='ab', coords=(3, 4)))
+    return repository
+
+
+@pytest.mark.parametrize('filters', [
+    {'coords': [1, 2]},
+    {'coords': (1, 2)},
+    {'coords__in': [[1, 2], (3, 4)]},
+    {'status__in': 'ab'},
+    {'status__in': ['a', 'b']},
+    {'status': 'ab'},
+])
+def test_hash_index_finds_the_same_models_as_scan(filters):
+    indexed = create_points_repository(IndexedSession())
+    scanned = create_points_repository({})
+
+    expected = [model.status for model in scanned.filter(scanned.specs.filter(**filters))]
+    assert [model.status for model in indexed.filter(indexed.specs.filter(**filters))] == expected
+    assert indexed.count(indexed.specs.filter(**filters)) == len(expected)
+
+
+
+class Score(BaseModel):
+    score: Optional[float] = None
+
+
+def create_scores_repository(session: dict) -> InternalRepository:
+    repository = InternalRepository(session=session, model=Score, indexes=[SortedIndex('score')])
+
+    for score in (1.5, None, 3.0):
+        repository.save(Score(score=score))
+
+    return repository
+
+
+@pytest.mark.parametrize('filters', [{'score': None}, {'score': 1.5}])
+def test_sorted_index_skips_values_it_cannot_compare(filters):
+    indexed = create_scores_repository(IndexedSession())
+    scanned = create_scores_repository({})
+
+    expected = [model.score for model in scanned.filter(scanned.specs.filter(**filters))]
+    assert [model.score for model in indexed.filter(indexed.specs.filter(**filters))] == expected
+    assert indexed.count(indexed.specs.filter(**filters)) == len(expected)
@@ -0,0 +1,78 @@
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import (
+    InternalRepository,
+    InternalUnitOfWork,
+    IndexedSession,
+    HashIndex,
+    SortedIndex,
+)
+
+
+class User(BaseModel):
+    status: str
+    age: int
+
+
+def create_indexed_repository() -> InternalRepository:
+    return InternalRepository(
+        session=IndexedSession(),
+        model=User,
+        indexes=[HashIndex('status'), SortedIndex('age')],
+    )
+
+
+def create_columnar_repository() -> InternalRepository:
+    pytest.importorskip('numpy')
+    from assimilator.internal.database.columnar import ColumnarSession
+
+    return InternalRepository(session=ColumnarSession(), model=User)
+
+
+@pytest.fixture(params=[create_indexed_repository, create_columnar_repository])
+def repository(request) -> InternalRepository:
+    repository = request.param()
+
+    for age in range(10):
+        repository.save(status='a' if age < 5 else 'b', age=age)
+
+    return repository
+
+
+def assert_counts_match(repository: InternalRepository):
+    for specification in [
+        repository.specs.filter(status='a'),
+        repository.specs.filter(status='b'),
+        repository.specs.filter(age__gte=2),
+        repository.specs.filter(age__lt=7, status='b'),
+    ]:
+        assert repository.count(specification) == len(repository.filter(specification))
+
+    assert repository.count() == len(repository.filter())
+
+
+def test_count_after_delete(repository):
+    with InternalUnitOfWork(repository) as uow:
+        uow.repository.delete(uow.repository.specs.filter(status='a'))
+
+        assert uow.repository.count(uow.repository.specs.filter(status='a')) == 0
+        assert uow.repository.count(uow.repository.specs.filter(age__gte=2)) == 5
+        assert_counts_match(uow.repository)
+
+    assert_counts_match(repository)
+    assert repository.count(repository.specs.filter(status='a')) == 5
+
+
+def test_count_after_delete_and_save(repository):
+    with InternalUnitOfWork(repository) as uow:
+        uow.repository.delete(uow.repository.specs.filter(age__lt=3))
+        uow.repository.save(status='a', age=100)
+
+        assert uow.repository.count(uow.repository.specs.filter(status='a')) == 3
+        assert_counts_match(uow.repository)
+
+        uow.commit()
+
+    assert_counts_match(repository)
+    assert repository.count(repository.specs.filter(status='a')) == 3
@@ -0,0 +1,54 @@
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import (
+    InternalRepository,
+    InternalUnitOfWork,
+    IndexedSession,
+    ConcurrentSession,
+    SortedIndex,
+)
+
+
+class User(BaseModel):
+    age: int
+
+
+def create_repository(session: dict) -> InternalRepository:
+    repository = InternalRepository(session=session, model=User, indexes=[SortedIndex('age')])
+
+    for age in range(20):
+        repository.save(id=f"user-{age}", age=age)
+
+    return repository
+
+
+def get_ages(repository: InternalRepository, *orderings: str, after=None, limit=5):
+    return [user.age for user in repository.filter(repository.specs.seek(*orderings, after=after, limit=limit))]
+
+
+@pytest.mark.parametrize('session_type', [dict, IndexedSession, ConcurrentSession])
+def test_seek(session_type):
+    repository = create_repository(session_type())
+
+    assert get_ages(repository, 'age') == [0, 1, 2, 3, 4]
+    assert get_ages(repository, 'age', after=(4,)) == [5, 6, 7, 8, 9]
+    assert get_ages(repository, '-age', after=(15,)) == [14, 13, 12, 11, 10]
+    assert get_ages(repository, 'age', after=(17,)) == [18, 19]
+
+
+@pytest.mark.parametrize('session_type', [dict, IndexedSession, ConcurrentSession])
+def test_seek_in_unit_of_work(session_type):
+    repository = create_repository(session_type())
+
+    with InternalUnitOfWork(repository) as uow:
+        uow.repository.delete(uow.repository.specs.filter(age=6))
+
+        assert get_ages(uow.repository, 'age', after=(4,)) == [5, 7, 8, 9, 10]
+        assert get_ages(uow.repository, '-age', after=(8,)) == [7, 5, 4, 3, 2]
+
+        uow.repository.save(id='user-100', age=100)
+        assert get_ages(uow.repository, 'age', after=(18,)) == [19, 100]
+        assert get_ages(uow.repository, '-age', after=(7,), limit=2) == [5, 4]
+
+    assert get_ages(repository, 'age', after=(4,)) == [5, 6, 7, 8, 9]
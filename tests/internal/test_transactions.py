@@ -0,0 +1,70 @@
+import asyncio
+import threading
+
+from assimilator.core.database import BaseModel
+from assimilator.internal.database import (
+    InternalRepository,
+    InternalUnitOfWork,
+    AsyncInternalRepository,
+    AsyncInternalUnitOfWork,
+)
+
+
+class User(BaseModel):
+    name: str
+
+
+def test_threads_have_their_own_transactions():
+    repository = InternalRepository(session={}, model=User)
+    barrier = threading.Barrier(4)
+    counts = []
+
+    def work(name: str):
+        with InternalUnitOfWork(repository) as uow:
+            uow.repository.save(name=name)
+            barrier.wait()  # every thread saved its model, but did not commit it
+            counts.append(uow.repository.count())
+            barrier.wait()  # every thread counted the models before the first commit
+            uow.commit()
+
+    threads = [threading.Thread(target=work, args=(f"user-{number}",)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counts == [1, 1, 1, 1]
+    assert repository.count() == 4
+
+
+def test_tasks_have_their_own_transactions():
+    repository = AsyncInternalRepository(session={}, model=User)
+
+    async def work(name: str) -> int:
+        async with AsyncInternalUnitOfWork(repository) as uow:
+            await uow.repository.save(name=name)
+            await asyncio.sleep(0)
+            models_count = await uow.repository.count()
+            await asyncio.sleep(0)
+            await uow.commit()
+            return models_count
+
+    async def main():
+        return await asyncio.gather(*(work(f"user-{number}") for number in range(4)))
+
+    assert asyncio.run(main()) == [1, 1, 1, 1]
+    assert len(repository.session) == 4
+
+
+def test_transactions_are_removed_from_the_context():
+    session = {}
+
+    for number in range(100):   # new repository and unit of work for every request
+        repository = InternalRepository(session=session, model=User)
+        with InternalUnitOfWork(repository) as uow:
+            uow.repository.save(name=f"user-{number}")
+            uow.commit()
+
+    assert len(session) == 100
+    assert InternalRepository._transactions._values.get() == {}
+    assert InternalUnitOfWork._saved_sessions._values.get() == {}
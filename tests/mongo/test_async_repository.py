@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip('mongomock_motor')
+from assimilator.mongo.database import AsyncMongoRepository, AsyncMongoUnitOfWork, MongoModel    # noqa: E402
+
+
+class User(MongoModel):
+    class AssimilatorConfig:
+        collection = "users"
+
+    name: str
+    balance: int = 0
+
+
+class FakeSession:
+    """ mongomock has no client sessions, so the calls of the unit of work are only recorded """
+
+    def __init__(self):
+        self.calls = []
+
+    def start_transaction(self):
+        self.calls.append('start')
+
+    async def commit_transaction(self):
+        self.calls.append('commit')
+
+    async def abort_transaction(self):
+        self.calls.append('abort')
+
+    async def end_session(self):
+        self.calls.append('end')
+
+
+def create_repository(**kwargs) -> AsyncMongoRepository:
+    return AsyncMongoRepository(session=mongomock_motor.AsyncMongoMockClient(), model=User, database="db", **kwargs)
+
+
+def test_filter_streams_the_cursor():
+    async def main():
+        repository = create_repository(batch_size=3)
+        await repository.save_many([User(name=f"user-{number}", balance=number) for number in range(10)])
+
+        specification = repository.specs.filter(balance__lt=5)
+        order = repository.specs.order('balance')
+        streamed_users = repository.iter_filter(specification, order, batch_size=2)
+
+        assert [user.balance async for user in streamed_users] == [0, 1, 2, 3, 4]
+        assert [user.balance async for user in await repository.filter(order, stream=True)] == list(range(10))
+        assert [user.balance for user in await repository.filter(specification, order)] == [0, 1, 2, 3, 4]
+        assert await repository.count() == 10
+        assert await repository.count(specification) == 5
+
+    asyncio.run(main())
+
+
+def test_crud_operations():
+    async def main():
+        repository = create_repository()
+        await repository.save_many([User(name=f"user-{number}", balance=number) for number in range(5)])
+
+        user = await repository.get(repository.specs.filter(name='user-1'))
+        user.balance = 10
+        await repository.update(user)
+        await repository.update(repository.specs.filter(name='user-2'), balance=20)
+
+        users = {user.name: user.balance for user in await repository.filter()}
+        assert users == {'user-0': 0, 'user-1': 10, 'user-2': 20, 'user-3': 3, 'user-4': 4}
+
+        await repository.delete(repository.specs.filter(balance__gte=10))
+        await repository.delete_many(await repository.filter(repository.specs.filter(name='user-0')))
+        assert sorted(user.name for user in await repository.filter()) == ['user-3', 'user-4']
+
+    asyncio.run(main())
+
+
+def test_unit_of_work_uses_the_client_session():
+    async def main():
+        repository = create_repository()
+        session = FakeSession()
+
+        async def start_session():
+            return session
+
+        repository.session.start_session = start_session
+        uow = AsyncMongoUnitOfWork(repository)
+
+        async with uow:
+            assert repository.transaction is session
+            await uow.commit()
+
+        assert session.calls == ['start', 'commit', 'end']
+        assert repository.transaction is None
+
+        with pytest.raises(ValueError):
+            async with uow:
+                assert repository.transaction is session
+                raise ValueError()
+
+        assert session.calls == ['start', 'commit', 'end', 'start', 'abort', 'end']
+        assert repository.transaction is None
+
+    asyncio.run(main())
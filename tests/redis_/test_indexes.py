@@ -0,0 +1,125 @@
+import random
+from typing import List, Optional
+
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.redis_.database import RedisRepository, RedisUnitOfWork, RedisModel, RedisSortedIndex
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+class Friend(BaseModel):
+    name: str
+
+
+class User(RedisModel):
+    status: str
+    age: int
+    balance: Optional[float] = None
+    friends: List[Friend] = []
+
+
+FILTERS = [
+    {'status': 's1'},
+    {'status': 's1', 'age': 30},
+    {'status__in': ['s0', 's2']},
+    {'age': 30},
+    {'age__gt': 40},
+    {'age__gte': 40, 'age__lt': 45},
+    {'age__lte': 20.5, 'status': 's0'},
+    {'age__in': [20, 30]},
+    {'balance': 1},
+    {'balance': None},
+    {'friends__name': 'friend-1'},
+    {'status': 'missing'},
+]
+
+
+def create_repository(indexes=None) -> RedisRepository:
+    return RedisRepository(session=fakeredis.FakeRedis(server=fakeredis.FakeServer()), model=User, indexes=indexes)
+
+
+def fill(repository: RedisRepository, generator: random.Random) -> None:
+    repository.save_many(User(
+        id=f"user-{number}",
+        status=f"s{generator.randint(0, 3)}",
+        age=generator.randint(18, 60),
+        balance=generator.choice([None, 1.0, round(generator.uniform(0, 1000), 2)]),
+        friends=[Friend(name=f"friend-{generator.randint(0, 5)}") for _ in range(generator.randint(0, 2))],
+    ) for number in range(100))
+
+    for user in repository.filter(repository.specs.filter(age__lt=25)):
+        user.status = 's3'
+        repository.update(user)
+
+    repository.delete(repository.specs.filter(age__gt=55))
+
+
+@pytest.fixture
+def repositories():
+    indexed = create_repository(['status', RedisSortedIndex('age'), RedisSortedIndex('balance'), 'friends__name'])
+    plain = create_repository()
+
+    fill(indexed, random.Random(1))
+    fill(plain, random.Random(1))
+    return indexed, plain
+
+
+def get_ids(models) -> List[str]:
+    return sorted(str(model.id) for model in models)
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_indexes_find_the_same_models(repositories, filters):
+    indexed, plain = repositories
+
+    expected = get_ids(plain.filter(plain.specs.filter(**filters)))
+    assert get_ids(indexed.filter(indexed.specs.filter(**filters))) == expected
+    assert indexed.count(indexed.specs.filter(**filters)) == len(expected)
+
+
+def test_index_keys_are_not_models(repositories):
+    indexed, plain = repositories
+
+    assert indexed.session.dbsize() > plain.session.dbsize()
+    assert indexed.count() == plain.count() == len(indexed.filter())
+    assert get_ids(indexed.filter()) == get_ids(plain.filter())
+
+
+def test_unit_of_work_changes_the_indexes(repositories):
+    indexed, _ = repositories
+
+    with RedisUnitOfWork(indexed) as uow:
+        uow.repository.save(User(id='user-0', status='first', age=100))
+        uow.repository.save(User(id='user-0', status='second', age=100))
+        uow.repository.save(User(id='new', status='new', age=100))
+        uow.repository.delete(User(id='new', status='new', age=100))
+        uow.commit()
+
+    assert get_ids(indexed.filter(indexed.specs.filter(status='first'))) == []
+    assert get_ids(indexed.filter(indexed.specs.filter(status='second'))) == ['user-0']
+    assert get_ids(indexed.filter(indexed.specs.filter(status='new'))) == []
+    assert get_ids(indexed.filter(indexed.specs.filter(age__gte=100))) == ['user-0']
+
+    with RedisUnitOfWork(indexed) as uow:
+        uow.repository.save(User(id='rolled-back', status='second', age=100))
+
+    assert indexed.count(indexed.specs.filter(status='second')) == 1
+
+
+def test_entries_of_missing_models_are_removed(repositories):
+    indexed, _ = repositories
+    first_user, second_user = indexed.filter(indexed.specs.filter(status='s1'))[:2]
+
+    indexed.session.delete(str(first_user.id), str(second_user.id))   # like the models that expired
+    assert indexed.count(indexed.specs.filter(status='s1')) == len(indexed.filter(indexed.specs.filter(status='s1')))
+    assert not indexed.session.sismember(indexed.indexes.indexes[0].get_set_key('"s1"'), str(first_user.id))
+    assert not indexed.session.exists(indexed.indexes.get_values_key(str(first_user.id)))
+
+    third_user = indexed.filter(indexed.specs.filter(status='s2'))[0]
+    indexed.session.delete(str(third_user.id))
+    indexed.clean_indexes()
+
+    assert not indexed.session.exists(indexed.indexes.get_values_key(str(third_user.id)))
+    assert indexed.session.zscore(indexed.indexes.indexes[1].get_sorted_set_key(), str(third_user.id)) is None
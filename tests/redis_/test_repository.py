@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.redis_.database import RedisRepository, AsyncRedisRepository, AsyncRedisUnitOfWork, RedisModel
+
+fakeredis = pytest.importorskip('fakeredis')
+
+
+class User(BaseModel):
+    name: str
+
+
+class RedisUser(RedisModel):
+    name: str
+
+
+@pytest.mark.parametrize('model', [User, RedisUser])
+def test_update_does_not_change_the_models(model):
+    repository = RedisRepository(session=fakeredis.FakeRedis(), model=model)
+    saved_user = repository.save(model(name='Andrey'))
+    missing_user = model(name='Ivan')
+
+    saved_user.name = 'Andrey Ivanov'
+    repository.update_many([saved_user, missing_user])
+    repository.update(missing_user)
+
+    assert [user.name for user in repository.filter()] == ['Andrey Ivanov']
+    assert getattr(missing_user, 'only_update', False) is False
+
+    repository.save(missing_user)   # update() did not make the save XX-only
+    assert sorted(user.name for user in repository.filter()) == ['Andrey Ivanov', 'Ivan']
+
+
+@pytest.mark.parametrize('model', [User, RedisUser])
+def test_async_update_does_not_change_the_models(model):
+    async def main():
+        repository = AsyncRedisRepository(session=fakeredis.FakeAsyncRedis(), model=model)
+        saved_user = await repository.save(model(name='Andrey'))
+        missing_user = model(name='Ivan')
+
+        saved_user.name = 'Andrey Ivanov'
+        await repository.update_many([saved_user, missing_user])
+        await repository.update(missing_user)
+
+        assert [user.name for user in await repository.filter()] == ['Andrey Ivanov']
+        assert getattr(missing_user, 'only_update', False) is False
+
+        await repository.save(missing_user)
+        assert sorted(user.name for user in await repository.filter()) == ['Andrey Ivanov', 'Ivan']
+
+    asyncio.run(main())
+
+
+def test_async_results_are_the_same_as_sync():
+    server = fakeredis.FakeServer()
+    repository = RedisRepository(session=fakeredis.FakeRedis(server=server), model=RedisUser)
+    repository.save_many(RedisUser(id=f"user-{number}", name=f"name-{number % 3}") for number in range(10))
+
+    async def main():
+        async_repository = AsyncRedisRepository(
+            session=fakeredis.FakeAsyncRedis(server=server), model=RedisUser, chunk_size=3,
+        )
+
+        for specification in [
+            repository.specs.filter(name='name-1'),
+            repository.specs.filter('user-1*'),
+            repository.specs.filter(id='user-2'),
+        ]:
+            expected = sorted(user.id for user in repository.filter(specification))
+            assert sorted(user.id for user in await async_repository.filter(specification)) == expected
+            assert sorted([user.id async for user in async_repository.iter_filter(specification)]) == expected
+            assert await async_repository.count(specification) == len(expected)
+
+        lazy_user = async_repository.get(repository.specs.filter('user-1'), lazy=True)
+        assert (await lazy_user).name == 'name-1'
+
+    asyncio.run(main())
+
+
+def test_async_unit_of_work():
+    async def main():
+        repository = AsyncRedisRepository(session=fakeredis.FakeAsyncRedis(), model=RedisUser)
+        uow = AsyncRedisUnitOfWork(repository)
+
+        async with uow:
+            await uow.repository.save(RedisUser(id='committed', name='Andrey'))
+            assert await repository.session.exists('committed') == 0    # the pipeline is executed by commit()
+            await uow.commit()
+
+        with pytest.raises(ValueError):
+            async with uow:
+                await uow.repository.save(RedisUser(id='rolled-back', name='Ivan'))
+                raise ValueError()
+
+        assert [user.id for user in await repository.filter()] == ['committed']
+
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+import random
+from typing import List, Optional
+
+import pytest
+
+from assimilator.core.database import BaseModel
+from assimilator.redis_.database import RedisRepository, RedisModel
+
+fakeredis = pytest.importorskip('fakeredis')
+pytest.importorskip('lupa')
+
+
+class Friend(BaseModel):
+    age: int
+
+
+class Address(BaseModel):
+    city: str
+
+
+class User(RedisModel):
+    status: str
+    age: int
+    active: bool
+    big_number: int = 0
+    nickname: Optional[str] = None
+    address: Address
+    friends: List[Friend] = []
+
+
+FILTERS = [
+    {'status': 's1'},
+    {'status': 's1', 'age__lt': 30},
+    {'status__in': ['s0', 's2']},
+    {'age__gt': 40},
+    {'age__gte': 40.5, 'age__lte': 50},
+    {'age__in': [20, 30, 40]},
+    {'active': True},
+    {'active': 1},
+    {'active__is': False},
+    {'nickname': None},
+    {'nickname': 'nick-1'},
+    {'nickname__is': None},
+    {'address__city': 'city-1'},
+    {'friends__age__gt': 50},
+    {'big_number': 2 ** 60 + 1},
+    {'big_number__gt': 2 ** 60},
+    {'status__like': 's%'},
+    {'status': 'missing'},
+]
+
+
+def fill(repository: RedisRepository, generator: random.Random) -> None:
+    repository.save_many(User(
+        id=f"user-{number}",
+        status=f"s{generator.randint(0, 3)}",
+        age=generator.randint(18, 60),
+        active=generator.random() < 0.5,
+        big_number=generator.choice([0, 2 ** 60, 2 ** 60 + 1]),
+        nickname=generator.choice([None, f"nick-{generator.randint(0, 3)}"]),
+        address=Address(city=f"city-{generator.randint(0, 3)}"),
+        friends=[Friend(age=generator.randint(18, 60)) for _ in range(generator.randint(0, 2))],
+    ) for number in range(100))
+
+
+@pytest.fixture
+def repositories():
+    session = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    scripted = RedisRepository(session=session, model=User, use_server_filter=True)
+    plain = RedisRepository(session=session, model=User)
+
+    fill(plain, random.Random(1))
+    return scripted, plain
+
+
+def get_ids(models) -> List[str]:
+    return sorted(str(model.id) for model in models)
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_script_finds_the_same_models(repositories, filters):
+    scripted, plain = repositories
+
+    expected = get_ids(plain.filter(plain.specs.filter(**filters)))
+    assert get_ids(scripted.filter(scripted.specs.filter(**filters))) == expected
+    assert scripted.count(scripted.specs.filter(**filters)) == len(expected)
+
+
+def test_script_is_used_with_other_specifications(repositories):
+    scripted, plain = repositories
+
+    for repository in (scripted, plain):
+        repository.results = repository.filter(
+            repository.specs.filter(age__gt=30),
+            repository.specs.filter(status='s1') | repository.specs.filter(active=True),
+            repository.specs.order('-age', 'id'),
+            repository.specs.paginate(limit=10),
+        )
+
+    assert scripted.results == plain.results